@@ -1,7 +1,11 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from itertools import islice
 from services.query_service import QueryService
 from db.connection import DatabaseManager
+from utils.fast_json import dumps_bytes
+
+STREAM_BATCH_ROWS = 1000
 
 api = Blueprint('api', __name__)
 db_manager = DatabaseManager()
@@ -20,9 +24,39 @@ def execute_query():
             data['database'],
             data['query']
         )
-        return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 400
+        
+    rows = result['rows']
+    try:
+        # Errors in the first batch still get a proper error response; later
+        # ones can only cut the body short
+        first_batch = list(islice(rows, STREAM_BATCH_ROWS))
+    except Exception as e:
+        rows.close()
+        return jsonify({'error': str(e)}), 400
+        
+    response = Response(
+        _stream_result(result['columns'], first_batch, rows),
+        mimetype='application/json'
+    )
+    # Releases the connection even if the client disconnects mid-stream
+    response.call_on_close(rows.close)
+    return response
+
+def _stream_result(columns, first_batch, rows):
+    """Query sonucunu satır batch'leri halinde JSON olarak yazar."""
+    yield b'{"columns":' + dumps_bytes(columns) + b',"rows":['
+    
+    batch = first_batch
+    separator = b''
+    while batch:
+        # Row tuples serialize as JSON arrays; strip the batch's own brackets
+        yield separator + dumps_bytes(batch)[1:-1]
+        separator = b','
+        batch = list(islice(rows, STREAM_BATCH_ROWS))
+        
+    yield b']}'
 
 @api.route('/databases', methods=['GET'])
 @jwt_required
@@ -8,49 +8,82 @@ class MSSQLSchemaManager:
     def get_schema_info(self, database: str) -> Dict:
         """Schema bilgilerini getirir."""
         with self.conn_manager.get_connection(database) as conn:
+            index_catalog = self._get_index_catalog(conn)
+            
             return {
-                'tables': self._get_tables(conn),
+                'tables': self._get_tables(index_catalog),
                 'views': self._get_views(conn),
                 'stored_procs': self._get_stored_procedures(conn),
                 'functions': self._get_functions(conn),
-                'indexes': self._get_indexes(conn),
+                'indexes': self._get_indexes(index_catalog),
                 'constraints': self._get_constraints(conn)
             }
             
-    def _get_tables(self, conn) -> List[Dict]:
-        """Tablo bilgilerini getirir."""
+    def _get_index_catalog(self, conn) -> pd.DataFrame:
+        """Index başına satır ve boyut bilgisini tek sorguda getirir."""
+        # sys.partitions / sys.allocation_units are traversed once here and
+        # both the table and index projections are derived from the result
         query = """
+        WITH index_stats AS (
+            SELECT 
+                p.object_id,
+                p.index_id,
+                SUM(p.rows) AS row_count,
+                SUM(a.total_pages) AS total_pages
+            FROM sys.partitions p
+            INNER JOIN (
+                SELECT container_id, SUM(total_pages) AS total_pages
+                FROM sys.allocation_units
+                GROUP BY container_id
+            ) a ON p.partition_id = a.container_id
+            GROUP BY p.object_id, p.index_id
+        )
         SELECT 
             t.name AS table_name,
-            p.rows AS row_count,
-            SUM(a.total_pages) * 8 AS size_kb,
-            SCHEMA_NAME(t.schema_id) AS schema_name
-        FROM sys.tables t
-        INNER JOIN sys.indexes i ON t.object_id = i.object_id
-        INNER JOIN sys.partitions p ON i.object_id = p.object_id AND i.index_id = p.index_id
-        INNER JOIN sys.allocation_units a ON p.partition_id = a.container_id
-        GROUP BY t.name, p.rows, t.schema_id
-        """
-        
-        return pd.read_sql(query, conn).to_dict('records')
-        
-    def _get_indexes(self, conn) -> List[Dict]:
-        """Index bilgilerini getirir."""
-        query = """
-        SELECT 
+            SCHEMA_NAME(t.schema_id) AS schema_name,
+            i.index_id,
             i.name AS index_name,
-            t.name AS table_name,
             i.type_desc AS index_type,
             i.fill_factor,
-            p.rows AS row_count,
+            ix.row_count,
+            ix.total_pages * 8 AS size_kb,
             s.user_seeks,
             s.user_scans,
             s.user_lookups,
             s.user_updates
-        FROM sys.indexes i
-        INNER JOIN sys.tables t ON i.object_id = t.object_id
-        INNER JOIN sys.partitions p ON i.object_id = p.object_id AND i.index_id = p.index_id
-        LEFT JOIN sys.dm_db_index_usage_stats s ON i.object_id = s.object_id AND i.index_id = s.index_id
+        FROM sys.tables t
+        INNER JOIN sys.indexes i ON t.object_id = i.object_id
+        INNER JOIN index_stats ix ON i.object_id = ix.object_id AND i.index_id = ix.index_id
+        LEFT JOIN sys.dm_db_index_usage_stats s ON i.object_id = s.object_id
+            AND i.index_id = s.index_id
+            AND s.database_id = DB_ID()
         """
         
-        return pd.read_sql(query, conn).to_dict('records')
\ No newline at end of file
+        return pd.read_sql(query, conn)
+        
+    def _get_tables(self, index_catalog: pd.DataFrame) -> List[Dict]:
+        """Tablo bilgilerini getirir."""
+        keys = ['schema_name', 'table_name']
+        tables = index_catalog.groupby(keys, sort=False)[['size_kb']].sum()
+        
+        # Heap (0) or clustered index (1) holds the table's row count
+        base = index_catalog[index_catalog['index_id'] <= 1]
+        tables['row_count'] = base.set_index(keys)['row_count']
+        
+        return tables.reset_index()[
+            ['table_name', 'row_count', 'size_kb', 'schema_name']
+        ].to_dict('records')
+        
+    def _get_indexes(self, index_catalog: pd.DataFrame) -> List[Dict]:
+        """Index bilgilerini getirir."""
+        return index_catalog[[
+            'index_name',
+            'table_name',
+            'index_type',
+            'fill_factor',
+            'row_count',
+            'user_seeks',
+            'user_scans',
+            'user_lookups',
+            'user_updates'
+        ]].to_dict('records')
\ No newline at end of file
@@ -1,5 +1,6 @@
-from typing import Dict, List
+from typing import Dict, List, Union
 import sqlparse
+from sqlparse.sql import Statement
 from .models import OptimizationRule, QueryPlan
 from .analyzers import QueryAnalyzer
 
@@ -8,11 +9,14 @@ class QueryOptimizer:
         self.analyzer = QueryAnalyzer()
         self.rules = self._load_optimization_rules()
         
-    async def optimize_query(self, query: str,
+    async def optimize_query(self, query: Union[str, Statement],
                            context: Dict) -> Dict:
         """Query optimizasyonu yapar."""
-        # Parse query
-        parsed = sqlparse.parse(query)[0]
+        # Parse query unless the caller already holds the parsed statement
+        if isinstance(query, Statement):
+            parsed = query
+        else:
+            parsed = sqlparse.parse(query)[0]
         
         # Analyze query
         analysis = await self.analyzer.analyze_query(parsed)
@@ -1,4 +1,5 @@
 from typing import Dict, List
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from .models import QueryMetrics, QueryPattern
@@ -42,14 +43,20 @@ class QueryAnalyzer:
         
     async def _analyze_performance(self, history: List[Dict]) -> Dict:
         """Query performans analizi."""
-        df = pd.DataFrame(history)
+        df = pd.DataFrame.from_records(history)
+        
+        # Summary stats in two passes: one agg for mean/max,
+        # one quantile call for median and p95
+        execution_time = df['execution_time']
+        summary = execution_time.agg(['mean', 'max'])
+        median, p95 = execution_time.quantile([0.5, 0.95])
         
         return {
             'execution_time': {
-                'mean': df['execution_time'].mean(),
-                'median': df['execution_time'].median(),
-                'p95': df['execution_time'].quantile(0.95),
-                'max': df['execution_time'].max()
+                'mean': summary['mean'],
+                'median': median,
+                'p95': p95,
+                'max': summary['max']
             },
             'resource_usage': {
                 'cpu': self._analyze_cpu_usage(df),
@@ -62,6 +69,36 @@ class QueryAnalyzer:
             }
         }
         
+    def _analyze_cpu_usage(self, df: pd.DataFrame) -> Dict:
+        """CPU kullanım analizi."""
+        return self._summarize_column(df, 'cpu_usage')
+        
+    def _analyze_memory_usage(self, df: pd.DataFrame) -> Dict:
+        """Bellek kullanım analizi."""
+        return self._summarize_column(df, 'memory_usage')
+        
+    def _analyze_io_usage(self, df: pd.DataFrame) -> Dict:
+        """IO kullanım analizi."""
+        return self._summarize_column(df, 'io_usage')
+        
+    def _analyze_complexity(self, df: pd.DataFrame) -> Dict:
+        """Query karmaşıklık analizi."""
+        return self._summarize_column(df, 'complexity')
+        
+    def _summarize_column(self, df: pd.DataFrame, column: str) -> Dict:
+        """Sayısal bir metrik kolonunu özetler."""
+        if column not in df or df.empty:
+            return {'mean': 0.0, 'p95': 0.0, 'max': 0.0}
+            
+        # Convert once and reduce over the contiguous float64 buffer
+        values = df[column].to_numpy(dtype=np.float64, na_value=0.0)
+        
+        return {
+            'mean': float(values.mean()),
+            'p95': float(np.quantile(values, 0.95)),
+            'max': float(values.max())
+        }
+        
     async def _generate_insights(self, performance: Dict,
                                patterns: Dict,
                                impact: Dict) -> List[Dict]:
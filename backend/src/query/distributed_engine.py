@@ -1,6 +1,5 @@
 from typing import Dict, List
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from .optimizer import QueryOptimizer
 from .executor import QueryExecutor
 from .merger import ResultMerger
@@ -58,18 +57,34 @@ class DistributedQueryEngine:
         }
         
     async def _execute_in_parallel(self, plan: Dict) -> List[Dict]:
-        """Parallel query execution."""
+        """Parallel query execution; sonuçlar shard sırasıyla döner."""
+        semaphore = asyncio.Semaphore(self.max_parallel_queries)
+        
         async def execute_shard(shard):
-            return await self.executor.execute(
-                query=plan['query'],
-                shard=shard
-            )
-            
-        # Thread pool ile parallel execution
-        with ThreadPoolExecutor(max_workers=self.max_parallel_queries) as executor:
-            futures = [
-                asyncio.ensure_future(execute_shard(shard))
-                for shard in plan['shards']
-            ]
+            async with semaphore:
+                return await self.executor.execute(
+                    query=plan['query'],
+                    shard=shard
+                )
+                
+        # Shard'lar event loop üzerinde, en fazla max_parallel_queries
+        # eşzamanlı olacak şekilde çalıştırılır
+        tasks = [
+            asyncio.ensure_future(execute_shard(shard))
+            for shard in plan['shards']
+        ]
+        
+        try:
+            # gather keeps shard order, so the merged rows are deterministic
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # A shard failed (or we were cancelled); stop the others and wait
+            # for them so their cancellation/errors are retrieved
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
             
-            return await asyncio.gather(*futures)
\ No newline at end of file
+    async def _merge_results(self, results: List[Dict]) -> Dict:
+        """Shard sonuçlarını birleştirir."""
+        return self.merger.merge_results(results)
\ No newline at end of file
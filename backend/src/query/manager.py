@@ -1,10 +1,26 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
 import asyncio
 from .parser import SQLParser
 from .optimizer import QueryOptimizer
 from .validator import QueryValidator
 from .executor import QueryExecutor
+from utils.query_fingerprint import fingerprint_query
+
+QUERY_CATEGORIES = {
+    'INSERT': 'data_modification',
+    'UPDATE': 'data_modification',
+    'DELETE': 'data_modification',
+    'CREATE': 'schema_modification',
+    'ALTER': 'schema_modification',
+    'DROP': 'schema_modification',
+    'GRANT': 'permission_modification',
+    'REVOKE': 'permission_modification',
+    'EXECUTE': 'procedure_execution'
+}
+
+PLAN_CACHE_SIZE = 1024
 
 class QueryManager:
     def __init__(self):
@@ -12,23 +28,34 @@ class QueryManager:
         self.optimizer = QueryOptimizer()
         self.validator = QueryValidator()
         self.executor = QueryExecutor()
+        # fingerprint -> (category, optimized)
+        self._plan_cache: OrderedDict[bytes, Tuple[str, Dict]] = OrderedDict()
         
     async def process_query(self, query: str, context: Dict) -> Dict:
         """Query'yi işler ve yönetir."""
         try:
-            # Query parsing
-            parsed_query = await self.parser.parse(query)
-            
-            # Query kategorization
-            category = self._categorize_query(parsed_query)
+            fingerprint = fingerprint_query(query)
+            cached_plan = self._plan_cache.get(fingerprint)
             
+            if cached_plan:
+                self._plan_cache.move_to_end(fingerprint)
+                category, optimized = cached_plan
+            else:
+                # Query parsing
+                parsed_query = await self.parser.parse(query)
+                
+                # Query kategorization
+                category = self._categorize_query(parsed_query)
+                
             # Access control
             if not await self._check_permissions(category, context):
                 raise PermissionError("Insufficient permissions")
                 
-            # Query optimization
-            optimized = await self.optimizer.optimize(parsed_query)
-            
+            if not cached_plan:
+                # Query optimization
+                optimized = await self.optimizer.optimize(parsed_query)
+                self._store_plan(fingerprint, category, optimized)
+                
             # Query validation
             validation = await self.validator.validate(
                 optimized, context
@@ -42,6 +69,10 @@ class QueryManager:
                 optimized, context
             )
             
+            # Schema changes can invalidate any cached plan
+            if category == 'schema_modification':
+                self.invalidate_plan_cache()
+                
             # Log execution
             await self._log_execution(result, context)
             
@@ -60,25 +91,26 @@ class QueryManager:
             await self._log_error(str(e), context)
             raise
             
+    def invalidate_plan_cache(self) -> None:
+        """Plan cache'ini temizler."""
+        self._plan_cache.clear()
+        
+    def _store_plan(self, fingerprint: bytes, category: str,
+                    optimized: Dict) -> None:
+        """Optimize edilmiş planı LRU cache'e ekler."""
+        self._plan_cache[fingerprint] = (category, optimized)
+        if len(self._plan_cache) > PLAN_CACHE_SIZE:
+            self._plan_cache.popitem(last=False)
+            
     def _categorize_query(self, parsed_query) -> str:
         """Query'yi kategorize eder."""
-        categories = {
-            'SELECT': self._analyze_select(parsed_query),
-            'INSERT': 'data_modification',
-            'UPDATE': 'data_modification',
-            'DELETE': 'data_modification',
-            'CREATE': 'schema_modification',
-            'ALTER': 'schema_modification',
-            'DROP': 'schema_modification',
-            'GRANT': 'permission_modification',
-            'REVOKE': 'permission_modification',
-            'EXECUTE': 'procedure_execution'
-        }
+        query_type = parsed_query.get_type()
         
-        return categories.get(
-            parsed_query.get_type(),
-            'unknown'
-        )
+        # SELECT tek dinamik kategori; diğerleri statik tablodan gelir
+        if query_type == 'SELECT':
+            return self._analyze_select(parsed_query)
+            
+        return QUERY_CATEGORIES.get(query_type, 'unknown')
         
     def _analyze_select(self, parsed_query) -> str:
         """SELECT query'sini analiz eder."""
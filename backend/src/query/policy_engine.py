@@ -1,4 +1,5 @@
-from typing import Dict, List
+from typing import Dict, List, Pattern, Tuple
+from collections import Counter
 import re
 from datetime import datetime
 from .models import QueryPolicy
@@ -7,24 +8,41 @@ from .context_evaluator import ContextEvaluator
 class QueryPolicyEngine:
     def __init__(self):
         self.context_evaluator = ContextEvaluator()
+        # policy.id -> number of denials, used to run likely denials first
+        self.denial_counts: Counter = Counter()
+        # tuple(policy.patterns) -> compiled regexes (one alternation when safe)
+        self._pattern_cache: Dict[Tuple[str, ...], Tuple[Pattern, ...]] = {}
         
     async def evaluate_policies(self, query: str,
-                              context: Dict) -> Dict:
-        """Query policy'lerini değerlendirir."""
-        # Get applicable policies
+                              context: Dict,
+                              fail_fast: bool = True) -> Dict:
+        """Query policy'lerini değerlendirir.
+        
+        fail_fast=False tüm policy'leri değerlendirir (tam audit kaydı için).
+        """
+        # Get applicable policies, most frequently denying first
         policies = await self._get_applicable_policies(query)
+        policies = sorted(
+            policies,
+            key=lambda policy: self.denial_counts[policy.id],
+            reverse=True
+        )
         
         # Evaluate each policy
         evaluations = []
+        allowed = True
         for policy in policies:
             result = await self._evaluate_policy(
                 policy, query, context
             )
             evaluations.append(result)
             
-        # Combine results
-        allowed = all(e['allowed'] for e in evaluations)
-        
+            if not result['allowed']:
+                allowed = False
+                self.denial_counts[policy.id] += 1
+                if fail_fast:
+                    break
+                    
         return {
             'allowed': allowed,
             'evaluations': evaluations,
@@ -61,7 +79,32 @@ class QueryPolicyEngine:
         
     def _match_patterns(self, query: str, patterns: List[str]) -> bool:
         """Query pattern matching."""
-        for pattern in patterns:
-            if re.search(pattern, query, re.IGNORECASE):
-                return True
-        return False
\ No newline at end of file
+        if not patterns:
+            return False
+            
+        return any(
+            pattern.search(query) is not None
+            for pattern in self._compile_patterns(patterns)
+        )
+        
+    def _compile_patterns(self, patterns: List[str]) -> Tuple[Pattern, ...]:
+        """Policy pattern'lerini derler; mümkünse tek bir regex'te birleştirir."""
+        key = tuple(patterns)
+        compiled = self._pattern_cache.get(key)
+        if compiled is None:
+            compiled = tuple(
+                re.compile(pattern, re.IGNORECASE) for pattern in patterns
+            )
+            # Joining renumbers capture groups, which silently retargets
+            # backreferences; only group-free patterns share one scan
+            if len(compiled) > 1 and not any(p.groups for p in compiled):
+                try:
+                    compiled = (re.compile(
+                        '|'.join(f'(?:{pattern})' for pattern in patterns),
+                        re.IGNORECASE
+                    ),)
+                except re.error:
+                    # e.g. inline flags that are only valid at the start
+                    pass
+            self._pattern_cache[key] = compiled
+        return compiled
\ No newline at end of file
@@ -0,0 +1,124 @@
+from typing import Any, Callable, Dict, List, Tuple
+from functools import lru_cache
+import operator
+import re
+
+Predicate = Callable[[Dict], bool]
+
+_MISSING = object()
+
+WILDCARD = '*'
+
+def _split_values(value: Any) -> frozenset:
+    """'a, b' ya da liste değerini string kümesine çevirir."""
+    if isinstance(value, str):
+        return frozenset(v.strip() for v in value.split(','))
+    return frozenset(str(v) for v in value)
+
+def _field_getter(field: str) -> Callable[[Dict], Any]:
+    """Nokta ile ayrılmış alan yolu için context okuyucu üretir."""
+    parts = tuple(field.split('.'))
+
+    if len(parts) == 1:
+        return lambda context: context.get(field, _MISSING)
+
+    def get(context: Dict) -> Any:
+        value = context
+        for part in parts:
+            if not isinstance(value, dict):
+                return _MISSING
+            value = value.get(part, _MISSING)
+            if value is _MISSING:
+                return _MISSING
+        return value
+
+    return get
+
+def _numeric(compare: Callable[[float, float], bool],
+             value: Any) -> Callable[[Any], bool]:
+    threshold = float(value)
+
+    def check(field_value: Any) -> bool:
+        try:
+            return compare(float(field_value), threshold)
+        except (TypeError, ValueError):
+            return False
+
+    return check
+
+def _compile_operator(op: str, value: Any) -> Callable[[Any], bool]:
+    """Operatörü, değeri önceden işlenmiş bir karşılaştırıcıya derler."""
+    if op == 'eq':
+        expected = str(value)
+        return lambda field_value: str(field_value) == expected
+    if op == 'neq':
+        expected = str(value)
+        return lambda field_value: str(field_value) != expected
+    if op == 'in':
+        allowed = _split_values(value)
+        return lambda field_value: str(field_value) in allowed
+    if op == 'not_in':
+        denied = _split_values(value)
+        return lambda field_value: str(field_value) not in denied
+    if op == 'contains':
+        needle = str(value)
+        return lambda field_value: needle in str(field_value)
+    if op == 'not_contains':
+        needle = str(value)
+        return lambda field_value: needle not in str(field_value)
+    if op == 'starts_with':
+        prefix = str(value)
+        return lambda field_value: str(field_value).startswith(prefix)
+    if op == 'ends_with':
+        suffix = str(value)
+        return lambda field_value: str(field_value).endswith(suffix)
+    if op == 'regex':
+        pattern = re.compile(value)
+        return lambda field_value: pattern.match(str(field_value)) is not None
+    if op == 'gt':
+        return _numeric(operator.gt, value)
+    if op == 'gte':
+        return _numeric(operator.ge, value)
+    if op == 'lt':
+        return _numeric(operator.lt, value)
+    if op == 'lte':
+        return _numeric(operator.le, value)
+
+    raise ValueError(f"Unknown condition operator: {op}")
+
+def compile_condition(condition: Dict) -> Predicate:
+    """{'field', 'operator', 'value'} koşulunu tek bir predicate'e derler."""
+    get = _field_getter(condition['field'])
+    try:
+        check = _compile_operator(condition['operator'], condition['value'])
+    except (ValueError, TypeError, re.error):
+        # Malformed conditions never match, as in the interpreted evaluator
+        return lambda context: False
+
+    def predicate(context: Dict) -> bool:
+        field_value = get(context)
+        if field_value is _MISSING or field_value is None:
+            return False
+        return check(field_value)
+
+    return predicate
+
+def compile_conditions(conditions: List[Dict]) -> Tuple[Predicate, ...]:
+    """Koşul listesini predicate tuple'ına derler."""
+    return tuple(compile_condition(condition) for condition in conditions)
+
+@lru_cache(maxsize=4096)
+def compile_matcher(pattern: str) -> Callable[[str], bool]:
+    """Action/resource pattern'ini tek çağrılık bir eşleştiriciye derler.
+
+    '*' her şeyle, 'orders.*' 'orders' altındaki her şeyle, diğer
+    pattern'ler yalnızca kendileriyle eşleşir.
+    """
+    if pattern == WILDCARD:
+        return lambda value: True
+
+    if pattern.endswith('.' + WILDCARD):
+        prefix = pattern[:-1]
+        return lambda value: value.startswith(prefix)
+
+    return lambda value: value == pattern
@@ -1,9 +1,22 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+import inspect
 import re
 from datetime import datetime, time
-from geopy.distance import geodesic
+import numpy as np
 from .models import Condition, ConditionType
 
+EARTH_RADIUS_METERS = 6371000.0
+
+WEEKDAY_NUMBERS = {
+    'Monday': 0,
+    'Tuesday': 1,
+    'Wednesday': 2,
+    'Thursday': 3,
+    'Friday': 4,
+    'Saturday': 5,
+    'Sunday': 6
+}
+
 class ConditionSystem:
     def __init__(self):
         self.condition_handlers = {
@@ -14,6 +27,10 @@ class ConditionSystem:
             ConditionType.USER_ATTRIBUTE: self._evaluate_user_attribute_condition,
             ConditionType.CUSTOM: self._evaluate_custom_condition
         }
+        # condition.id -> (parameters, start_time, end_time, allowed_weekdays)
+        self._time_condition_cache: Dict[Any, Tuple] = {}
+        # condition.id -> (fence, centers_rad, radii)
+        self._geo_fence_cache: Dict[Any, Tuple[Dict, np.ndarray, np.ndarray]] = {}
         
     async def evaluate_condition(self, condition: Condition,
                                context: Dict) -> Dict:
@@ -22,7 +39,10 @@ class ConditionSystem:
         if not handler:
             raise ValueError(f"Unknown condition type: {condition.type}")
             
-        result = await handler(condition, context)
+        # Pure handlers return their result directly; only await coroutines
+        result = handler(condition, context)
+        if inspect.isawaitable(result):
+            result = await result
         
         return {
             'condition_id': condition.id,
@@ -31,17 +51,14 @@ class ConditionSystem:
             'details': result['details']
         }
         
-    async def _evaluate_time_condition(self, condition: Condition,
-                                    context: Dict) -> Dict:
+    def _evaluate_time_condition(self, condition: Condition,
+                                 context: Dict) -> Dict:
         """Zaman bazlı koşul değerlendirmesi."""
         current_time = context['timestamp']
+        start_time, end_time, allowed_weekdays = self._get_time_rules(condition)
         
         # Time window check
-        if 'time_window' in condition.parameters:
-            window = condition.parameters['time_window']
-            start_time = time.fromisoformat(window['start'])
-            end_time = time.fromisoformat(window['end'])
-            
+        if start_time is not None:
             current_time_of_day = current_time.time()
             in_window = (
                 start_time <= current_time_of_day <= end_time
@@ -59,8 +76,8 @@ class ConditionSystem:
                 }
                 
         # Day of week check
-        if 'allowed_days' in condition.parameters:
-            if current_time.strftime('%A') not in condition.parameters['allowed_days']:
+        if allowed_weekdays is not None:
+            if current_time.weekday() not in allowed_weekdays:
                 return {
                     'met': False,
                     'details': 'Not allowed on this day'
@@ -68,22 +85,30 @@ class ConditionSystem:
                 
         return {'met': True, 'details': 'Time conditions met'}
         
-    async def _evaluate_location_condition(self, condition: Condition,
-                                        context: Dict) -> Dict:
+    def _evaluate_location_condition(self, condition: Condition,
+                                     context: Dict) -> Dict:
         """Lokasyon bazlı koşul değerlendirmesi."""
         user_location = context['location']
         
         # Geo-fence check
         if 'geo_fence' in condition.parameters:
             fence = condition.parameters['geo_fence']
-            user_coords = (user_location['latitude'],
-                         user_location['longitude'])
+            centers, radii = self._get_geo_fence_arrays(condition.id, fence)
             
-            for allowed_area in fence['allowed_areas']:
-                center = (allowed_area['lat'], allowed_area['lng'])
-                radius = allowed_area['radius']  # meters
+            if len(radii):
+                lat = np.radians(user_location['latitude'])
+                lng = np.radians(user_location['longitude'])
                 
-                if geodesic(user_coords, center).meters <= radius:
+                # Vectorized haversine distance to every allowed area center
+                dlat = centers[:, 0] - lat
+                dlng = centers[:, 1] - lng
+                a = (
+                    np.sin(dlat / 2) ** 2 +
+                    np.cos(lat) * np.cos(centers[:, 0]) * np.sin(dlng / 2) ** 2
+                )
+                distances = 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(a))
+                
+                if (distances <= radii).any():
                     return {'met': True, 'details': 'Within allowed area'}
                     
             return {
@@ -91,4 +116,51 @@ class ConditionSystem:
                 'details': 'Outside allowed areas'
             }
             
-        return {'met': True, 'details': 'Location conditions met'}
\ No newline at end of file
+        return {'met': True, 'details': 'Location conditions met'}
+        
+    def _get_time_rules(self, condition: Condition) -> Tuple[
+            Optional[time], Optional[time], Optional[frozenset]]:
+        """Zaman penceresini ve izinli günleri bir kez parse eder."""
+        parameters = condition.parameters
+        cached = self._time_condition_cache.get(condition.id)
+        if cached and cached[0] is parameters:
+            return cached[1], cached[2], cached[3]
+            
+        start_time = end_time = None
+        if 'time_window' in parameters:
+            window = parameters['time_window']
+            start_time = time.fromisoformat(window['start'])
+            end_time = time.fromisoformat(window['end'])
+            
+        allowed_weekdays = None
+        if 'allowed_days' in parameters:
+            allowed_weekdays = frozenset(
+                WEEKDAY_NUMBERS[day]
+                for day in parameters['allowed_days']
+                if day in WEEKDAY_NUMBERS
+            )
+            
+        self._time_condition_cache[condition.id] = (
+            parameters, start_time, end_time, allowed_weekdays
+        )
+        return start_time, end_time, allowed_weekdays
+        
+    def _get_geo_fence_arrays(self, condition_id: Any,
+                              fence: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Geo-fence merkezlerini ve yarıçaplarını dizi olarak döndürür."""
+        cached = self._geo_fence_cache.get(condition_id)
+        if cached and cached[0] is fence:
+            return cached[1], cached[2]
+            
+        areas = fence['allowed_areas']
+        centers = np.radians(np.array(
+            [[area['lat'], area['lng']] for area in areas],
+            dtype=np.float64
+        ).reshape(-1, 2))
+        radii = np.array(
+            [area['radius'] for area in areas],  # meters
+            dtype=np.float64
+        )
+        
+        self._geo_fence_cache[condition_id] = (fence, centers, radii)
+        return centers, radii
\ No newline at end of file
@@ -1,6 +1,7 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from datetime import datetime
 import asyncio
+import json
 from .cache_manager import CacheManager
 from .context_builder import ContextBuilder
 
@@ -8,10 +9,48 @@ class DynamicRoleResolver:
     def __init__(self):
         self.cache = CacheManager()
         self.context_builder = ContextBuilder()
+        # Caps concurrent resolutions (context builds hit the database)
+        self.resolution_semaphore = asyncio.Semaphore(20)
+        # (user_id, request context key) -> in-flight resolution
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
         
     async def resolve_roles(self, user_id: str,
-                          request_context: Dict) -> List[Dict]:
+                          request_context: Dict) -> Dict:
         """Dinamik rol çözümlemesi yapar."""
+        # Identical concurrent requests share a single resolution
+        key = (
+            user_id,
+            json.dumps(request_context, sort_keys=True, default=str)
+        )
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._resolve_limited(user_id, request_context)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(
+                lambda done, key=key: self._resolution_done(key, done)
+            )
+            
+        # The resolution runs in its own task: one caller going away (e.g. a
+        # client disconnect) cancels only its own wait, not the others'
+        return await asyncio.shield(task)
+        
+    async def _resolve_limited(self, user_id: str,
+                               request_context: Dict) -> Dict:
+        async with self.resolution_semaphore:
+            return await self._resolve_roles(user_id, request_context)
+            
+    def _resolution_done(self, key: Tuple[str, str], task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark retrieved so a failure nobody else awaited is not logged
+        if not task.cancelled():
+            task.exception()
+            
+    async def _resolve_roles(self, user_id: str,
+                           request_context: Dict) -> Dict:
+        """Rol çözümlemesini gerçekleştirir."""
         # Build context
         context = await self.context_builder.build_context(
             user_id, request_context
@@ -40,22 +79,31 @@ class DynamicRoleResolver:
     async def _apply_dynamic_rules(self, roles: List[Dict],
                                  context: Dict) -> List[Dict]:
         """Dinamik rol kurallarını uygular."""
-        dynamic_roles = []
+        # Roles are independent; evaluate them concurrently, keep order
+        role_results = await asyncio.gather(
+            *(self._apply_role_rules(role, context) for role in roles)
+        )
+        
+        return [
+            dynamic_role
+            for role_result in role_results
+            for dynamic_role in role_result
+        ]
+        
+    async def _apply_role_rules(self, role: Dict,
+                              context: Dict) -> List[Dict]:
+        """Tek bir role dinamik kuralları uygular."""
+        # Check dynamic conditions
+        if not await self._evaluate_role_conditions(role, context):
+            return []
+            
+        # Apply dynamic attributes and look up dynamic child roles
+        dynamic_role, child_roles = await asyncio.gather(
+            self._enhance_role(role, context),
+            self._get_dynamic_child_roles(role, context)
+        )
         
-        for role in roles:
-            # Check dynamic conditions
-            if await self._evaluate_role_conditions(role, context):
-                # Apply dynamic attributes
-                dynamic_role = await self._enhance_role(role, context)
-                dynamic_roles.append(dynamic_role)
-                
-                # Check for dynamic child roles
-                if child_roles := await self._get_dynamic_child_roles(
-                    role, context
-                ):
-                    dynamic_roles.extend(child_roles)
-                    
-        return dynamic_roles
+        return [dynamic_role, *(child_roles or [])]
         
     async def _enhance_role(self, role: Dict,
                           context: Dict) -> Dict:
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Tuple
+
+WILDCARD = '*'
+
+class PermissionTrie:
+    """Permission'ları (action, resource segmentleri...) yolunda saklar.
+
+    '*' segmenti tek bir segmentle eşleşir; bir düğümde saklanan
+    permission o düğümün altındaki tüm kaynakları kapsar
+    (örn. ('read', 'orders') -> ('read', 'orders', 'amount')).
+    """
+
+    __slots__ = ('children', 'values')
+
+    def __init__(self):
+        self.children: Dict[str, 'PermissionTrie'] = {}
+        self.values: List[Any] = []
+
+    def insert(self, path: Tuple[str, ...], value: Any) -> None:
+        """Verilen yola bir permission ekler."""
+        node = self
+        for segment in path:
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = PermissionTrie()
+            node = child
+        node.values.append(value)
+
+    def match(self, path: Tuple[str, ...]) -> List[Any]:
+        """Yolu kapsayan tüm permission'ları döndürür."""
+        matches: List[Any] = []
+        nodes = [self]
+
+        for segment in path:
+            next_nodes = []
+            for node in nodes:
+                matches.extend(node.values)
+                exact = node.children.get(segment)
+                if exact is not None:
+                    next_nodes.append(exact)
+                if segment != WILDCARD:
+                    wildcard = node.children.get(WILDCARD)
+                    if wildcard is not None:
+                        next_nodes.append(wildcard)
+            if not next_nodes:
+                return matches
+            nodes = next_nodes
+
+        for node in nodes:
+            matches.extend(node.values)
+        return matches
+
+    def __contains__(self, path: Tuple[str, ...]) -> bool:
+        return bool(self.match(path))
@@ -1,43 +1,74 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import json
+import numpy as np
 from datetime import datetime
 from .models import Policy, PolicyEffect
+from .condition_compiler import Predicate, compile_conditions, compile_matcher
 
 class PolicyEngine:
     def __init__(self):
         self.cache_ttl = 300  # seconds
         self.policy_cache = {}
+        # Caps concurrent policy evaluations hitting the policy store
+        self.evaluation_semaphore = asyncio.Semaphore(32)
+        # policy.id -> (conditions, compiled predicates)
+        self._compiled_conditions: Dict = {}
         
     async def evaluate_policies(self, context: Dict) -> Dict:
         """Policy değerlendirmesi yapar."""
         # Get applicable policies
         policies = await self._get_applicable_policies(context)
         
-        # Evaluate each policy
-        results = []
-        for policy in policies:
-            evaluation = await self._evaluate_policy(
-                policy, context
-            )
-            results.append(evaluation)
+        # Evaluate policies concurrently
+        evaluations = await asyncio.gather(
+            *(self._evaluate_policy_bounded(policy, context)
+              for policy in policies),
+            return_exceptions=True
+        )
+        # A failed or cancelled evaluation (CancelledError is a BaseException
+        # and comes back as a value too) fails closed
+        results = [
+            evaluation if not isinstance(evaluation, BaseException) else {
+                'policy_id': policy.id,
+                'effect': PolicyEffect.DENY,
+                'reason': (
+                    'Evaluation cancelled'
+                    if isinstance(evaluation, asyncio.CancelledError)
+                    else 'Evaluation error'
+                )
+            }
+            for policy, evaluation in zip(policies, evaluations)
+        ]
             
-        # Combine results
-        final_effect = self._determine_final_effect(results)
+        # Combine results over a single deny mask
+        denied = np.fromiter(
+            (r['effect'] == PolicyEffect.DENY for r in results),
+            dtype=bool,
+            count=len(results)
+        )
+        final_effect = self._determine_final_effect(denied)
         
         return {
             'allowed': final_effect == PolicyEffect.ALLOW,
-            'reason': self._get_denial_reason(results),
-            'applied_policies': [r['policy_id'] for r in results]
+            'reason': self._get_denial_reason(results, denied),
+            'applied_policies': [policy.id for policy in policies]
         }
         
+    async def _evaluate_policy_bounded(self, policy: Policy,
+                                     context: Dict) -> Dict:
+        """Policy değerlendirmesini eşzamanlılık sınırı altında yapar."""
+        async with self.evaluation_semaphore:
+            return await self._evaluate_policy(policy, context)
+            
     async def _evaluate_policy(self, policy: Policy,
                              context: Dict) -> Dict:
         """Tek bir policy değerlendirir."""
         try:
             # Check conditions
             conditions_met = all(
-                self._evaluate_condition(c, context)
-                for c in policy.conditions
+                predicate(context)
+                for predicate in self._get_compiled_conditions(policy)
             )
             
             # Check resource match
@@ -72,4 +103,37 @@ class PolicyEngine:
                 'policy_id': policy.id,
                 'effect': PolicyEffect.DENY,
                 'reason': 'Evaluation error'
-            }
\ No newline at end of file
+            }
+            
+    def _determine_final_effect(self, denied: np.ndarray) -> PolicyEffect:
+        """Deny-overrides: tek bir DENY ya da hiç policy yoksa DENY."""
+        if denied.size == 0 or denied.any():
+            return PolicyEffect.DENY
+        return PolicyEffect.ALLOW
+        
+    def _get_denial_reason(self, results: List[Dict],
+                           denied: np.ndarray) -> Optional[str]:
+        """İlk reddeden policy'nin gerekçesini döndürür."""
+        if denied.size == 0:
+            return 'No applicable policies'
+        if not denied.any():
+            return None
+        return results[int(denied.argmax())]['reason']
+        
+    def _match_resource(self, policy_resource: str, resource: str) -> bool:
+        """Policy resource pattern'ini kaynakla eşleştirir."""
+        return compile_matcher(policy_resource)(resource)
+        
+    def _match_action(self, policy_action: str, action: str) -> bool:
+        """Policy action pattern'ini action ile eşleştirir."""
+        return compile_matcher(policy_action)(action)
+        
+    def _get_compiled_conditions(self, policy: Policy) -> Tuple[Predicate, ...]:
+        """Policy koşullarını bir kez derleyip cache'ler."""
+        cached = self._compiled_conditions.get(policy.id)
+        if cached and cached[0] is policy.conditions:
+            return cached[1]
+            
+        compiled = compile_conditions(policy.conditions)
+        self._compiled_conditions[policy.id] = (policy.conditions, compiled)
+        return compiled
\ No newline at end of file
@@ -1,24 +1,31 @@
-from typing import Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+import copy
 from .parser import SQLParser
 from .role_manager import RoleManager
+from .permission_trie import PermissionTrie
 from .query_analyzer import QueryAnalyzer
+from utils.query_fingerprint import fingerprint_query
+
+ANALYSIS_CACHE_SIZE = 8192
+RLS_CACHE_SIZE = 8192
 
 class SQLQueryController:
     def __init__(self):
         self.parser = SQLParser()
         self.role_manager = RoleManager()
         self.query_analyzer = QueryAnalyzer()
+        # fingerprint -> (parsed, required permission paths)
+        self._analysis_cache: OrderedDict[bytes, Tuple[Any, Tuple]] = OrderedDict()
+        # (fingerprint, applied predicates) -> rewritten SQL
+        self._rls_cache: OrderedDict[Tuple[bytes, Tuple], str] = OrderedDict()
         
     async def authorize_query(self, query: str, 
                             context: Dict) -> Dict:
         """Query authorization yapar."""
-        # Parse query
-        parsed = self.parser.parse_query(query)
-        
-        # Analyze query for required permissions
-        required_permissions = await self._analyze_required_permissions(
-            parsed
-        )
+        # Parse query and analyze required permissions (cached per query)
+        fingerprint = fingerprint_query(query)
+        parsed, required_permissions = self._parse_and_analyze(query, fingerprint)
         
         # Get user's effective permissions
         user_permissions = await self._get_user_permissions(
@@ -41,7 +48,7 @@ class SQLQueryController:
             
         # Apply row-level security
         modified_query = await self._apply_rls(
-            parsed, context
+            parsed, fingerprint, context
         )
         
         return {
@@ -50,38 +57,105 @@ class SQLQueryController:
             'applied_policies': authorization['applied_policies']
         }
         
-    async def _analyze_required_permissions(self, 
-                                         parsed_query) -> List[str]:
+    def _parse_and_analyze(self, query: str,
+                           fingerprint: bytes) -> Tuple[Any, Tuple]:
+        """Parse sonucunu ve gerekli permissionları fingerprint ile cache'ler."""
+        cached = self._analysis_cache.get(fingerprint)
+        if cached:
+            self._analysis_cache.move_to_end(fingerprint)
+            return cached
+            
+        parsed = self.parser.parse_query(query)
+        required = tuple(dict.fromkeys(
+            self._analyze_required_permissions(parsed)
+        ))
+        
+        self._analysis_cache[fingerprint] = (parsed, required)
+        if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return parsed, required
+        
+    def _analyze_required_permissions(self, 
+                                      parsed_query) -> Iterator[Tuple[str, ...]]:
         """Query için gerekli permissionları analiz eder."""
-        permissions = set()
+        # Permission paths match PermissionTrie keys: (action, *resource)
         
         # Table permissions
         for table in parsed_query.tables:
-            operations = self._get_table_operations(parsed_query, table)
-            for operation in operations:
-                permissions.add(f"{operation}:{table}")
+            for operation in self._get_table_operations(parsed_query, table):
+                yield (operation, table)
                 
         # Column permissions
         for column in parsed_query.columns:
-            permissions.add(f"read:{column.table}.{column.name}")
+            yield ('read', column.table, column.name)
             
         # Special permissions
         if parsed_query.has_function_calls:
-            permissions.add("execute:functions")
+            yield ('execute', 'functions')
             
-        return list(permissions)
+    async def _get_user_permissions(self, user_id: str) -> PermissionTrie:
+        """Kullanıcının effective permission trie'sini getirir."""
+        return await self.role_manager.get_permission_trie(user_id)
         
-    async def _apply_rls(self, parsed_query, context: Dict) -> str:
+    async def _check_permissions(self, required_permissions: Tuple[Tuple[str, ...], ...],
+                                 user_permissions: PermissionTrie,
+                                 context: Dict) -> Dict:
+        """Gerekli permissionları kullanıcının trie'si üzerinde kontrol eder."""
+        # One trie pass and one condition evaluation for all required paths
+        granted = await self.role_manager.match_permissions_batch(
+            user_permissions, list(required_permissions), context
+        )
+        
+        missing = [
+            path for path, permissions in zip(required_permissions, granted)
+            if not permissions
+        ]
+        if missing:
+            return {
+                'authorized': False,
+                'reason': 'Missing required permissions',
+                'missing': missing,
+                'applied_policies': []
+            }
+            
+        return {
+            'authorized': True,
+            'reason': None,
+            'missing': [],
+            'applied_policies': list(dict.fromkeys(
+                p.id for permissions in granted for p in permissions
+            ))
+        }
+        
+    async def _apply_rls(self, parsed_query, fingerprint: bytes,
+                         context: Dict) -> str:
         """Row-level security uygular."""
         # Get RLS policies
         policies = await self._get_rls_policies(context)
         
-        if not policies:
-            return parsed_query.to_sql()
+        # The rewrite depends only on the query and the predicates applied,
+        # so it is done once per combination rather than per request
+        key = (fingerprint, tuple(policy.predicate for policy in policies or ()))
+        cached = self._rls_cache.get(key)
+        if cached is not None:
+            self._rls_cache.move_to_end(key)
+            return cached
             
-        # Apply each policy
-        modified = parsed_query
-        for policy in policies:
-            modified = self._apply_policy(modified, policy)
+        if not policies:
+            sql = parsed_query.to_sql()
+        else:
+            # Cached parse trees are shared between requests, so policies
+            # are applied in place to a private copy
+            modified = copy.deepcopy(parsed_query)
+            for policy in policies:
+                self._apply_policy(modified, policy)
+            sql = modified.to_sql()
             
-        return modified.to_sql()
\ No newline at end of file
+        self._rls_cache[key] = sql
+        if len(self._rls_cache) > RLS_CACHE_SIZE:
+            self._rls_cache.popitem(last=False)
+        return sql
+        
+    def _apply_policy(self, parsed_query, policy) -> None:
+        """RLS policy predicate'ini AST'ye yerinde ekler."""
+        parsed_query.add_condition(policy.predicate)
\ No newline at end of file
@@ -1,14 +1,22 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 import asyncio
+import time
 from .models import Role, Permission, RoleAssignment
 from .policy_engine import PolicyEngine
 from .audit_logger import AuditLogger
+from .permission_trie import PermissionTrie
 
 class RoleManager:
     def __init__(self):
         self.policy_engine = PolicyEngine()
         self.audit = AuditLogger()
+        self.permission_cache_ttl = 60  # seconds
+        # user_id -> (trie, expires_at)
+        self._permission_tries: Dict[str, Tuple[PermissionTrie, float]] = {}
+        # Called with the user_id (None: everyone) whenever roles change,
+        # e.g. SecurityManager.invalidate; user_id is the tokens' 'sub'
+        self._invalidation_listeners: List[Callable[[Optional[str]], None]] = []
         
     async def create_role(self, role_data: Dict) -> Role:
         """Yeni rol oluşturur."""
@@ -61,6 +69,7 @@ class RoleManager:
             
             # Assignment kaydet
             await role_assignment.save()
+            self.invalidate_permissions(role_assignment.user_id)
             
             # Audit log
             await self.audit.log_role_assignment(role_assignment)
@@ -71,6 +80,26 @@ class RoleManager:
             await self.audit.log_error('role_assignment', str(e))
             raise
             
+    async def revoke_role(self, assignment: Dict) -> None:
+        """Rol atamasını kaldırır."""
+        try:
+            role_assignment = RoleAssignment(
+                user_id=assignment['user_id'],
+                role_id=assignment['role_id'],
+                assigned_by=assignment['revoked_by']
+            )
+            
+            # Assignment sil
+            await role_assignment.delete()
+            self.invalidate_permissions(role_assignment.user_id)
+            
+            # Audit log
+            await self.audit.log_role_revocation(role_assignment)
+            
+        except Exception as e:
+            await self.audit.log_error('role_revocation', str(e))
+            raise
+            
     async def check_permission(self, context: Dict) -> bool:
         """Permission kontrolü yapar."""
         try:
@@ -78,23 +107,12 @@ class RoleManager:
             action = context['action']
             resource = context['resource']
             
-            # Get user roles
-            roles = await self._get_user_roles(user_id)
-            
-            # Get effective permissions
-            permissions = await self._get_effective_permissions(roles)
-            
-            # Check conditions
-            conditions_met = await self._check_conditions(
-                permissions, context
-            )
-            
-            # Check specific permissions
-            has_permission = any(
-                self._match_permission(p, action, resource)
-                for p in permissions
-                if conditions_met[p.id]
+            # Permissions covering (action, *resource segments)
+            trie = await self.get_permission_trie(user_id)
+            granted = await self.match_permissions(
+                trie, (action, *self.split_resource(resource)), context
             )
+            has_permission = bool(granted)
             
             # Audit log
             await self.audit.log_permission_check(
@@ -105,4 +123,78 @@ class RoleManager:
             
         except Exception as e:
             await self.audit.log_error('permission_check', str(e))
-            return False
\ No newline at end of file
+            return False
+            
+    async def get_permission_trie(self, user_id: str) -> PermissionTrie:
+        """Kullanıcının effective permission trie'sini döndürür."""
+        cached = self._permission_tries.get(user_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+            
+        roles = await self._get_user_roles(user_id)
+        permissions = await self._get_effective_permissions(roles)
+        
+        trie = PermissionTrie()
+        for permission in permissions:
+            trie.insert(
+                (permission.action, *self.split_resource(permission.resource)),
+                permission
+            )
+            
+        self._permission_tries[user_id] = (
+            trie, time.monotonic() + self.permission_cache_ttl
+        )
+        return trie
+        
+    async def match_permissions(self, trie: PermissionTrie,
+                                path: Tuple[str, ...],
+                                context: Dict) -> List[Permission]:
+        """Yolu kapsayan ve koşulları sağlanan permission'ları döndürür."""
+        granted = await self.match_permissions_batch(trie, [path], context)
+        return granted[0]
+        
+    async def match_permissions_batch(self, trie: PermissionTrie,
+                                      paths: List[Tuple[str, ...]],
+                                      context: Dict) -> List[List[Permission]]:
+        """Her yol için koşulları sağlanan permission'ları döndürür."""
+        matches = [trie.match(path) for path in paths]
+        
+        # Conditions are checked once for the union of all candidates
+        candidates = {p.id: p for permissions in matches for p in permissions}
+        if not candidates:
+            return matches
+            
+        conditions_met = await self._check_conditions(
+            list(candidates.values()), context
+        )
+        return [
+            [p for p in permissions if conditions_met[p.id]]
+            for permissions in matches
+        ]
+        
+    async def check_permissions_batch(self, user_id: str,
+                                      paths: List[Tuple[str, ...]],
+                                      context: Dict) -> List[bool]:
+        """Birden fazla permission yolunu tek seferde kontrol eder."""
+        trie = await self.get_permission_trie(user_id)
+        granted = await self.match_permissions_batch(trie, paths, context)
+        return [bool(permissions) for permissions in granted]
+        
+    def add_invalidation_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        """Rol değişikliklerinde çağrılacak cache invalidation callback'i ekler."""
+        self._invalidation_listeners.append(listener)
+        
+    def invalidate_permissions(self, user_id: Optional[str] = None) -> None:
+        """Permission trie cache'ini ve bağlı karar cache'lerini temizler."""
+        if user_id is None:
+            self._permission_tries.clear()
+        else:
+            self._permission_tries.pop(user_id, None)
+            
+        for listener in self._invalidation_listeners:
+            listener(user_id)
+            
+    @staticmethod
+    def split_resource(resource: str) -> Tuple[str, ...]:
+        """'db.table.column' biçimindeki kaynağı segmentlere ayırır."""
+        return tuple(resource.split('.'))
\ No newline at end of file
@@ -1,11 +1,21 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Pattern, Tuple
 import yaml
 from pathlib import Path
 import re
 
+RULES_PATH = Path('config/query_rules.yml')
+
+# libyaml-backed loader when available; same safe semantics
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Process-wide: path -> (mtime, rules, syntax_patterns, syntax_prefilter)
+_COMPILED_RULES: Dict[Path, Tuple] = {}
+
 class QueryRulesEngine:
     def __init__(self):
-        self.rules = self._load_rules()
+        (self.rules,
+         self.syntax_patterns,
+         self.syntax_prefilter) = self._load_rules()
         
     def evaluate_query(self, query: str, 
                       context: Dict) -> Dict:
@@ -34,18 +44,55 @@ class QueryRulesEngine:
         
         return results
         
-    def _load_rules(self) -> Dict:
-        """Rule tanımlarını yükler."""
-        rules_path = Path('config/query_rules.yml')
-        with open(rules_path) as f:
-            return yaml.safe_load(f)
+    def _load_rules(self) -> Tuple[Dict, List[Tuple[Dict, Pattern]], Optional[Pattern]]:
+        """Rule tanımlarını yükler; dosya değişmedikçe derlenmiş hali paylaşılır."""
+        mtime = RULES_PATH.stat().st_mtime
+        cached = _COMPILED_RULES.get(RULES_PATH)
+        if cached and cached[0] == mtime:
+            return cached[1:]
+            
+        with open(RULES_PATH) as f:
+            rules = yaml.load(f, Loader=_YAML_LOADER)
+            
+        compiled = (
+            rules,
+            self._compile_syntax_rules(rules['syntax']),
+            self._compile_prefilter(rules['syntax'])
+        )
+        _COMPILED_RULES[RULES_PATH] = (mtime, *compiled)
+        return compiled
+        
+    def _compile_syntax_rules(self, rules: List[Dict]) -> List[Tuple[Dict, Pattern]]:
+        """Syntax rule pattern'lerini bir kez derler."""
+        return [(rule, re.compile(rule['pattern'])) for rule in rules]
+        
+    def _compile_prefilter(self, rules: List[Dict]) -> Optional[Pattern]:
+        """Tüm syntax pattern'lerini tek bir alternation'da birleştirir."""
+        if not rules:
+            return None
+            
+        # Joining renumbers capture groups, so a backreference would silently
+        # point at another rule's group; only group-free patterns are merged
+        if any(re.compile(rule['pattern']).groups for rule in rules):
+            return None
+            
+        try:
+            return re.compile(
+                '|'.join(f"(?:{rule['pattern']})" for rule in rules)
+            )
+        except re.error:
+            # e.g. inline global flags that are only valid at the start
+            return None
             
     def _check_syntax_rules(self, query: str) -> List[Dict]:
         """Syntax kurallarını kontrol eder."""
         violations = []
         
-        for rule in self.rules['syntax']:
-            pattern = re.compile(rule['pattern'])
+        # Clean queries (the common case) cost a single scan
+        if self.syntax_prefilter and not self.syntax_prefilter.search(query):
+            return violations
+            
+        for rule, pattern in self.syntax_patterns:
             if pattern.search(query):
                 violations.append({
                     'type': 'syntax',
@@ -1,28 +1,107 @@
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime
-import elasticsearch
+import asyncio
+import logging
+from elasticsearch import AsyncElasticsearch
+from elasticsearch.helpers import async_bulk, async_scan
 from .enhanced_security import SecurityManager
 
+AUDIT_INDEX = 'sqlproxy-audit'
+
+# Queued by close() to make the flusher write what it holds and exit
+_STOP = object()
+
 class AuditSystem:
     def __init__(self):
-        self.es = elasticsearch.Elasticsearch(['http://localhost:9200'])
+        self.es = AsyncElasticsearch(['http://localhost:9200'])
         self.security_manager = SecurityManager()
+        self.logger = logging.getLogger('audit_system')
+        self.batch_size = 500
+        self.flush_interval = 0.25  # seconds
+        self.max_pending = 10000  # log_event waits once this many are queued
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._closed = False
         
-    def log_event(self, event_type: str, data: Dict):
+    async def log_event(self, event_type: str, data: Dict):
+        # A closed client can't take writes; restarting the flusher would
+        # only lose the event later
+        if self._closed:
+            raise RuntimeError("AuditSystem is closed")
+            
         event = {
             'timestamp': datetime.utcnow(),
             'event_type': event_type,
-            'data': self.security_manager.encrypt_sensitive_data(data)
+            'data': self.security_manager.encrypt_sensitive_data(
+                data, associated_data=event_type.encode()
+            )
         }
         
-        self.es.index(
-            index='sqlproxy-audit',
-            document=event
-        )
+        # Events are queued and written by a background _bulk flusher
+        if self._flusher is None or self._flusher.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._flusher = asyncio.create_task(self._flush_events())
+            
+        # Bounded queue: when Elasticsearch falls behind, callers wait here
+        # rather than audit events being dropped
+        await self._queue.put(event)
+        
+    async def close(self) -> None:
+        """Bekleyen event'leri yazar ve bağlantıyı kapatır."""
+        # Set first: events logged while draining would land behind _STOP
+        self._closed = True
+        if self._flusher is not None and not self._flusher.done():
+            await self._queue.put(_STOP)
+            await self._flusher
+        self._flusher = None
+        
+        await self.es.close()
+        
+    async def _flush_events(self) -> None:
+        """Kuyruktaki event'leri boyut/süre sınırıyla toplu yazar."""
+        loop = asyncio.get_running_loop()
+        stopping = False
         
-    def get_user_activity(self, user_id: int, 
+        while not stopping:
+            event = await self._queue.get()
+            if event is _STOP:
+                return
+                
+            batch = [event]
+            deadline = loop.time() + self.flush_interval
+            
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+                
+            await self._write_batch(batch)
+            
+    async def _write_batch(self, batch: List[Dict]) -> None:
+        """Event batch'ini tek bir _bulk isteğiyle yazar."""
+        try:
+            await async_bulk(
+                self.es,
+                ({'_index': AUDIT_INDEX, '_source': event} for event in batch),
+                chunk_size=self.batch_size
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Failed to write {len(batch)} audit events: {str(e)}"
+            )
+            
+    async def get_user_activity(self, user_id: int, 
                          start_date: datetime,
-                         end_date: datetime) -> List[Dict]:
+                         end_date: datetime) -> AsyncIterator[Dict]:
         query = {
             'query': {
                 'bool': {
@@ -38,17 +117,22 @@ class AuditSystem:
                         }
                     ]
                 }
-            }
+            },
+            'sort': [{'timestamp': 'asc'}]
         }
         
-        result = self.es.search(
-            index='sqlproxy-audit',
-            body=query
-        )
-        
-        return [hit['_source'] for hit in result['hits']['hits']]
-        
-    def analyze_security_events(self) -> Dict:
+        # Page through all hits in timestamp order without the 10k cap
+        async for hit in async_scan(
+            self.es,
+            index=AUDIT_INDEX,
+            query=query,
+            size=1000,
+            preserve_order=True,
+            preference='_local'
+        ):
+            yield hit['_source']
+            
+    async def analyze_security_events(self) -> Dict:
         # Analyze security events for patterns
         aggs_query = {
             'aggs': {
@@ -66,8 +150,8 @@ class AuditSystem:
             }
         }
         
-        result = self.es.search(
-            index='sqlproxy-audit',
+        result = await self.es.search(
+            index=AUDIT_INDEX,
             body=aggs_query
         )
         
@@ -1,35 +1,73 @@
-from typing import Dict, List, Optional
-from cryptography.fernet import Fernet
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from datetime import datetime
+import base64
+import json
+import os
+import re
 import jwt
 import hashlib
 
+# Holds all sensitive fields of a record as one AES-GCM blob
+ENCRYPTED_FIELDS_KEY = '_encrypted'
+NONCE_SIZE = 12
+FIELD_PLAN_CACHE_SIZE = 1024
+
+SENSITIVE_FIELDS = ('password', 'credit_card', 'ssn', 'address')
+_SENSITIVE_FIELD_PATTERN = re.compile(
+    '|'.join(map(re.escape, SENSITIVE_FIELDS)),
+    re.IGNORECASE
+)
+
+@lru_cache(maxsize=1024)
+def _is_sensitive_field_name(field: str) -> bool:
+    # Field names repeat across events, so most checks are a cache hit
+    return _SENSITIVE_FIELD_PATTERN.search(field) is not None
+
+@lru_cache(maxsize=4096)
+def _sha256_hexdigest(query: str) -> str:
+    # Repeated (prepared) statements skip re-encoding and re-hashing
+    return hashlib.sha256(query.encode()).hexdigest()
+
 class SecurityManager:
     def __init__(self):
-        self.encryption_key = Fernet.generate_key()
-        self.fernet = Fernet(self.encryption_key)
+        self.encryption_key = AESGCM.generate_key(bit_length=256)
+        self.aead = AESGCM(self.encryption_key)
         self.audit_log = []
+        # record keys -> (plain keys, sensitive keys)
+        self._field_plans: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
         
-    def encrypt_sensitive_data(self, data: Dict) -> Dict:
-        encrypted_data = {}
-        for key, value in data.items():
-            if self._is_sensitive_field(key):
-                encrypted_data[key] = self.fernet.encrypt(
-                    str(value).encode()
-                ).decode()
-            else:
-                encrypted_data[key] = value
+    def encrypt_sensitive_data(self, data: Dict,
+                               associated_data: Optional[bytes] = None) -> Dict:
+        # All sensitive fields are sealed with a single AES-GCM call
+        plain_keys, sensitive_keys = self._get_field_plan(tuple(data))
+        encrypted_data = {key: data[key] for key in plain_keys}
+        
+        if sensitive_keys:
+            sensitive = {key: str(data[key]) for key in sensitive_keys}
+            nonce = os.urandom(NONCE_SIZE)
+            ciphertext = self.aead.encrypt(
+                nonce,
+                json.dumps(sensitive).encode(),
+                associated_data
+            )
+            encrypted_data[ENCRYPTED_FIELDS_KEY] = base64.b64encode(
+                nonce + ciphertext
+            ).decode()
         return encrypted_data
         
-    def decrypt_sensitive_data(self, data: Dict) -> Dict:
-        decrypted_data = {}
-        for key, value in data.items():
-            if self._is_sensitive_field(key):
-                decrypted_data[key] = self.fernet.decrypt(
-                    value.encode()
-                ).decode()
-            else:
-                decrypted_data[key] = value
+    def decrypt_sensitive_data(self, data: Dict,
+                               associated_data: Optional[bytes] = None) -> Dict:
+        decrypted_data = dict(data)
+        sealed = decrypted_data.pop(ENCRYPTED_FIELDS_KEY, None)
+        if sealed is not None:
+            raw = base64.b64decode(sealed)
+            decrypted_data.update(json.loads(self.aead.decrypt(
+                raw[:NONCE_SIZE],
+                raw[NONCE_SIZE:],
+                associated_data
+            )))
         return decrypted_data
         
     def validate_access(self, user: Dict, query: str, table: str) -> bool:
@@ -56,14 +94,21 @@ class SecurityManager:
         }
         self.audit_log.append(log_entry)
         
+    def _get_field_plan(self, keys: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Bir kayıt şeması için düz ve hassas alanları bir kez ayırır."""
+        plan = self._field_plans.get(keys)
+        if plan is None:
+            plan = (
+                tuple(key for key in keys if not self._is_sensitive_field(key)),
+                tuple(key for key in keys if self._is_sensitive_field(key))
+            )
+            if len(self._field_plans) >= FIELD_PLAN_CACHE_SIZE:
+                self._field_plans.clear()
+            self._field_plans[keys] = plan
+        return plan
+        
     def _is_sensitive_field(self, field: str) -> bool:
-        sensitive_fields = [
-            'password', 'credit_card', 'ssn', 'address'
-        ]
-        return any(
-            sensitive in field.lower() 
-            for sensitive in sensitive_fields
-        )
+        return _is_sensitive_field_name(field)
         
     def _check_row_level_security(self, user: Dict, table: str) -> bool:
         # Implement row-level security checks
@@ -82,4 +127,4 @@ class SecurityManager:
         
     def _hash_query(self, query: str) -> str:
         # Hash query for audit log
-        return hashlib.sha256(query.encode()).hexdigest()
\ No newline at end of file
+        return _sha256_hexdigest(query)
\ No newline at end of file
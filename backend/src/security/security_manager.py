@@ -1,16 +1,26 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
 from cryptography.fernet import Fernet
 import jwt
+import time
 from datetime import datetime, timedelta
 from .audit_logger import AuditLogger
 from .access_control import AccessControl
 
 class SecurityManager:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, role_manager=None):
         self.config = config
         self.fernet = Fernet(config['encryption_key'])
         self.audit = AuditLogger()
         self.access_control = AccessControl()
+        self.decision_cache_ttl = 60  # seconds
+        self.decision_cache_size = 10000
+        # (token, resource, action) -> (allowed, expires_at, user, version)
+        self._decision_cache: OrderedDict[Tuple[str, str, str], Tuple] = OrderedDict()
+        # token subject ('sub') -> bumped on every role change
+        self._user_versions: Dict[str, int] = {}
+        if role_manager is not None:
+            role_manager.add_invalidation_listener(self.invalidate)
         
     async def authenticate(self, credentials: Dict) -> Optional[Dict]:
         """User authentication."""
@@ -45,24 +55,37 @@ class SecurityManager:
                        action: str) -> bool:
         """Resource authorization."""
         try:
-            # Verify token
-            payload = jwt.decode(
-                token,
-                self.config['jwt_secret'],
-                algorithms=['HS256']
-            )
-            
-            # Check permissions
-            if not await self.access_control.check_permission(
-                user=payload['sub'],
-                resource=resource,
-                action=action
-            ):
+            cached = self._get_cached_decision(token, resource, action)
+            if cached is not None:
+                allowed, username = cached
+            else:
+                # Verify token
+                payload = jwt.decode(
+                    token,
+                    self.config['jwt_secret'],
+                    algorithms=['HS256']
+                )
+                username = payload['sub']
+                # Read before the check: a role change while it runs must
+                # leave the decision stale, not cached as current
+                version = self._user_versions.get(username, 0)
+                
+                # Check permissions
+                allowed = await self.access_control.check_permission(
+                    user=username,
+                    resource=resource,
+                    action=action
+                )
+                self._cache_decision(
+                    token, resource, action, allowed, payload, version
+                )
+                
+            if not allowed:
                 return False
                 
             # Log access
             await self.audit.log_access_event(
-                username=payload['sub'],
+                username=username,
                 resource=resource,
                 action=action
             )
@@ -76,4 +99,48 @@ class SecurityManager:
                 action=action,
                 error=str(e)
             )
-            return False
\ No newline at end of file
+            return False
+            
+    def invalidate(self, subject: Optional[str] = None) -> None:
+        """Token subject'inin ('sub') cache'lenmiş yetki kararlarını geçersiz kılar."""
+        if subject is None:
+            self._decision_cache.clear()
+        else:
+            self._user_versions[subject] = self._user_versions.get(subject, 0) + 1
+        
+    def _get_cached_decision(self, token: str, resource: str,
+                             action: str) -> Optional[Tuple[bool, str]]:
+        """Geçerli bir cache kararı varsa (allowed, user) döndürür."""
+        key = (token, resource, action)
+        entry = self._decision_cache.get(key)
+        if entry is None:
+            return None
+            
+        allowed, expires_at, user, version = entry
+        if (expires_at <= time.monotonic() or
+                version != self._user_versions.get(user, 0)):
+            del self._decision_cache[key]
+            return None
+            
+        self._decision_cache.move_to_end(key)
+        return allowed, user
+        
+    def _cache_decision(self, token: str, resource: str, action: str,
+                        allowed: bool, payload: Dict, version: int) -> None:
+        """Yetki kararını TTL ve token süresiyle sınırlı olarak saklar."""
+        user = payload['sub']
+        expires_at = time.monotonic() + self.decision_cache_ttl
+        
+        # Never outlive the token itself
+        if 'exp' in payload:
+            expires_at = min(
+                expires_at,
+                time.monotonic() + (payload['exp'] - time.time())
+            )
+            
+        self._decision_cache[(token, resource, action)] = (
+            allowed, expires_at, user, version
+        )
+        self._decision_cache.move_to_end((token, resource, action))
+        if len(self._decision_cache) > self.decision_cache_size:
+            self._decision_cache.popitem(last=False)
\ No newline at end of file
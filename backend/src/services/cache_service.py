@@ -1,24 +1,27 @@
 from typing import Any, Optional
-import redis
+import redis.asyncio as redis
 import json
 import hashlib
 
 class CacheService:
     def __init__(self):
-        self.redis = redis.Redis(
+        # Non-blocking client over a shared connection pool
+        self.pool = redis.ConnectionPool(
             host='localhost',
             port=6379,
             db=0,
-            decode_responses=True
+            decode_responses=True,
+            max_connections=64
         )
+        self.redis = redis.Redis(connection_pool=self.pool)
         self.default_expire = 300  # 5 minutes
         
-    def get(self, key: str) -> Optional[Any]:
-        data = self.redis.get(key)
+    async def get(self, key: str) -> Optional[Any]:
+        data = await self.redis.get(key)
         return json.loads(data) if data else None
         
-    def set(self, key: str, value: Any, expire: int = None) -> None:
-        self.redis.setex(
+    async def set(self, key: str, value: Any, expire: int = None) -> None:
+        await self.redis.setex(
             key,
             expire or self.default_expire,
             json.dumps(value)
@@ -27,9 +30,9 @@ class CacheService:
     def generate_key(self, database: str, query: str) -> str:
         # Create unique cache key based on database and query
         combined = f"{database}:{query}"
-        return hashlib.md5(combined.encode()).hexdigest()
+        return hashlib.blake2b(combined.encode(), digest_size=16).hexdigest()
         
-    def invalidate(self, pattern: str) -> None:
-        keys = self.redis.keys(pattern)
+    async def invalidate(self, pattern: str) -> None:
+        keys = await self.redis.keys(pattern)
         if keys:
-            self.redis.delete(*keys)
\ No newline at end of file
+            await self.redis.delete(*keys)
\ No newline at end of file
@@ -1,14 +1,28 @@
 from datetime import datetime
-from typing import Dict, Any
-import time
+from typing import Dict, Any, List, Optional
+import asyncio
 import logging
-from elasticsearch import Elasticsearch
+import time
+from elasticsearch import AsyncElasticsearch
+from elasticsearch.helpers import async_bulk
+
+QUERY_INDEX = 'sqlproxy-queries'
+
+# Queued by close() to make the flusher write what it holds and exit
+_STOP = object()
 
 class MonitorService:
     def __init__(self):
-        self.es = Elasticsearch(['http://localhost:9200'])
+        self.es = AsyncElasticsearch(['http://localhost:9200'])
         self.setup_logging()
         
+        # Query logs are buffered and shipped with the _bulk API
+        self.flush_interval = 1.0  # seconds
+        self.max_bulk_bytes = 10 * 1024 * 1024  # ~10 MB per request
+        self.max_pending = 10000  # log_query waits once this many are queued
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        
     def setup_logging(self):
         logging.basicConfig(
             level=logging.INFO,
@@ -16,7 +30,7 @@ class MonitorService:
         )
         self.logger = logging.getLogger('sqlproxy')
         
-    def log_query(self, 
+    async def log_query(self, 
                   database: str,
                   query: str,
                   user_id: int,
@@ -24,7 +38,7 @@ class MonitorService:
                   status: str,
                   error: str = None):
         doc = {
-            'timestamp': datetime.utcnow(),
+            'timestamp': time.time(),  # converted in _write_batch
             'database': database,
             'query': query,
             'user_id': user_id,
@@ -33,8 +47,81 @@ class MonitorService:
             'error': error
         }
         
-        # Log to Elasticsearch
-        self.es.index(index='sqlproxy-queries', body=doc)
+        # Queue for Elasticsearch; the flusher sends it in the next batch
+        if self._flusher is None or self._flusher.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._flusher = asyncio.create_task(self._flush_queries())
+            
+        # Bounded queue: when ES falls behind, callers wait here
+        await self._queue.put(doc)
         
         # Log to file
-        self.logger.info(f"Query executed: {database} - {execution_time}s - {status}")
\ No newline at end of file
+        self.logger.info(f"Query executed: {database} - {execution_time}s - {status}")
+        
+    async def close(self) -> None:
+        """Bekleyen query loglarını yazar ve bağlantıyı kapatır."""
+        if self._flusher is not None and not self._flusher.done():
+            await self._queue.put(_STOP)
+            await self._flusher
+        self._flusher = None
+        
+        await self.es.close()
+        
+    async def _flush_queries(self) -> None:
+        """Kuyruktaki logları süre/boyut sınırıyla toplu yazar."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            doc = await self._queue.get()
+            if doc is _STOP:
+                return
+                
+            batch = [doc]
+            batch_bytes = self._estimate_size(doc)
+            deadline = loop.time() + self.flush_interval
+            
+            while batch_bytes < self.max_bulk_bytes:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    doc = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if doc is _STOP:
+                    stopping = True
+                    break
+                batch.append(doc)
+                batch_bytes += self._estimate_size(doc)
+                
+            await self._write_batch(batch)
+            
+    async def _write_batch(self, batch: List[Dict]) -> None:
+        """Log batch'ini tek bir _bulk isteğiyle yazar."""
+        try:
+            await async_bulk(
+                self.es,
+                (
+                    {
+                        '_index': QUERY_INDEX,
+                        '_source': {
+                            **doc,
+                            'timestamp': datetime.utcfromtimestamp(doc['timestamp'])
+                        }
+                    }
+                    for doc in batch
+                ),
+                chunk_size=len(batch),
+                max_chunk_bytes=self.max_bulk_bytes
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Failed to index {len(batch)} query logs: {str(e)}"
+            )
+            
+    @staticmethod
+    def _estimate_size(doc: Dict) -> int:
+        # Rough size estimate; the query text dominates the document
+        return len(doc['query']) + len(doc['error'] or '') + 256
@@ -1,42 +1,90 @@
 import asyncio
-from typing import Dict, Set
-from datetime import datetime
+import inspect
+from typing import Dict, Optional, Set
+import time
 import socketio
-import json
+from utils import fast_json
 
-sio = socketio.AsyncServer(async_mode='asgi')
+# Payloads are serialized with orjson instead of the stdlib encoder
+sio = socketio.AsyncServer(async_mode='asgi', json=fast_json)
+
+# All subscribers share one room so each update is a single emit
+QUERY_ROOM = 'queries'
+
+# Updates arriving within this window go out as one query_update
+NOTIFY_DEBOUNCE = 0.02  # seconds
+
+async def _maybe_await(result):
+    # enter_room/leave_room are coroutines only in newer python-socketio
+    if inspect.isawaitable(result):
+        await result
 
 class QueryMonitor:
     def __init__(self):
         self.active_queries: Dict[str, Dict] = {}
         self.subscribers: Set[str] = set()
+        # query_id -> op waiting for the next dispatch
+        self._pending: Dict[str, str] = {}
+        self._dispatcher: Optional[asyncio.Task] = None
+        # Serialized active_queries, reset on every change
+        self._snapshot_json: Optional[str] = None
         
     async def start_query(self, query_id: str, query: str, database: str):
         self.active_queries[query_id] = {
             'query': query,
             'database': database,
-            'start_time': datetime.utcnow(),
+            'start_time': time.time(),  # POSIX seconds
             'status': 'running'
         }
-        await self._notify_subscribers()
+        self._snapshot_json = None
+        await self._notify_subscribers('add', query_id)
         
     async def end_query(self, query_id: str, status: str, result: Dict = None):
         if query_id in self.active_queries:
             self.active_queries[query_id].update({
-                'end_time': datetime.utcnow(),
+                'end_time': time.time(),
                 'status': status,
                 'result': result
             })
-            await self._notify_subscribers()
+            self._snapshot_json = None
+            await self._notify_subscribers('update', query_id)
             
     async def subscribe(self, client_id: str):
         self.subscribers.add(client_id)
-        # Send current state
-        await sio.emit('query_state', self.active_queries, room=client_id)
+        await _maybe_await(sio.enter_room(client_id, QUERY_ROOM))
+        # Send current state; later changes arrive as query_update deltas
+        if self._snapshot_json is None:
+            self._snapshot_json = fast_json.dumps(self.active_queries)
+        await sio.emit('query_state', self._snapshot_json, room=client_id)
         
     async def unsubscribe(self, client_id: str):
         self.subscribers.remove(client_id)
+        await _maybe_await(sio.leave_room(client_id, QUERY_ROOM))
+        
+    async def _notify_subscribers(self, op: str, query_id: str):
+        """Değişikliği kısa bir pencere boyunca biriktirip toplu gönderir."""
+        if not self.subscribers:
+            return
+            
+        # add followed by update is still an add for clients that never saw it
+        if self._pending.get(query_id) != 'add':
+            self._pending[query_id] = op
+            
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch_updates())
+            
+    async def _dispatch_updates(self):
+        """Biriken değişiklikleri tek bir JSON string olarak yayınlar."""
+        await asyncio.sleep(NOTIFY_DEBOUNCE)
+        pending, self._pending = self._pending, {}
         
-    async def _notify_subscribers(self):
-        for client_id in self.subscribers:
-            await sio.emit('query_state', self.active_queries, room=client_id)
\ No newline at end of file
+        # Serialized once; the same string goes to every socket in the room
+        payload = fast_json.dumps([
+            {
+                'op': op,
+                'id': query_id,
+                'data': self.active_queries.get(query_id)
+            }
+            for query_id, op in pending.items()
+        ])
+        await sio.emit('query_update', payload, room=QUERY_ROOM)
\ No newline at end of file
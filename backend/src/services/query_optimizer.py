@@ -1,6 +1,25 @@
-from typing import Dict, List, Tuple
-import sqlparse
-from sqlparse.sql import Token, TokenList
+from typing import Counter, Dict, List, Optional, Tuple
+import collections
+import re
+
+# Keywords the rules look at; extend together with the rules
+OPTIMIZER_KEYWORDS = ('WHERE', 'JOIN')
+
+# Single pass over the raw text: literals, quoted identifiers and comments
+# are consumed whole so keywords inside them are not counted
+_KEYWORD_SCANNER = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\[[^\]]*\]|--[^\n]*|/\*.*?\*/"
+    r"|\b(" + '|'.join(OPTIMIZER_KEYWORDS) + r")\b",
+    re.IGNORECASE | re.DOTALL
+)
+
+def scan_keywords(query: str) -> Counter[str]:
+    """Query'deki optimizer keyword'lerini token ağacı kurmadan sayar."""
+    return collections.Counter(
+        match.upper()
+        for match in _KEYWORD_SCANNER.findall(query)
+        if match
+    )
 
 class QueryOptimizer:
     def __init__(self):
@@ -12,40 +31,34 @@ class QueryOptimizer:
         ]
         
     def optimize(self, query: str) -> Tuple[str, List[str]]:
-        parsed = sqlparse.parse(query)[0]
+        keywords = scan_keywords(query)
         optimized_query = query
         suggestions = []
         
         for rule in self.optimization_rules:
-            result = rule(parsed)
+            result = rule(query, keywords)
             if result:
-                optimized_query, suggestion = result
+                rewritten, suggestion = result
+                # Rules that only advise return None for the query
+                if rewritten is not None:
+                    optimized_query = rewritten
                 suggestions.append(suggestion)
                 
         return optimized_query, suggestions
         
-    def _check_index_usage(self, parsed: TokenList) -> Optional[Tuple[str, str]]:
+    def _check_index_usage(self, query: str,
+                           keywords: Counter[str]) -> Optional[Tuple[str, str]]:
         # Analyze WHERE clauses for index usage
-        where_found = False
-        for token in parsed.tokens:
-            if token.is_keyword and token.value.upper() == 'WHERE':
-                where_found = True
-                break
-                
-        if where_found:
+        if keywords['WHERE']:
             # Check if columns in WHERE clause are indexed
             return None, "Consider adding index for WHERE clause columns"
             
         return None
         
-    def _check_join_order(self, parsed: TokenList) -> Optional[Tuple[str, str]]:
+    def _check_join_order(self, query: str,
+                          keywords: Counter[str]) -> Optional[Tuple[str, str]]:
         # Analyze and optimize join order
-        joins = []
-        for token in parsed.tokens:
-            if token.is_keyword and 'JOIN' in token.value.upper():
-                joins.append(token)
-                
-        if len(joins) > 1:
+        if keywords['JOIN'] > 1:
             return None, "Consider optimizing join order based on table sizes"
             
         return None
\ No newline at end of file
@@ -1,28 +1,81 @@
-from typing import Dict, Any, List
-import sqlparse
+from typing import Dict, Any, Iterator, List, Optional, OrderedDict, Tuple
+import collections
+import time
+from contextlib import closing
+from sqlalchemy import text
 from db.connection import DatabaseManager
+from utils.sql_parse import parse_sql
+
+SCHEMA_QUERY = """
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = :table
+"""
+SCHEMA_CACHE_SIZE = 512
+SCHEMA_CACHE_TTL = 300  # seconds; schemas change rarely
+
+class RowStream:
+    """Satırları tuple olarak üretir; bitince ya da close() ile bağlantıyı bırakır."""
+    def __init__(self, conn, result):
+        self._conn = conn
+        self._rows = iter(result)
+        
+    def __iter__(self) -> Iterator[Tuple]:
+        return self
+        
+    def __next__(self) -> Tuple:
+        if self._conn is None:
+            raise StopIteration
+        try:
+            return tuple(next(self._rows))
+        except BaseException:
+            # Exhausted or failed; either way the connection goes back
+            self.close()
+            raise
+            
+    def close(self):
+        """Bağlantıyı pool'a geri verir; birden fazla çağrılabilir."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
 
 class QueryService:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        # (database, table) -> (expires_at, columns)
+        self._schema_cache: OrderedDict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]] = \
+            collections.OrderedDict()
         
-    def execute_query(self, database: str, query: str) -> Dict[str, Any]:
+    def execute_query(self, database: str, query: str,
+                      params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         # Query validation
         if not self._validate_query(query):
             raise ValueError("Invalid query")
             
         connection = self.db_manager.get_connection(database)
+        conn = connection.connect()
+        
+        try:
+            # Server-side cursor: rows are fetched as the caller consumes them.
+            # The caller must exhaust or close() 'rows' to release the connection
+            streaming = conn.execution_options(stream_results=True)
+            if params is None:
+                result = streaming.execute(query)
+            else:
+                result = streaming.execute(text(query), params)
+            columns = list(result.keys())
+        except Exception:
+            conn.close()
+            raise
+            
+        return {
+            'columns': columns,
+            'rows': RowStream(conn, result)
+        }
         
-        with connection.connect() as conn:
-            result = conn.execute(query)
-            return {
-                'columns': result.keys(),
-                'rows': [dict(row) for row in result]
-            }
-    
     def _validate_query(self, query: str) -> bool:
         # Basic SQL injection prevention
-        parsed = sqlparse.parse(query)
+        parsed = parse_sql(query)
         if not parsed:
             return False
             
@@ -30,9 +83,26 @@ class QueryService:
         return statement.get_type() in ['SELECT', 'SHOW']
     
     def get_table_schema(self, database: str, table: str) -> List[Dict[str, Any]]:
-        query = f"""
-        SELECT column_name, data_type, is_nullable
-        FROM information_schema.columns
-        WHERE table_name = '{table}'
-        """
-        return self.execute_query(database, query)
\ No newline at end of file
+        key = (database, table)
+        now = time.monotonic()
+        
+        cached = self._schema_cache.get(key)
+        if cached and cached[0] > now:
+            self._schema_cache.move_to_end(key)
+            return cached[1]
+            
+        # Bound parameter: one statement text for every table
+        result = self.execute_query(database, SCHEMA_QUERY, {'table': table})
+        with closing(result['rows']) as rows:
+            schema = [dict(zip(result['columns'], row)) for row in rows]
+        
+        self._schema_cache[key] = (now + SCHEMA_CACHE_TTL, schema)
+        self._schema_cache.move_to_end(key)
+        if len(self._schema_cache) > SCHEMA_CACHE_SIZE:
+            self._schema_cache.popitem(last=False)
+            
+        return schema
+        
+    def invalidate_schema_cache(self):
+        """Şema değişikliklerinden sonra cache'lenmiş şemaları temizler."""
+        self._schema_cache.clear()
\ No newline at end of file
@@ -1,10 +1,21 @@
-import sqlparse
 from typing import Tuple, Optional
 import re
+from utils.sql_parse import parse_sql
+
+# Injection markers; all are plain substrings except the block comment
+_CASE_SENSITIVE_MARKERS = ('--', ';')        # Comment, multiple queries
+_CASE_INSENSITIVE_MARKERS = ('xp_', 'exec')  # XP cmdshell, exec commands
+
+# Leading keyword of the statement; comments are rejected before this runs
+_LEADING_KEYWORD = re.compile(r'\s*([A-Za-z]+)\b')
+
+# Statements whose type is decided by their first keyword alone
+_FAST_PATH_ALLOWED = frozenset({'SELECT', 'INSERT', 'UPDATE', 'SHOW', 'EXPLAIN', 'DESCRIBE'})
 
 class QueryValidator:
     def __init__(self):
         self.forbidden_keywords = ['DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE']
+        self._forbidden_set = frozenset(k.upper() for k in self.forbidden_keywords)
         self.max_query_length = 5000
         
     def validate(self, query: str) -> Tuple[bool, Optional[str]]:
@@ -16,26 +27,36 @@ class QueryValidator:
         if self._contains_dangerous_characters(query):
             return False, 'Query contains invalid characters'
             
-        # Parse query
+        # Fast path: the leading keyword settles the common statements
+        match = _LEADING_KEYWORD.match(query)
+        if match:
+            keyword = match.group(1).upper()
+            if keyword in self._forbidden_set:
+                return False, 'Operation not allowed'
+            if keyword in _FAST_PATH_ALLOWED:
+                return True, None
+                
+        # Parse query (e.g. WITH ... or parenthesized statements)
         try:
-            parsed = sqlparse.parse(query)[0]
+            parsed = parse_sql(query)[0]
         except Exception:
             return False, 'Invalid SQL syntax'
             
         # Check query type
-        if parsed.get_type().upper() in self.forbidden_keywords:
+        if parsed.get_type().upper() in self._forbidden_set:
             return False, 'Operation not allowed'
             
         return True, None
         
     def _contains_dangerous_characters(self, query: str) -> bool:
-        dangerous_patterns = [
-            r'--',           # Comment
-            r'/\*.*?\*/',    # Multi-line comment
-            r';.*$',         # Multiple queries
-            r'xp_.*',        # XP cmdshell
-            r'exec.*'        # Exec commands
-        ]
-        
-        return any(re.search(pattern, query, re.IGNORECASE) 
-                  for pattern in dangerous_patterns)
\ No newline at end of file
+        # Linear substring scans (no regex backtracking), cheapest first
+        if any(marker in query for marker in _CASE_SENSITIVE_MARKERS):
+            return True
+            
+        # Multi-line comment: '/*' with a '*/' somewhere after it
+        start = query.find('/*')
+        if start != -1 and query.find('*/', start + 2) != -1:
+            return True
+            
+        lowered = query.lower()
+        return any(marker in lowered for marker in _CASE_INSENSITIVE_MARKERS)
\ No newline at end of file
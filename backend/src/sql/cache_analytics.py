@@ -1,42 +1,54 @@
-from typing import Dict, List
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from datetime import timedelta
+import time
 import numpy as np
 from collections import defaultdict
 
+# Rows of CacheStats._counters
+HITS, MISSES, SETS = range(3)
+
+INITIAL_KEY_CAPACITY = 1024
+POPULAR_QUERY_LIMIT = 10
+
 class CacheStats:
     def __init__(self):
-        self.hits = defaultdict(int)
-        self.misses = defaultdict(int)
-        self.sets = defaultdict(int)
+        # Per-key counters as int64 columns; key -> column index
+        self._key_ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._counters = np.zeros((3, INITIAL_KEY_CAPACITY), dtype=np.int64)
         self.errors = defaultdict(list)
         self.invalidations = []
         
     def record_hit(self, key: str):
-        self.hits[key] += 1
+        key_id = self._key_id(key)  # may grow _counters
+        self._counters[HITS, key_id] += 1
         
     def record_miss(self, key: str):
-        self.misses[key] += 1
+        key_id = self._key_id(key)  # may grow _counters
+        self._counters[MISSES, key_id] += 1
         
     def record_set(self, key: str):
-        self.sets[key] += 1
+        key_id = self._key_id(key)  # may grow _counters
+        self._counters[SETS, key_id] += 1
         
     def record_error(self, key: str, error: str):
         self.errors[key].append({
-            'timestamp': datetime.utcnow(),
+            'timestamp': time.time(),  # POSIX seconds, compared as floats
             'error': error
         })
         
     def record_invalidation(self, pattern: str, count: Optional[int]):
         self.invalidations.append({
-            'timestamp': datetime.utcnow(),
+            'timestamp': time.time(),  # POSIX seconds, compared as floats
             'pattern': pattern,
             'count': count
         })
         
     def get_stats(self, time_window: timedelta = None) -> Dict:
         """Cache istatistiklerini hesaplar."""
-        end_time = datetime.utcnow()
-        start_time = end_time - (time_window or timedelta(hours=24))
+        # Same clock as the recorded timestamps, so no datetime conversion
+        end_time = time.time()
+        start_time = end_time - (time_window or timedelta(hours=24)).total_seconds()
         
         return {
             'summary': self._calculate_summary(start_time, end_time),
@@ -46,42 +58,68 @@ class CacheStats:
             'invalidation_impact': self._analyze_invalidations()
         }
         
-    def _calculate_summary(self, start_time: datetime, 
-                         end_time: datetime) -> Dict:
+    def _key_id(self, key: str) -> int:
+        """Key'in counter kolonunu döndürür; gerekirse kapasiteyi ikiye katlar."""
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = len(self._keys)
+            if key_id == self._counters.shape[1]:
+                self._counters = np.concatenate(
+                    (self._counters, np.zeros_like(self._counters)),
+                    axis=1
+                )
+            self._key_ids[key] = key_id
+            self._keys.append(key)
+        return key_id
+        
+    def _active_counters(self) -> np.ndarray:
+        return self._counters[:, :len(self._keys)]
+        
+    def _calculate_summary(self, start_time: float, 
+                         end_time: float) -> Dict:
         """Özet istatistikler hesaplar."""
+        counters = self._active_counters()
+        totals = counters.sum(axis=1)
+        
         return {
-            'total_hits': sum(self.hits.values()),
-            'total_misses': sum(self.misses.values()),
-            'total_sets': sum(self.sets.values()),
+            'total_hits': int(totals[HITS]),
+            'total_misses': int(totals[MISSES]),
+            'total_sets': int(totals[SETS]),
             'total_errors': sum(len(errors) for errors in self.errors.values()),
-            'unique_keys': len(set(self.hits.keys()) | set(self.misses.keys())),
+            'unique_keys': int(np.count_nonzero(counters[HITS] | counters[MISSES])),
             'error_rate': self._calculate_error_rate()
         }
         
     def _calculate_hit_rate(self) -> float:
         """Cache hit rate hesaplar."""
-        total_requests = sum(self.hits.values()) + sum(self.misses.values())
+        counters = self._active_counters()
+        total_hits = counters[HITS].sum()
+        total_requests = total_hits + counters[MISSES].sum()
         if total_requests == 0:
             return 0.0
-        return sum(self.hits.values()) / total_requests
+        return float(total_hits / total_requests)
         
     def _get_popular_queries(self) -> List[Dict]:
         """En popüler cache key'leri bulur."""
-        popularity = defaultdict(int)
+        counters = self._active_counters()
+        hits = counters[HITS]
+        misses = counters[MISSES]
         
-        for key, hits in self.hits.items():
-            popularity[key] = hits
+        top = min(POPULAR_QUERY_LIMIT, len(hits))
+        if top == 0:
+            return []
             
+        # O(N) selection of the top keys, then sort only those
+        candidates = np.argpartition(-hits, top - 1)[:top]
+        ranked = candidates[np.lexsort((candidates, -hits[candidates]))]
+        
         return [
             {
-                'key': key,
-                'hits': hits,
-                'misses': self.misses[key],
-                'hit_rate': hits / (hits + self.misses[key])
+                'key': self._keys[key_id],
+                'hits': int(hits[key_id]),
+                'misses': int(misses[key_id]),
+                'hit_rate': float(hits[key_id] / (hits[key_id] + misses[key_id]))
             }
-            for key, hits in sorted(
-                popularity.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]
+            for key_id in ranked
+            if hits[key_id] > 0
         ]
\ No newline at end of file
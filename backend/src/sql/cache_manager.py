@@ -1,9 +1,95 @@
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple
+from functools import lru_cache
 import hashlib
 import json
+import time
 import redis
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from sqlparse.sql import Function, Identifier, IdentifierList, Parenthesis, TokenList
+from ..utils.sql_parse import parse_sql
+from .cache_analytics import CacheStats
+
+REDIS_MAX_CONNECTIONS = 64
+REDIS_POOL_TIMEOUT = 5  # seconds to wait for a free connection
+
+# Shared across workers: cache key -> count, one hash per hour
+STATS_KEY_PREFIX = 'cache:stats:'
+STATS_LOOKUPS_KEY = STATS_KEY_PREFIX + 'lookups:{}'
+STATS_SETS_KEY = STATS_KEY_PREFIX + 'sets:{}'
+STATS_BUCKET_SECONDS = 3600
+STATS_RETENTION = 24 * 3600  # seconds
+
+CACHE_KEY_MEMO_SIZE = 4096
+
+INVALIDATION_BATCH_SIZE = 500  # SCAN COUNT hint
+INVALIDATION_PIPELINE_DEPTH = 10  # UNLINK batches per round trip
+
+# Every write to a table bumps its counter; cache keys embed the counters
+TABLE_VERSION_PREFIX = 'table_version:'
+TABLE_VERSION_KEY = TABLE_VERSION_PREFIX + '{}'
+
+# get()/set() resolve the table versions, touch the stats bucket and read or
+# write the versioned key in a single round trip. KEYS[1] is the stats
+# bucket, KEYS[2..] the table version counters; ARGV[1] is the cache key.
+# The data key is derived inside the script, so this assumes a single
+# (non-cluster) Redis like the connection pool above
+_VERSIONED_KEY_LUA = """
+local key = ARGV[1]
+for i = 2, #KEYS do
+    key = key .. ':' .. (redis.call('GET', KEYS[i]) or '0')
+end
+redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+"""
+_GET_LUA = _VERSIONED_KEY_LUA + "return redis.call('GET', key)"
+_SET_LUA = _VERSIONED_KEY_LUA + "redis.call('SETEX', key, ARGV[3], ARGV[4])"
+
+# Keywords followed by a table reference
+_TABLE_KEYWORDS = frozenset({'FROM', 'INTO', 'UPDATE', 'TABLE'})
+_WRITE_TYPES = frozenset({'INSERT', 'UPDATE', 'DELETE', 'MERGE', 'TRUNCATE', 'DROP', 'ALTER'})
+
+def _collect_tables(token_list: TokenList, tables: Set[str]):
+    expecting_table = False
+    
+    for token in token_list.tokens:
+        if token.is_whitespace:
+            continue
+            
+        if token.is_keyword:
+            keyword = token.normalized
+            expecting_table = keyword in _TABLE_KEYWORDS or keyword.endswith('JOIN')
+            continue
+            
+        if expecting_table:
+            identifiers = (
+                token.get_identifiers() if isinstance(token, IdentifierList)
+                else [token]
+            )
+            for identifier in identifiers:
+                # Derived tables ('(SELECT ...) t') are walked below instead
+                if isinstance(identifier, (Identifier, Function)) and \
+                        not isinstance(identifier.token_first(), Parenthesis):
+                    tables.add(identifier.get_real_name().lower())
+            expecting_table = False
+            
+        # Subqueries, WHERE clauses etc.
+        if token.is_group:
+            _collect_tables(token, tables)
+
+@lru_cache(maxsize=4096)
+def _tables_in_query(query: str) -> Tuple[str, ...]:
+    """Query'nin referans verdiği tabloları sıralı olarak döndürür."""
+    tables: Set[str] = set()
+    for statement in parse_sql(query):
+        _collect_tables(statement, tables)
+    return tuple(sorted(tables))
+
+def _is_write_query(query: str) -> bool:
+    return any(
+        statement.get_type() in _WRITE_TYPES
+        for statement in parse_sql(query)
+    )
 
 @dataclass
 class CacheConfig:
@@ -15,20 +101,35 @@ class CacheConfig:
 class CacheManager:
     def __init__(self, config: CacheConfig):
         self.config = config
-        self.redis = redis.Redis(
+        # Connections are reused; callers wait instead of opening more
+        self.pool = redis.BlockingConnectionPool(
             host='localhost',
             port=6379,
             db=0,
-            decode_responses=True
+            decode_responses=True,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT
         )
+        self.redis = redis.Redis(connection_pool=self.pool)
+        # EVALSHA, falling back to EVAL once per script after a restart
+        self._get_script = self.redis.register_script(_GET_LUA)
+        self._set_script = self.redis.register_script(_SET_LUA)
         self.stats = CacheStats()
+        # query text -> cache key; get() and the following set() hash once
+        self._cache_keys: Dict[str, str] = {}
         
     def get(self, query: str) -> Optional[Dict]:
         """Cache'den query sonucunu getirir."""
         cache_key = self._generate_cache_key(query)
         
         try:
-            cached_data = self.redis.get(cache_key)
+            # Versions, GET and the shared lookup counter in one round trip
+            cached_data = self._get_script(
+                keys=self._script_keys(query, STATS_LOOKUPS_KEY),
+                args=[cache_key, STATS_RETENTION],
+                client=self.redis
+            )
+            
             if cached_data:
                 self.stats.record_hit(cache_key)
                 return self._deserialize_cache_data(cached_data)
@@ -54,10 +155,10 @@ class CacheManager:
             cached_data = self._serialize_cache_data(result)
             
             # Cache'e kaydet
-            self.redis.setex(
-                cache_key,
-                self.config.ttl,
-                cached_data
+            self._set_script(
+                keys=self._script_keys(query, STATS_SETS_KEY),
+                args=[cache_key, STATS_RETENTION, self.config.ttl, cached_data],
+                client=self.redis
             )
             
             self.stats.record_set(cache_key)
@@ -65,24 +166,103 @@ class CacheManager:
         except Exception as e:
             self.stats.record_error(cache_key, str(e))
             
+    def record_write(self, query: str):
+        """Yazma query'sinin dokunduğu tabloların cache'ini geçersiz kılar."""
+        if _is_write_query(query):
+            self.invalidate_tables(_tables_in_query(query))
+            
+    def invalidate_tables(self, tables: Iterable[str]):
+        """Tablo versiyonlarını artırır; eski key'ler TTL ile düşer."""
+        tables = list(tables)
+        if not tables:
+            return
+            
+        # O(1) per table regardless of how many keys were derived from it
+        pipe = self.redis.pipeline(transaction=False)
+        for table in tables:
+            pipe.incr(TABLE_VERSION_KEY.format(table))
+        pipe.execute()
+        
+        self.stats.record_invalidation(','.join(tables), None)
+        
     def invalidate(self, pattern: str = None):
         """Cache invalidation yapar."""
         if pattern:
-            keys = self.redis.keys(f"*{pattern}*")
-            if keys:
-                self.redis.delete(*keys)
-                self.stats.record_invalidation(pattern, len(keys))
-        else:
-            self.redis.flushdb()
-            self.stats.record_invalidation('all', None)
+            matched = self._unlink_matching(f"*{pattern}*")
+            if matched:
+                self.stats.record_invalidation(pattern, matched)
+            return
             
+        # Data keys go first: a version may only restart from 0 once no key
+        # built on an older version of it is left to become live again
+        self._unlink_matching('*')
+        self._unlink_matching(
+            TABLE_VERSION_KEY.format('*'),
+            protected=(STATS_KEY_PREFIX,)
+        )
+        self.stats.record_invalidation('all', None)
+        
+    def _unlink_matching(self, match: str,
+                         protected: Tuple[str, ...] = (STATS_KEY_PREFIX,
+                                                       TABLE_VERSION_PREFIX)) -> int:
+        """Eşleşen (korunmayan) key'leri siler; silinen key sayısını döner."""
+        # SCAN instead of KEYS so Redis is never blocked on the keyspace,
+        # UNLINK so memory is reclaimed off the main thread. Stats and table
+        # versions are not cache data; dropping a version would make keys
+        # cached before the last write readable again
+        pipe = self.redis.pipeline(transaction=False)
+        cursor = 0
+        matched = 0
+        pending = 0
+        
+        while True:
+            cursor, keys = self.redis.scan(
+                cursor,
+                match=match,
+                count=INVALIDATION_BATCH_SIZE
+            )
+            keys = [key for key in keys if not key.startswith(protected)]
+            if keys:
+                pipe.unlink(*keys)
+                matched += len(keys)
+                pending += 1
+                
+            if pending and (pending >= INVALIDATION_PIPELINE_DEPTH or cursor == 0):
+                pipe.execute()
+                pending = 0
+                
+            if cursor == 0:
+                break
+                
+        return matched
+        
     def _generate_cache_key(self, query: str) -> str:
         """Query için unique cache key oluşturur."""
+        cache_key = self._cache_keys.get(query)
+        if cache_key is not None:
+            return cache_key
+            
         # Query'yi normalize et
         normalized_query = self._normalize_query(query)
         
-        # Hash oluştur
-        return hashlib.md5(normalized_query.encode()).hexdigest()
+        # Hash oluştur (not a security boundary; 32 hex chars like before)
+        cache_key = hashlib.blake2b(
+            normalized_query.encode(),
+            digest_size=16
+        ).hexdigest()
+        
+        if len(self._cache_keys) >= CACHE_KEY_MEMO_SIZE:
+            self._cache_keys.clear()
+        self._cache_keys[query] = cache_key
+        return cache_key
+        
+    def _script_keys(self, query: str, stats_template: str) -> List[str]:
+        """Script KEYS'ini oluşturur: stats bucket'ı ve tablo versiyonları."""
+        # Per-key counters go to hourly hashes that expire after
+        # STATS_RETENTION, so fields don't pile up forever
+        keys = [stats_template.format(int(time.time()) // STATS_BUCKET_SECONDS)]
+        keys.extend(TABLE_VERSION_KEY.format(table) for table in _tables_in_query(query))
+        return keys
         
     def _normalize_query(self, query: str) -> str:
         """Query'yi cache key için normalize eder."""
@@ -1,18 +1,47 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import redis
 from redis.cluster import RedisCluster
 from redis.exceptions import RedisError
-import json
-import zlib
+from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+import zstandard as zstd
+from ..utils.fast_json import dumps_bytes, loads
+
+# Every zstd frame starts with this magic number; JSON never does
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+ZSTD_LEVEL = 3
+
+# Shared compression dictionary trained on recent values. Frames record the
+# dictionary id in their header, so old entries stay readable after retrains.
+ZSTD_DICT_KEY = 'cache:zdict:{}'
+ZSTD_DICT_CURRENT_KEY = 'cache:zdict:current'
+ZSTD_DICT_SIZE = 16 * 1024
+ZSTD_DICT_SAMPLES = 2000  # reservoir of recent values
+ZSTD_DICT_SAMPLE_BYTES = 4096  # prefix kept per sampled value
+ZSTD_DICT_SAMPLES_MAX_BYTES = 4 * 1024 * 1024  # whole reservoir
+ZSTD_DICT_RETRAIN_EVERY = 10000  # sets
+DICT_COMPRESSION_THRESHOLD = 256  # bytes, once a dictionary is active
 
 class DistributedCache:
     def __init__(self, nodes: List[Dict], replica_factor: int = 2):
         self.cluster = RedisCluster(
             startup_nodes=nodes,
-            decode_responses=True,
+            decode_responses=False,  # values may be zstd frames
             replica=replica_factor
         )
         self.compression_threshold = 1024  # 1KB
+        # zstd contexts are reused but must not be shared between threads
+        self._zstd = threading.local()
+        self._dictionaries: Dict[int, zstd.ZstdCompressionDict] = {}
+        self._active_dict: Optional[zstd.ZstdCompressionDict] = None
+        self._samples: List[bytes] = []
+        self._sample_bytes = 0
+        self._sets_seen = 0
+        # Training takes ~1s; it runs here, never on a set() call
+        self._trainer: Optional[ThreadPoolExecutor] = None
+        self._training = False
+        self._load_current_dictionary()
         
     def get(self, key: str) -> Optional[Dict]:
         """Distributed cache'den veri getirir."""
@@ -25,22 +54,30 @@ class DistributedCache:
             if self._is_compressed(data):
                 data = self._decompress(data)
                 
-            return json.loads(data)
+            return loads(data)
             
         except RedisError as e:
             self._handle_redis_error(e)
             return None
+        except zstd.ZstdError:
+            # e.g. dictionary no longer available; treat as a miss
+            return None
             
     def set(self, key: str, value: Dict, 
             ttl: int = None, 
             consistency: str = 'strong') -> bool:
         """Distributed cache'e veri kaydeder."""
         try:
-            # Veriyi serialize et
-            data = json.dumps(value)
+            # Veriyi serialize et (bytes; no extra encode step)
+            data = dumps_bytes(value)
+            self._record_sample(data)
             
             # Büyük veriyi compress et
-            if len(data) > self.compression_threshold:
+            threshold = (
+                DICT_COMPRESSION_THRESHOLD if self._active_dict is not None
+                else self.compression_threshold
+            )
+            if len(data) > threshold:
                 data = self._compress(data)
                 
             # Consistency level'a göre kaydet
@@ -66,7 +103,7 @@ class DistributedCache:
             return 0
             
     def _set_strong_consistency(self, key: str, 
-                              data: str, 
+                              data: bytes, 
                               ttl: int = None) -> bool:
         """Strong consistency ile veri kaydeder."""
         # Transaction başlat
@@ -87,4 +124,111 @@ class DistributedCache:
                 
             except redis.WatchError:
                 # Key değişmiş, retry mekanizması
-                return self._retry_set(key, data, ttl)
\ No newline at end of file
+                return self._retry_set(key, data, ttl)
+                
+    def train_dictionary(self, samples: List[bytes] = None) -> Optional[int]:
+        """Son cache değerlerinden zstd dictionary eğitir ve yayınlar."""
+        try:
+            dictionary = zstd.train_dictionary(
+                ZSTD_DICT_SIZE,
+                list(self._samples) if samples is None else samples
+            )
+        except zstd.ZstdError:
+            # Too few or too uniform samples to train on yet
+            return None
+            
+        dict_id = dictionary.dict_id()
+        try:
+            # Dictionaries never expire; entries compressed with them may not
+            self.cluster.set(ZSTD_DICT_KEY.format(dict_id), dictionary.as_bytes())
+            self.cluster.set(ZSTD_DICT_CURRENT_KEY, dict_id)
+        except RedisError as e:
+            self._handle_redis_error(e)
+            return None
+            
+        self._dictionaries[dict_id] = dictionary
+        self._active_dict = dictionary
+        return dict_id
+        
+    def _record_sample(self, data: bytes):
+        """Değerin başını dictionary eğitimi için reservoir sample'a ekler."""
+        # Dictionaries only learn from frame prefixes anyway
+        data = data[:ZSTD_DICT_SAMPLE_BYTES]
+        self._sets_seen += 1
+        samples = self._samples
+        if (len(samples) < ZSTD_DICT_SAMPLES
+                and self._sample_bytes + len(data) <= ZSTD_DICT_SAMPLES_MAX_BYTES):
+            samples.append(data)
+            self._sample_bytes += len(data)
+        else:
+            # Reservoir replacement, still within the byte budget
+            slot = random.randrange(self._sets_seen)
+            if slot < len(samples):
+                size = self._sample_bytes + len(data) - len(samples[slot])
+                if size <= ZSTD_DICT_SAMPLES_MAX_BYTES:
+                    samples[slot] = data
+                    self._sample_bytes = size
+                
+        if self._sets_seen % ZSTD_DICT_RETRAIN_EVERY == 0:
+            self._schedule_training()
+            
+    def _schedule_training(self):
+        """Dictionary eğitimini arka plan thread'ine bırakır."""
+        # At most one training run at a time; a busy trainer skips this round
+        if self._training:
+            return
+        self._training = True
+        if self._trainer is None:
+            self._trainer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='zstd-dict'
+            )
+        future = self._trainer.submit(self.train_dictionary, list(self._samples))
+        future.add_done_callback(self._training_done)
+        
+    def _training_done(self, future):
+        self._training = False
+        
+    def _load_current_dictionary(self):
+        """Başka node'ların yayınladığı güncel dictionary'yi yükler."""
+        try:
+            dict_id = self.cluster.get(ZSTD_DICT_CURRENT_KEY)
+            if dict_id:
+                self._active_dict = self._get_dictionary(int(dict_id))
+        except (RedisError, zstd.ZstdError) as e:
+            self._handle_redis_error(e)
+            
+    def _get_dictionary(self, dict_id: int) -> zstd.ZstdCompressionDict:
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None:
+            data = self.cluster.get(ZSTD_DICT_KEY.format(dict_id))
+            if data is None:
+                raise zstd.ZstdError(f"Unknown zstd dictionary: {dict_id}")
+            dictionary = self._dictionaries[dict_id] = zstd.ZstdCompressionDict(data)
+        return dictionary
+        
+    def _is_compressed(self, data: bytes) -> bool:
+        return data[:4] == ZSTD_MAGIC
+        
+    def _compress(self, data: bytes) -> bytes:
+        """Veriyi thread'e ait zstd context'i ile sıkıştırır."""
+        dictionary = self._active_dict
+        cached = getattr(self._zstd, 'cctx', None)
+        if cached is None or cached[0] is not dictionary:
+            cached = self._zstd.cctx = (
+                dictionary,
+                zstd.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary)
+            )
+        return cached[1].compress(data)
+        
+    def _decompress(self, data: bytes) -> bytes:
+        """zstd frame'ini, header'daki dictionary ile açar."""
+        dict_id = zstd.get_frame_parameters(data).dict_id
+        dctxs = getattr(self._zstd, 'dctxs', None)
+        if dctxs is None:
+            dctxs = self._zstd.dctxs = {}
+            
+        dctx = dctxs.get(dict_id)
+        if dctx is None:
+            dictionary = self._get_dictionary(dict_id) if dict_id else None
+            dctx = dctxs[dict_id] = zstd.ZstdDecompressor(dict_data=dictionary)
+        return dctx.decompress(data)
\ No newline at end of file
@@ -1,80 +1,251 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 import pandas as pd
 from datetime import datetime
+from collections import OrderedDict
+from io import BytesIO
+import hashlib
 import json
+import xlsxwriter
+import pyarrow as pa
+import pyarrow.csv
+import pyarrow.ipc
+import pyarrow.parquet as pq
+from ..utils.fast_json import dumps
 
 class ResultFormatter:
-    def __init__(self):
-        self.supported_formats = ['json', 'csv', 'excel', 'html']
+    def __init__(self, cache_size: int = 0):
+        # format -> handler; each handler builds only what it needs
+        self._dispatch = {
+            'json': self._format_json,
+            'csv': self._format_csv,
+            'excel': self._format_excel,
+            'html': self._format_html,
+            'arrow': self._format_arrow,
+            'parquet': self._format_parquet
+        }
+        self.supported_formats = list(self._dispatch)
+        # (result digest, format, options) -> formatted output; 0 disables
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
         
     def format_result(self, data: Dict[str, List], 
                      format_type: str = 'json',
                      options: Dict = None) -> Any:
         """Query sonuçlarını istenen formata dönüştürür."""
-        if format_type not in self.supported_formats:
+        handler = self._dispatch.get(format_type)
+        if handler is None:
             raise ValueError(f"Unsupported format: {format_type}")
             
-        df = pd.DataFrame(data['rows'], columns=data['columns'])
-        
-        if format_type == 'json':
-            return self._format_json(df, options)
-        elif format_type == 'csv':
-            return self._format_csv(df, options)
-        elif format_type == 'excel':
-            return self._format_excel(df, options)
-        elif format_type == 'html':
-            return self._format_html(df, options)
+        if not self.cache_size:
+            return handler(data, options)
             
-    def _format_json(self, df: pd.DataFrame, options: Dict = None) -> str:
+        # Rows may be a one-shot iterator; they are read twice below
+        if not isinstance(data['rows'], list):
+            data = dict(data, rows=list(data['rows']))
+            
+        # The table built for hashing is reused by the Arrow writers
+        try:
+            table = self._to_arrow_table(data)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed-type columns have no Arrow form; format uncached
+            return handler(data, options)
+            
+        key = (
+            self.result_digest(table),
+            format_type,
+            repr(sorted((options or {}).items()))
+        )
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+            
+        source = table if format_type in ('arrow', 'parquet') else data
+        result = self._cache[key] = handler(source, options)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+        
+    def result_digest(self, data: Union[Dict[str, List], pa.Table]) -> bytes:
+        """Sonucun Arrow buffer'larından 16 byte'lık BLAKE2b özeti üretir."""
+        table = data if isinstance(data, pa.Table) else self._to_arrow_table(data)
+        
+        # Schema covers names and types; buffers are hashed in place, no pickling
+        digest = hashlib.blake2b(table.schema.serialize(), digest_size=16)
+        for column in table.columns:
+            for chunk in column.chunks:
+                digest.update(b'%d:%d:%d' % (chunk.offset, len(chunk), chunk.null_count))
+                for buf in chunk.buffers():
+                    if buf is not None:
+                        digest.update(memoryview(buf))
+        return digest.digest()
+        
+    def _format_json(self, data: Dict[str, List], options: Dict = None) -> str:
         """JSON formatında sonuç döndürür."""
         opts = options or {}
         orient = opts.get('orient', 'records')
         date_format = opts.get('date_format', 'iso')
         
+        # split and columns read the rows more than once; query results may
+        # arrive as one-shot iterators
+        if not isinstance(data['rows'], list):
+            data = dict(data, rows=list(data['rows']))
+        columns = data['columns']
+        rows = data['rows']
+        
+        # orjson writes datetimes as ISO 8601 itself
+        if date_format == 'iso':
+            if orient == 'records':
+                return dumps([dict(zip(columns, row)) for row in rows])
+            if orient == 'values':
+                return dumps([list(row) for row in rows])
+            if orient == 'split':
+                return dumps({
+                    'columns': columns,
+                    'index': list(range(len(rows))),
+                    'data': [list(row) for row in rows]
+                })
+            if orient == 'columns':
+                return dumps({
+                    column: {str(i): row[idx] for i, row in enumerate(rows)}
+                    for idx, column in enumerate(columns)
+                })
+                
+        # Remaining orients / epoch dates keep pandas' exact output
+        df = self._to_frame(data)
         return df.to_json(
             orient=orient,
             date_format=date_format
         )
         
-    def _format_csv(self, df: pd.DataFrame, options: Dict = None) -> str:
+    def _format_csv(self, data: Dict[str, List], options: Dict = None) -> str:
         """CSV formatında sonuç döndürür."""
         opts = options or {}
         separator = opts.get('separator', ',')
         encoding = opts.get('encoding', 'utf-8')
         
+        # pandas' text by default (unquoted strings, True/False, encoding);
+        # engine='pyarrow' opts into Arrow's faster C++ writer, which quotes
+        # every string and writes booleans as true/false
+        if opts.get('engine', 'pandas') == 'pyarrow':
+            if not isinstance(data['rows'], list):
+                data = dict(data, rows=list(data['rows']))
+            try:
+                table = self._to_arrow_table(data)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Mixed-type columns have no Arrow form
+                table = None
+                
+            if table is not None:
+                sink = pa.BufferOutputStream()
+                pa.csv.write_csv(
+                    table,
+                    sink,
+                    write_options=pa.csv.WriteOptions(
+                        include_header=True,
+                        delimiter=separator
+                    )
+                )
+                return sink.getvalue().to_pybytes().decode('utf-8')
+                
+        df = self._to_frame(data)
         return df.to_csv(
             sep=separator,
             encoding=encoding,
             index=False
         )
         
-    def _format_excel(self, df: pd.DataFrame, options: Dict = None) -> bytes:
+    def _format_html(self, data: Dict[str, List], options: Dict = None) -> str:
+        """HTML tablo formatında sonuç döndürür."""
+        opts = options or {}
+        
+        df = self._to_frame(data)
+        return df.to_html(
+            index=False,
+            na_rep=opts.get('na_rep', ''),
+            classes=opts.get('classes')
+        )
+        
+    def _to_frame(self, data: Dict[str, List]) -> pd.DataFrame:
+        """Sonucu yalnızca pandas gerektiren yazıcılar için DataFrame'e çevirir."""
+        # Only the HTML writer and the pandas fallbacks get here. Row tuples
+        # are the costly input shape; a columnar (Arrow) hand-off from the
+        # executor would avoid the per-cell objects altogether
+        return pd.DataFrame.from_records(
+            data['rows'],
+            columns=data['columns'],
+            coerce_float=False
+        )
+        
+    def _to_arrow_table(self, data: Dict[str, List]) -> pa.Table:
+        """Satır bazlı sonucu kolon bazlı Arrow tablosuna çevirir."""
+        columns = data['columns']
+        rows = data['rows']
+        
+        # Transpose in C; an empty result still keeps its columns
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        return pa.Table.from_arrays(
+            [pa.array(column_values) for column_values in values],
+            names=list(columns)
+        )
+        
+    def _format_arrow(self, data: Union[Dict[str, List], pa.Table], 
+                      options: Dict = None) -> bytes:
+        """Arrow IPC stream formatında sonuç döndürür."""
+        table = data if isinstance(data, pa.Table) else self._to_arrow_table(data)
+        
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+        
+    def _format_parquet(self, data: Union[Dict[str, List], pa.Table], 
+                        options: Dict = None) -> bytes:
+        """Parquet formatında sonuç döndürür."""
+        opts = options or {}
+        table = data if isinstance(data, pa.Table) else self._to_arrow_table(data)
+        
+        # Row-group statistics let readers skip data by predicate
+        sink = pa.BufferOutputStream()
+        pq.write_table(
+            table,
+            sink,
+            compression=opts.get('compression', 'zstd'),
+            use_dictionary=True,
+            write_statistics=True
+        )
+        return sink.getvalue().to_pybytes()
+        
+    def _format_excel(self, data: Dict[str, List], options: Dict = None) -> bytes:
         """Excel formatında sonuç döndürür."""
         opts = options or {}
         sheet_name = opts.get('sheet_name', 'Query Result')
+        columns = data['columns']
         
-        # Excel dosyası oluştur
+        # Excel dosyası oluştur; constant_memory flushes each row as it is
+        # written, so memory stays flat however many rows there are
         output = BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(
-                writer,
-                sheet_name=sheet_name,
-                index=False
-            )
-            
-            # Formatlama
-            workbook = writer.book
-            worksheet = writer.sheets[sheet_name]
-            
-            # Header formatı
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#D9D9D9'
-            })
+        workbook = xlsxwriter.Workbook(output, {
+            'constant_memory': True,
+            'strings_to_urls': False,
+            'nan_inf_to_errors': True,
+            'remove_timezone': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+        })
+        worksheet = workbook.add_worksheet(sheet_name)
+        
+        # Header formatı
+        header_format = workbook.add_format({
+            'bold': True,
+            'bg_color': '#D9D9D9'
+        })
+        
+        # Kolonları formatla (rows must be written in order from here on)
+        for idx, col in enumerate(columns):
+            worksheet.set_column(idx, idx, len(col) + 2)
+        worksheet.write_row(0, 0, columns, header_format)
+        
+        for row_idx, row in enumerate(data['rows'], start=1):
+            worksheet.write_row(row_idx, 0, row)
             
-            # Kolonları formatla
-            for idx, col in enumerate(df.columns):
-                worksheet.set_column(idx, idx, len(col) + 2)
-                worksheet.write(0, idx, col, header_format)
-                
+        workbook.close()
         return output.getvalue()
\ No newline at end of file
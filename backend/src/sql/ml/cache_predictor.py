@@ -1,26 +1,258 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import tensorflow as tf
 import numpy as np
 from datetime import datetime, timedelta
 from collections import deque
 
+PREDICTION_BATCH_SIZE = 64
+PREDICTION_BATCH_WINDOW = 0.002  # seconds
+FEATURE_COUNT = 7
+QUANTIZATION_SAMPLES = 500  # representative rows for INT8 calibration
+
+def _relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0, out=x)
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+_ACTIVATIONS = {
+    'relu': _relu,
+    'sigmoid': _sigmoid,
+    'linear': lambda x: x
+}
+
 class CachePredictor:
     def __init__(self, model_path: str = None):
         self.model = self._load_or_create_model(model_path)
         self.history = deque(maxlen=1000)
         self.min_samples = 100
+        # Dense weights for the NumPy forward pass: [(kernel, bias, activation)];
+        # None when the architecture is more than the NumPy path covers
+        self._layers: Optional[List[Tuple[np.ndarray, np.ndarray, str]]] = None
+        self._refresh_weights()
+        # (generation, TFLite flatbuffer) once quantize() ran; replaced as a
+        # whole so readers never see a half-updated model
+        self._int8: Optional[Tuple[int, bytes]] = None
+        # Re-quantization after train() runs here, off the caller's path
+        self._quantizer: Optional[ThreadPoolExecutor] = None
+        self._quantizing = False
+        # Per-thread state: the (1, FEATURE_COUNT) input row reused by
+        # predict_cache_hit and the thread's own TFLite interpreter, which
+        # is not thread-safe
+        self._buffers = threading.local()
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
         
     def predict_cache_hit(self, query: str, 
                          context: Dict) -> Tuple[bool, float]:
         """Cache hit olasılığını tahmin eder."""
-        features = self._extract_cache_features(query, context)
+        row = getattr(self._buffers, 'row', None)
+        if row is None:
+            row = self._buffers.row = np.empty((1, FEATURE_COUNT), dtype=np.float32)
+        self._extract_cache_features(query, context, out=row[0])
+        
+        # Model prediction without a Keras/TF dispatch per call
+        probability = self._forward(row)[0]
+        
+        return bool(probability > 0.5), float(probability)
+        
+    async def predict(self, query: str, context: Dict) -> Tuple[bool, float]:
+        """Tahmini, eşzamanlı isteklerle aynı batch'te hesaplar."""
+        if self._batcher is None or self._batcher.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._batcher = asyncio.create_task(self._run_batches())
+            
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((self._extract_cache_features(query, context), future))
+        probability = await future
+        
+        return bool(probability > 0.5), float(probability)
+        
+    async def _run_batches(self):
+        """Kuyruktaki istekleri boyut/süre sınırıyla toplu tahmin eder."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + PREDICTION_BATCH_WINDOW
+            
+            while len(batch) < PREDICTION_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                    
+            try:
+                probabilities = self._forward(np.stack([features for features, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+                
+            for (_, future), probability in zip(batch, probabilities):
+                # The caller may have been cancelled meanwhile
+                if not future.done():
+                    future.set_result(probability)
+                    
+    def _forward(self, features: np.ndarray) -> np.ndarray:
+        """Küçük Dense ağın inference'ını NumPy ile yapar (Dropout devre dışı)."""
+        if self._int8 is not None:
+            return self._forward_int8(features)
+            
+        x = features.astype(np.float32, copy=False)
+        if self._layers is None:
+            # Keras runs whatever the loaded model contains
+            return self.model(x, training=False).numpy()[:, 0]
+            
+        for kernel, bias, activation in self._layers:
+            x = _ACTIVATIONS[activation](x @ kernel + bias)
+        return x[:, 0]
+        
+    def quantize(self) -> bool:
+        """Modeli INT8 TFLite modeline çevirir; geçmiş örneklerle kalibre eder.
+
+        Yalnızca XNNPACK'li TFLite build'lerinde FP32'den hızlıdır.
+        """
+        if len(self.history) < self.min_samples:
+            return False
+            
+        self._install_int8(self._convert_int8(self.model, list(self.history)))
+        return True
+        
+    def _convert_int8(self, model: tf.keras.Model, history: List[Dict]) -> bytes:
+        """Keras modelini INT8 TFLite flatbuffer'ına çevirir."""
+        X, _ = self._prepare_training_data(history)
+        samples = np.asarray(X, dtype=np.float32)[:QUANTIZATION_SAMPLES]
         
-        # Model prediction
-        prediction = self.model.predict(
-            np.array([features])
-        )[0]
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: (
+            (sample[np.newaxis, :],) for sample in samples
+        )
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+        return converter.convert()
+        
+    def _install_int8(self, model_content: bytes):
+        # Threads pick up the new generation on their next inference
+        generation = self._int8[0] + 1 if self._int8 is not None else 1
+        self._int8 = (generation, model_content)
+        
+    def _schedule_quantize(self):
+        """Yeni ağırlıklarla quantization'ı arka plan thread'inde yapar."""
+        # At most one conversion at a time; a busy quantizer skips this round
+        if self._quantizing:
+            return
+        self._quantizing = True
+        
+        # Snapshot now: training may move the live model meanwhile
+        weights = self.model.get_weights()
+        history = list(self.history)
         
-        return bool(prediction[0] > 0.5), float(prediction[0])
+        def convert():
+            model = tf.keras.models.clone_model(self.model)
+            model.set_weights(weights)
+            self._install_int8(self._convert_int8(model, history))
+            
+        if self._quantizer is None:
+            self._quantizer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='cache-predictor-int8'
+            )
+        future = self._quantizer.submit(convert)
+        future.add_done_callback(self._quantize_done)
+        
+    def _quantize_done(self, future):
+        self._quantizing = False
+        
+    def _get_int8_interpreter(self) -> Tuple:
+        """Thread'e ait, sabit batch boyutuna göre ayrılmış interpreter'ı döner."""
+        generation, model_content = self._int8
+        cached = getattr(self._buffers, 'int8', None)
+        if cached is None or cached[0] != generation:
+            interpreter = tf.lite.Interpreter(
+                model_content=model_content,
+                num_threads=1
+            )
+            # One padded batch shape, so tensors are allocated exactly once
+            interpreter.resize_tensor_input(
+                interpreter.get_input_details()[0]['index'],
+                (PREDICTION_BATCH_SIZE, FEATURE_COUNT)
+            )
+            interpreter.allocate_tensors()
+            cached = self._buffers.int8 = (
+                generation,
+                interpreter,
+                interpreter.get_input_details()[0],
+                interpreter.get_output_details()[0],
+                np.zeros((PREDICTION_BATCH_SIZE, FEATURE_COUNT), dtype=np.int8)
+            )
+        return cached[1:]
+        
+    def _forward_int8(self, features: np.ndarray) -> np.ndarray:
+        """Quantize edilmiş TFLite modeliyle batch inference yapar."""
+        interpreter, input_detail, output_detail, x = self._get_int8_interpreter()
+        in_scale, in_zero = input_detail['quantization']
+        out_scale, out_zero = output_detail['quantization']
+        
+        result = np.empty(len(features), dtype=np.float32)
+        for start in range(0, len(features), PREDICTION_BATCH_SIZE):
+            chunk = features[start:start + PREDICTION_BATCH_SIZE]
+            n = len(chunk)
+            # Rows past n are padding; their outputs are ignored
+            x[:n] = np.clip(np.round(chunk / in_scale + in_zero), -128, 127)
+            
+            interpreter.set_tensor(input_detail['index'], x)
+            interpreter.invoke()
+            output = interpreter.get_tensor(output_detail['index'])
+            result[start:start + n] = (
+                output[:n, 0].astype(np.float32) - out_zero
+            ) * out_scale
+        return result
+        
+    def _refresh_weights(self):
+        """Model ağırlıklarını NumPy forward pass'i için kopyalar."""
+        self._layers = self._dense_stack(self.model)
+        
+    @staticmethod
+    def _dense_stack(model: tf.keras.Model
+                     ) -> Optional[List[Tuple[np.ndarray, np.ndarray, str]]]:
+        """Model yalnızca Dense/Dropout katmanlı bir Sequential ise ağırlıklarını döner."""
+        # A model loaded from model_path may hold anything; only the exact
+        # layer types and activations the NumPy pass implements qualify
+        if not isinstance(model, tf.keras.Sequential):
+            return None
+            
+        layers = []
+        for layer in model.layers:
+            # Identity at inference
+            if type(layer) is tf.keras.layers.Dropout:
+                continue
+            if type(layer) is not tf.keras.layers.Dense:
+                return None
+                
+            activation = layer.activation.__name__
+            if activation not in _ACTIVATIONS or \
+                    layer.activation is not tf.keras.activations.get(activation):
+                return None
+                
+            weights = layer.get_weights()
+            kernel = weights[0].astype(np.float32)
+            bias = (
+                weights[1].astype(np.float32) if layer.use_bias
+                else np.zeros(kernel.shape[1], dtype=np.float32)
+            )
+            layers.append((kernel, bias, activation))
+            
+        return layers or None
         
     def train(self, new_samples: List[Dict]):
         """Model'i yeni örneklerle eğitir."""
@@ -40,11 +272,21 @@ class CachePredictor:
             batch_size=32,
             verbose=0
         )
+        self._refresh_weights()
+        
+        # Keep a quantized model in step with the new weights
+        if self._int8 is not None:
+            self._schedule_quantize()
         
     def _extract_cache_features(self, query: str, 
-                              context: Dict) -> np.ndarray:
+                              context: Dict,
+                              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Cache prediction features çıkarır."""
-        return np.array([
+        if out is None:
+            out = np.empty(FEATURE_COUNT, dtype=np.float32)
+            
+        # One C-level tuple -> float32 copy; no temporary float64 array
+        out[:] = (
             len(query),
             context.get('time_of_day', 0) / 24.0,
             context.get('day_of_week', 0) / 7.0,
@@ -52,7 +294,8 @@ class CachePredictor:
             context.get('last_access_time', 0),
             context.get('access_count', 0),
             context.get('cache_hit_rate', 0.0)
-        ])
+        )
+        return out
         
     def _load_or_create_model(self, model_path: str) -> tf.keras.Model:
         """ML modelini yükler veya oluşturur."""
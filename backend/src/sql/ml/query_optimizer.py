@@ -1,16 +1,48 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import threading
 import tensorflow as tf
 import numpy as np
 from sklearn.preprocessing import StandardScaler
+from sklearn.utils.validation import check_is_fitted
 from .models import QueryCostModel, QueryPlanModel
 from ..parser import SQLParser
 
+FEATURE_COUNT = 6
+
 class MLQueryOptimizer:
     def __init__(self):
         self.parser = SQLParser()
         self.cost_model = QueryCostModel()
         self.plan_model = QueryPlanModel()
         self.scaler = StandardScaler()
+        # Fitted scaler as a plain affine: (x - mean) * inv_scale
+        self._mean: Optional[np.ndarray] = None
+        self._inv_scale: Optional[np.ndarray] = None
+        # Per-thread (1, FEATURE_COUNT) feature row
+        self._buffers = threading.local()
+        
+    def fit_scaler(self, features: np.ndarray):
+        """Scaler'ı fit eder ve transform parametrelerini önbelleğe alır."""
+        self.scaler.fit(features)
+        self._refresh_scaler()
+        
+    def _refresh_scaler(self):
+        """Fit edilmiş StandardScaler'ın mean/scale değerlerini kopyalar."""
+        scaler = self.scaler
+        # Raises NotFittedError like transform() would
+        check_is_fitted(scaler)
+        
+        self._mean = (
+            np.asarray(scaler.mean_, dtype=np.float64)
+            if scaler.with_mean
+            else np.zeros(FEATURE_COUNT)
+        )
+        # scale_ is None for with_std=False; zero variances are already 1.0
+        self._inv_scale = (
+            1.0 / np.asarray(scaler.scale_, dtype=np.float64)
+            if scaler.with_std
+            else np.ones(FEATURE_COUNT)
+        )
         
     def optimize(self, query: str) -> Dict:
         """ML tabanlı query optimization yapar."""
@@ -42,16 +74,26 @@ class MLQueryOptimizer:
         
     def _extract_features(self, parsed_query: Dict) -> np.ndarray:
         """Query'den ML features çıkarır."""
-        features = {
-            'num_joins': len(parsed_query.get('joins', [])),
-            'num_conditions': len(parsed_query.get('conditions', [])),
-            'num_tables': len(parsed_query.get('tables', [])),
-            'has_subqueries': bool(parsed_query.get('subqueries')),
-            'has_aggregations': bool(parsed_query.get('aggregations')),
-            'estimated_rows': self._estimate_result_size(parsed_query)
-        }
+        if self._mean is None:
+            self._refresh_scaler()
+            
+        row = getattr(self._buffers, 'row', None)
+        if row is None:
+            row = self._buffers.row = np.empty((1, FEATURE_COUNT), dtype=np.float64)
+            
+        # Filled straight into the 2-D row the models expect
+        row[0] = (
+            len(parsed_query.get('joins', [])),
+            len(parsed_query.get('conditions', [])),
+            len(parsed_query.get('tables', [])),
+            bool(parsed_query.get('subqueries')),
+            bool(parsed_query.get('aggregations')),
+            self._estimate_result_size(parsed_query)
+        )
         
-        return self.scaler.transform([list(features.values())])
+        # Same result as scaler.transform() without sklearn's input validation;
+        # the scaled row is a new array, so callers may keep it
+        return (row - self._mean) * self._inv_scale
         
     def _predict_cost(self, features: np.ndarray) -> Dict:
         """Query cost prediction yapar."""
@@ -1,33 +1,70 @@
-from typing import Dict, List, Optional
-import sqlparse
+from typing import Dict, List, Optional, Tuple
 from sqlparse.sql import Token, TokenList
 import re
+from ..utils.sql_parse import parse_sql
+
+PARSE_RESULT_CACHE_SIZE = 2048
+
+SUPPORTED_OPERATIONS = frozenset({
+    'SELECT', 'INSERT', 'UPDATE', 'DELETE',
+    'CREATE', 'ALTER', 'DROP', 'TRUNCATE'
+})
+_KW_SELECT = 'SELECT'
+_KW_FROM = 'FROM'
+
+# Shared by every SQLParser (planner, optimizer, debugger, ...):
+# query text -> parse_query / validate_query result
+_PARSE_RESULTS: Dict[str, Dict] = {}
+_VALIDATION_RESULTS: Dict[str, Tuple[bool, Optional[str]]] = {}
+
+def _remember(cache: Dict, query: str, result):
+    if len(cache) >= PARSE_RESULT_CACHE_SIZE:
+        cache.clear()
+    cache[query] = result
+    return result
 
 class SQLParser:
     def __init__(self):
-        self.supported_operations = {
-            'SELECT', 'INSERT', 'UPDATE', 'DELETE',
-            'CREATE', 'ALTER', 'DROP', 'TRUNCATE'
-        }
+        self.supported_operations = SUPPORTED_OPERATIONS
+        
+    @staticmethod
+    def clear_cache():
+        """Şema değişikliğinden sonra cache'lenmiş analizleri temizler."""
+        _PARSE_RESULTS.clear()
+        _VALIDATION_RESULTS.clear()
         
     def parse_query(self, query: str) -> Dict:
-        """Detaylı SQL query analizi yapar."""
-        parsed = sqlparse.parse(query)[0]
+        """Detaylı SQL query analizi yapar.
+
+        Sonuç aynı query için paylaşılır; çağıranlar değiştirmemelidir.
+        """
+        cached = _PARSE_RESULTS.get(query)
+        if cached is not None:
+            return cached
+            
+        parsed = parse_sql(query)[0]
+        query_type, tables, columns = self._scan(parsed)
         
-        return {
-            'type': self._get_query_type(parsed),
-            'tables': self._extract_tables(parsed),
-            'columns': self._extract_columns(parsed),
+        return _remember(_PARSE_RESULTS, query, {
+            'type': query_type,
+            'tables': tables,
+            'columns': columns,
             'conditions': self._extract_conditions(parsed),
             'joins': self._extract_joins(parsed),
             'subqueries': self._extract_subqueries(parsed),
             'parameters': self._extract_parameters(parsed)
-        }
+        })
         
     def validate_query(self, query: str) -> Tuple[bool, Optional[str]]:
         """Query'nin geçerliliğini kontrol eder."""
+        result = _VALIDATION_RESULTS.get(query)
+        if result is None:
+            result = _remember(_VALIDATION_RESULTS, query, self._validate(query))
+        return result
+        
+    def _validate(self, query: str) -> Tuple[bool, Optional[str]]:
         try:
-            parsed = sqlparse.parse(query)[0]
+            parsed = parse_sql(query)[0]
             
             # Syntax kontrolü
             if not self._check_syntax(parsed):
@@ -50,41 +87,39 @@ class SQLParser:
         except Exception as e:
             return False, str(e)
             
-    def _get_query_type(self, parsed: TokenList) -> str:
-        """Query tipini belirler."""
-        for token in parsed.tokens:
-            if token.is_keyword and token.value.upper() in self.supported_operations:
-                return token.value.upper()
-        return 'UNKNOWN'
-        
-    def _extract_tables(self, parsed: TokenList) -> List[str]:
-        """Query'de kullanılan tabloları çıkarır."""
+    def _scan(self, parsed: TokenList) -> Tuple[str, List[str], List[str]]:
+        """Query tipini, tabloları ve kolonları tek token geçişinde çıkarır."""
+        query_type = None
         tables = []
-        from_seen = False
-        
-        for token in parsed.tokens:
-            if token.is_keyword and token.value.upper() == 'FROM':
-                from_seen = True
-            elif from_seen and token.ttype is None:
-                tables.extend(
-                    t.strip() for t in token.value.split(',')
-                )
-                from_seen = False
-                
-        return tables
-        
-    def _extract_columns(self, parsed: TokenList) -> List[str]:
-        """Query'de kullanılan kolonları çıkarır."""
         columns = []
+        from_seen = False
         select_seen = False
         
         for token in parsed.tokens:
-            if token.is_keyword and token.value.upper() == 'SELECT':
-                select_seen = True
-            elif select_seen and token.ttype is None:
-                if token.value.upper() != 'FROM':
+            if token.is_keyword:
+                # sqlparse already upper-cases keywords into .normalized
+                keyword = token.normalized
+                if query_type is None and keyword in self.supported_operations:
+                    query_type = keyword
+                if keyword == _KW_FROM:
+                    from_seen = True
+                elif keyword == _KW_SELECT:
+                    select_seen = True
+                    
+            elif token.ttype is None:
+                value = token.value
+                parts = None
+                
+                # FROM'dan sonraki ilk grup tablolardır
+                if from_seen:
+                    parts = value.split(',')
+                    tables.extend(t.strip() for t in parts)
+                    from_seen = False
+                    
+                # SELECT'ten sonraki gruplar kolon olarak alınır
+                if select_seen and not (len(value) == 4 and value.upper() == _KW_FROM):
                     columns.extend(
-                        c.strip() for c in token.value.split(',')
+                        c.strip() for c in (parts or value.split(','))
                     )
                     
-        return columns
\ No newline at end of file
+        return query_type or 'UNKNOWN', tables, columns
\ No newline at end of file
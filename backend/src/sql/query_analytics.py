@@ -1,24 +1,71 @@
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import numpy as np
-from collections import defaultdict
+from collections import Counter, defaultdict
+from ..utils.query_fingerprint import query_pattern
+
+QUERY_HISTORY_SIZE = 100000  # ring buffer capacity
 
 class QueryAnalytics:
-    def __init__(self):
-        self.query_history = []
+    def __init__(self, capacity: int = QUERY_HISTORY_SIZE):
+        # Columnar ring buffer: one array per field, written in place
+        self._capacity = capacity
+        self._ts = np.empty(capacity, dtype='datetime64[us]')
+        self._exec = np.empty(capacity, dtype=np.float64)
+        self._rows = np.empty(capacity, dtype=np.int64)
+        self._cpu = np.empty(capacity, dtype=np.float32)
+        self._mem = np.empty(capacity, dtype=np.float32)
+        self._cache = np.empty(capacity, dtype=np.int32)
+        self._query: List[Optional[str]] = [None] * capacity
+        self._idx = 0  # next write position
+        self._count = 0
         self.performance_metrics = defaultdict(list)
         
     def record_query(self, query_info: Dict):
         """Query execution bilgilerini kaydeder."""
-        self.query_history.append({
-            'timestamp': datetime.utcnow(),
-            'query': query_info['query'],
-            'execution_time': query_info['duration'],
-            'rows_affected': query_info.get('rows_affected', 0),
-            'cpu_usage': query_info.get('cpu_usage', 0),
-            'memory_usage': query_info.get('memory_usage', 0),
-            'cache_hits': query_info.get('cache_hits', 0)
-        })
+        i = self._idx
+        self._ts[i] = datetime.utcnow()
+        self._query[i] = query_info['query']
+        self._exec[i] = query_info['duration']
+        self._rows[i] = query_info.get('rows_affected', 0)
+        self._cpu[i] = query_info.get('cpu_usage', 0)
+        self._mem[i] = query_info.get('memory_usage', 0)
+        self._cache[i] = query_info.get('cache_hits', 0)
+        
+        self._idx = (i + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+        
+    @property
+    def query_history(self) -> List[Dict]:
+        """Kayıtlı queryleri eskiden yeniye dict olarak döner."""
+        return [self._record(i) for i in self._ordered_indices()]
+        
+    def _record(self, i: int) -> Dict:
+        """Ring buffer'daki bir satırı query kaydına çevirir."""
+        return {
+            'timestamp': self._ts[i].item(),
+            'query': self._query[i],
+            'execution_time': float(self._exec[i]),
+            'rows_affected': int(self._rows[i]),
+            'cpu_usage': float(self._cpu[i]),
+            'memory_usage': float(self._mem[i]),
+            'cache_hits': int(self._cache[i])
+        }
+        
+    def _ordered_indices(self) -> np.ndarray:
+        """Dolu slotların indexlerini kayıt sırasıyla döner."""
+        start = (self._idx - self._count) % self._capacity
+        return (np.arange(self._count) + start) % self._capacity
+        
+    def _filter_queries(self, time_window: timedelta = None) -> np.ndarray:
+        """Zaman penceresindeki queryleri index dizisi olarak döner."""
+        indices = self._ordered_indices()
+        if time_window is None:
+            return indices
+            
+        # Timestamps are appended in order, so the window is a suffix
+        cutoff = np.datetime64(datetime.utcnow() - time_window, 'us')
+        return indices[np.searchsorted(self._ts[indices], cutoff):]
         
     def analyze_performance(self, time_window: timedelta = None) -> Dict:
         """Performance analizi yapar."""
@@ -31,25 +78,30 @@ class QueryAnalytics:
             'recommendations': self._generate_recommendations(queries)
         }
         
-    def _calculate_summary(self, queries: List[Dict]) -> Dict:
+    def _calculate_summary(self, queries: np.ndarray) -> Dict:
         """İstatistiksel özet hesaplar."""
-        execution_times = [q['execution_time'] for q in queries]
+        # Columns are gathered once; no per-query dict lookups
+        execution_times = self._exec[queries]
+        
+        # One partition yields both p95 and the max
+        p95, maximum = np.percentile(execution_times, (95, 100))
         
         return {
             'total_queries': len(queries),
-            'avg_execution_time': np.mean(execution_times),
-            'p95_execution_time': np.percentile(execution_times, 95),
-            'max_execution_time': max(execution_times),
-            'total_rows_affected': sum(q['rows_affected'] for q in queries)
+            'avg_execution_time': execution_times.mean(),
+            'p95_execution_time': p95,
+            'max_execution_time': maximum,
+            'total_rows_affected': int(self._rows[queries].sum())
         }
         
-    def _analyze_patterns(self, queries: List[Dict]) -> Dict:
+    def _analyze_patterns(self, queries: np.ndarray) -> Dict:
         """Query pattern analizi yapar."""
         patterns = defaultdict(int)
         
-        for query in queries:
-            pattern = self._extract_query_pattern(query['query'])
-            patterns[pattern] += 1
+        # Repeated texts are normalized once
+        texts = Counter(self._query[i] for i in queries)
+        for query, count in texts.items():
+            patterns[self._extract_query_pattern(query)] += count
             
         return {
             'common_patterns': dict(
@@ -61,14 +113,24 @@ class QueryAnalytics:
             )
         }
         
-    def _identify_bottlenecks(self, queries: List[Dict]) -> List[Dict]:
+    def _extract_query_pattern(self, query: str) -> str:
+        """Query'yi literal değerlerden arındırılmış kalıba çevirir."""
+        return query_pattern(query)
+        
+    def _identify_bottlenecks(self, queries: np.ndarray) -> List[Dict]:
         """Performance bottleneck'leri belirler."""
         bottlenecks = []
+        if not len(queries):
+            return bottlenecks
+            
+        # float64 accumulation keeps the means stable for large windows
+        cpu = self._cpu[queries]
+        memory = self._mem[queries]
         
         # CPU yoğun queryler
         cpu_intensive = [
-            q for q in queries
-            if q['cpu_usage'] > np.mean([q['cpu_usage'] for q in queries]) * 2
+            self._record(i)
+            for i in queries[cpu > cpu.mean(dtype=np.float64) * 2]
         ]
         if cpu_intensive:
             bottlenecks.append({
@@ -78,8 +140,8 @@ class QueryAnalytics:
             
         # Memory yoğun queryler
         memory_intensive = [
-            q for q in queries
-            if q['memory_usage'] > np.mean([q['memory_usage'] for q in queries]) * 2
+            self._record(i)
+            for i in queries[memory > memory.mean(dtype=np.float64) * 2]
         ]
         if memory_intensive:
             bottlenecks.append({
@@ -1,18 +1,36 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
 @dataclass
 class QueryCondition:
+    __slots__ = ('column', 'operator', 'value')
+    
     column: str
     operator: str
     value: Any
 
 @dataclass
 class JoinClause:
+    __slots__ = ('table', 'type', 'conditions')
+    
     table: str
     type: str  # INNER, LEFT, RIGHT, FULL
     conditions: List[QueryCondition]
 
+# Parameterized skeleton -> SQL; equal shapes share one string object
+PREPARED_CACHE_SIZE = 1024
+_PREPARED: Dict[Tuple, str] = {}
+
+def _render(conditions: List[QueryCondition]) -> Tuple[str, str, List[Any]]:
+    """Koşulları literal SQL, '?' şablonu ve parametre listesine çevirir."""
+    literal = ' AND '.join([
+        f"{c.column} {c.operator} {c.value}" for c in conditions
+    ])
+    template = ' AND '.join([
+        f"{c.column} {c.operator} ?" for c in conditions
+    ])
+    return literal, template, [c.value for c in conditions]
+
 class QueryBuilder:
     def __init__(self):
         self.reset()
@@ -21,10 +39,16 @@ class QueryBuilder:
         self._type = 'SELECT'
         self._tables = []
         self._columns = ['*']
+        # Clauses are rendered when added; WHERE/HAVING keep parallel lists
+        # of literal fragments, '?' templates and the template parameters
         self._conditions = []
+        self._where_templates = []
+        self._where_params = []
         self._joins = []
         self._group_by = []
         self._having = []
+        self._having_templates = []
+        self._having_params = []
         self._order_by = []
         self._limit = None
         self._offset = None
@@ -39,11 +63,18 @@ class QueryBuilder:
         return self
         
     def where(self, condition: QueryCondition) -> 'QueryBuilder':
-        self._conditions.append(condition)
+        literal, template, params = _render([condition])
+        self._conditions.append(literal)
+        self._where_templates.append(template)
+        self._where_params.extend(params)
         return self
         
     def join(self, join_clause: JoinClause) -> 'QueryBuilder':
-        self._joins.append(join_clause)
+        # ON conditions usually compare columns, so they stay literal
+        literal, _, _ = _render(join_clause.conditions)
+        self._joins.append(
+            f"{join_clause.type} JOIN {join_clause.table} ON {literal}"
+        )
         return self
         
     def group_by(self, *columns: str) -> 'QueryBuilder':
@@ -51,7 +82,10 @@ class QueryBuilder:
         return self
         
     def having(self, condition: QueryCondition) -> 'QueryBuilder':
-        self._having.append(condition)
+        literal, template, params = _render([condition])
+        self._having.append(literal)
+        self._having_templates.append(template)
+        self._having_params.extend(params)
         return self
         
     def order_by(self, column: str, desc: bool = False) -> 'QueryBuilder':
@@ -67,54 +101,58 @@ class QueryBuilder:
         return self
         
     def build(self) -> str:
-        query_parts = []
+        return self._compose(self._joins, self._conditions, self._having)
         
-        # SELECT
-        columns = ', '.join(self._columns)
-        query_parts.append(f"SELECT {columns}")
+    def prepare(self) -> Tuple[str, List[Any]]:
+        """WHERE/HAVING değerlerini '?' parametresi yapar; (sql, params) döner."""
+        key = (
+            tuple(self._columns), tuple(self._tables),
+            tuple(self._joins), tuple(self._where_templates),
+            tuple(self._group_by), tuple(self._having_templates),
+            tuple(self._order_by), self._limit, self._offset
+        )
+        sql = _PREPARED.get(key)
+        if sql is None:
+            if len(_PREPARED) >= PREPARED_CACHE_SIZE:
+                _PREPARED.clear()
+            sql = _PREPARED[key] = self._compose(
+                self._joins,
+                self._where_templates,
+                self._having_templates
+            )
+            
+        # Parameters follow placeholder order: WHERE, then HAVING
+        return sql, self._where_params + self._having_params
         
-        # FROM
-        tables = ', '.join(self._tables)
-        query_parts.append(f"FROM {tables}")
+    def _compose(self, joins: List[str], conditions: List[str], 
+                 having: List[str]) -> str:
+        """Önceden render edilmiş parçalardan SQL'i birleştirir."""
+        query_parts = [
+            f"SELECT {', '.join(self._columns)}",
+            f"FROM {', '.join(self._tables)}"
+        ]
         
         # JOINS
-        if self._joins:
-            for join in self._joins:
-                conditions = ' AND '.join(
-                    f"{c.column} {c.operator} {c.value}"
-                    for c in join.conditions
-                )
-                query_parts.append(
-                    f"{join.type} JOIN {join.table} ON {conditions}"
-                )
+        query_parts.extend(joins)
                 
         # WHERE
-        if self._conditions:
-            conditions = ' AND '.join(
-                f"{c.column} {c.operator} {c.value}"
-                for c in self._conditions
-            )
-            query_parts.append(f"WHERE {conditions}")
+        if conditions:
+            query_parts.append(f"WHERE {' AND '.join(conditions)}")
             
         # GROUP BY
         if self._group_by:
-            columns = ', '.join(self._group_by)
-            query_parts.append(f"GROUP BY {columns}")
+            query_parts.append(f"GROUP BY {', '.join(self._group_by)}")
             
         # HAVING
-        if self._having:
-            conditions = ' AND '.join(
-                f"{c.column} {c.operator} {c.value}"
-                for c in self._having
-            )
-            query_parts.append(f"HAVING {conditions}")
+        if having:
+            query_parts.append(f"HAVING {' AND '.join(having)}")
             
         # ORDER BY
         if self._order_by:
-            order = ', '.join(
+            order = ', '.join([
                 f"{column} {'DESC' if desc else 'ASC'}"
                 for column, desc in self._order_by
-            )
+            ])
             query_parts.append(f"ORDER BY {order}")
             
         # LIMIT & OFFSET
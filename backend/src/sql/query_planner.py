@@ -1,10 +1,56 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, Hashable, List, Optional
+import os
+import pickle
+import time
 import numpy as np
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from dataclasses import dataclass, field
 from .parser import SQLParser
+from ..utils.query_fingerprint import fingerprint_query
+
+# Plan cache admission: a query is MONITORed for a few plans, then either
+# served from cache (ACTIVE) or planned every time (BYPASS)
+PLAN_CACHE_SIZE = 1000
+PLAN_CACHE_TTL = 300  # seconds; table statistics drift
+PLAN_CACHE_MIN_SAMPLES = 5
+PLAN_CACHE_MIN_COST = 0.001  # seconds of candidate generation + selection
+PLAN_CACHE_MIN_BENEFIT = 0.3  # share of create_plan time a hit skips
+PLAN_CACHE_EWMA_ALPHA = 0.3
+
+MONITOR, ACTIVE, BYPASS = 'monitor', 'active', 'bypass'
+
+# Below this many uncached candidates, IPC costs more than it saves
+PARALLEL_COSTING_MIN_CANDIDATES = 5
+PARALLEL_COSTING_CHUNKSIZE = 4
+
+_cost_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_cost_pool() -> ProcessPoolExecutor:
+    """Plan maliyeti için paylaşılan process pool'u döner."""
+    global _cost_pool
+    if _cost_pool is None:
+        _cost_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _cost_pool
+
+# Worker side: (pickled planner, planner); chunks of one call share it
+_worker_planner: Optional[tuple] = None
+
+def _cost_plan_chunk(planner_state: bytes, plans: List[Dict]) -> List['QueryCost']:
+    """Worker process'te bir grup planı maliyetlendirir."""
+    global _worker_planner
+    if _worker_planner is None or _worker_planner[0] != planner_state:
+        _worker_planner = (planner_state, pickle.loads(planner_state))
+    planner = _worker_planner[1]
+    return [planner._calculate_plan_cost(plan) for plan in plans]
 
 @dataclass
 class QueryCost:
+    # One per costed (sub-)plan; no per-instance __dict__
+    __slots__ = ('cpu_cost', 'io_cost', 'memory_cost', 'network_cost')
+    
     cpu_cost: float
     io_cost: float
     memory_cost: float
@@ -15,31 +61,132 @@ class QueryCost:
         return (self.cpu_cost + self.io_cost + 
                 self.memory_cost + self.network_cost)
 
+@dataclass
+class PlanCacheEntry:
+    expires_at: float
+    state: str = MONITOR
+    samples: int = 0
+    plan_cost: float = 0.0  # EWMA of planning seconds
+    total_cost: float = 0.0  # EWMA of create_plan seconds
+    plan: Optional[Dict] = field(default=None, repr=False)
+    
+    def observe(self, plan_seconds: float, total_seconds: float):
+        if self.samples:
+            self.plan_cost += PLAN_CACHE_EWMA_ALPHA * (plan_seconds - self.plan_cost)
+            self.total_cost += PLAN_CACHE_EWMA_ALPHA * (total_seconds - self.total_cost)
+        else:
+            self.plan_cost, self.total_cost = plan_seconds, total_seconds
+        self.samples += 1
+
+def _canonical_plan_key(node: Any) -> Hashable:
+    """Plan (ya da alt plan) için hashable, sıra-kararlı bir key üretir."""
+    if isinstance(node, dict):
+        return tuple(sorted(
+            (key, _canonical_plan_key(value)) for key, value in node.items()
+        ))
+    if isinstance(node, (list, tuple)):
+        # Order is significant (e.g. join order)
+        return tuple(_canonical_plan_key(value) for value in node)
+    if isinstance(node, (set, frozenset)):
+        return frozenset(_canonical_plan_key(value) for value in node)
+    try:
+        hash(node)
+    except TypeError:
+        return repr(node)
+    return node
+
 class QueryPlanner:
     def __init__(self):
         self.parser = SQLParser()
         self.stats_manager = TableStatisticsManager()
+        # canonical plan -> cost; identical (sub-)plans are costed once
+        self._plan_cost_cache: Dict[Hashable, QueryCost] = {}
+        # query fingerprint -> PlanCacheEntry, in LRU order
+        self._plan_cache: OrderedDict = OrderedDict()
+        # Cleared once the planner turns out not to be picklable
+        self._parallel_costing = True
+        
+    def __getstate__(self):
+        # Cost workers get the planner without its caches
+        state = self.__dict__.copy()
+        state['_plan_cost_cache'] = {}
+        state['_plan_cache'] = OrderedDict()
+        return state
         
     def create_plan(self, query: str) -> Dict:
         """Detaylı query execution planı oluşturur."""
-        parsed = self.parser.parse_query(query)
+        # Table statistics may have moved since the last plan
+        self._plan_cost_cache.clear()
         
-        # Farklı plan alternatifleri oluştur
-        plan_candidates = self._generate_plan_candidates(parsed)
+        started = time.perf_counter()
+        entry = self._plan_cache_entry(query)
         
-        # En iyi planı seç
-        best_plan = self._select_best_plan(plan_candidates)
+        if entry.state == ACTIVE:
+            # Cached plans are shared; callers must not mutate them
+            best_plan = entry.plan
+        else:
+            parsed = self.parser.parse_query(query)
+            
+            # Farklı plan alternatifleri oluştur
+            plan_candidates = self._generate_plan_candidates(parsed)
+            
+            # En iyi planı seç
+            best_plan = self._select_best_plan(plan_candidates)
+            
+        planned = time.perf_counter()
         
         # Resource allocation
         resources = self._allocate_resources(best_plan)
         
-        return {
+        result = {
             'execution_plan': best_plan,
             'cost_analysis': self._analyze_cost(best_plan),
             'resource_allocation': resources,
             'parallelization': self._plan_parallelization(best_plan)
         }
         
+        if entry.state == MONITOR:
+            entry.observe(planned - started, time.perf_counter() - started)
+            self._admit_plan(entry, best_plan)
+            
+        return result
+        
+    def _plan_cache_entry(self, query: str) -> PlanCacheEntry:
+        """Query'nin plan cache kaydını döner; yoksa MONITOR kaydı açar."""
+        # Literals stay in the key: plans embed the parsed predicate values
+        key = fingerprint_query(query)
+        now = time.monotonic()
+        
+        entry = self._plan_cache.get(key)
+        if entry is not None and entry.expires_at > now:
+            self._plan_cache.move_to_end(key)
+            return entry
+            
+        # New or expired: start monitoring again
+        entry = self._plan_cache[key] = PlanCacheEntry(expires_at=now + PLAN_CACHE_TTL)
+        self._plan_cache.move_to_end(key)
+        if len(self._plan_cache) > PLAN_CACHE_SIZE:
+            self._plan_cache.popitem(last=False)
+        return entry
+        
+    def _admit_plan(self, entry: PlanCacheEntry, plan: Dict):
+        """Yeterli örnekten sonra kaydı ACTIVE ya da BYPASS yapar."""
+        if entry.samples < PLAN_CACHE_MIN_SAMPLES:
+            return
+            
+        benefit = entry.plan_cost / entry.total_cost if entry.total_cost else 0.0
+        if (plan is not None
+                and entry.plan_cost >= PLAN_CACHE_MIN_COST
+                and benefit >= PLAN_CACHE_MIN_BENEFIT):
+            entry.state = ACTIVE
+            entry.plan = plan
+        else:
+            entry.state = BYPASS
+            
+    def invalidate_plan_cache(self):
+        """İstatistik ya da şema değişince plan cache'i boşaltır."""
+        self._plan_cache.clear()
+        
     def _generate_plan_candidates(self, parsed_query: Dict) -> List[Dict]:
         """Alternatif execution planları oluşturur."""
         candidates = []
@@ -65,21 +212,68 @@ class QueryPlanner:
         
     def _select_best_plan(self, candidates: List[Dict]) -> Dict:
         """Cost-based plan seçimi yapar."""
-        best_plan = None
-        min_cost = float('inf')
-        
-        for plan in candidates:
-            cost = self._calculate_plan_cost(plan)
+        # Resource constraints kontrolü (before costing the plan)
+        feasible = [
+            plan for plan in candidates
+            if self._check_resource_constraints(plan)
+        ]
+        if not feasible:
+            return None
             
-            # Resource constraints kontrolü
-            if not self._check_resource_constraints(plan):
-                continue
-                
-            if cost.total_cost < min_cost:
-                min_cost = cost.total_cost
-                best_plan = plan
+        costs = self._get_plan_costs(feasible)
+        best = min(range(len(feasible)), key=lambda i: costs[i].total_cost)
+        return feasible[best]
+        
+    def _get_plan_costs(self, plans: List[Dict]) -> List[QueryCost]:
+        """Planları maliyetlendirir; önbellekte olmayanları paralel hesaplar."""
+        keys = [_canonical_plan_key(plan) for plan in plans]
+        
+        # Each distinct uncached plan is costed once
+        missing = {}
+        for key, plan in zip(keys, plans):
+            if key not in self._plan_cost_cache:
+                missing.setdefault(key, plan)
                 
-        return best_plan
+        costs = None
+        if self._parallel_costing and len(missing) >= PARALLEL_COSTING_MIN_CANDIDATES:
+            costs = self._get_plan_costs_parallel(list(missing.values()))
+            
+        if costs is None:
+            costs = [self._calculate_plan_cost(plan) for plan in missing.values()]
+        self._plan_cost_cache.update(zip(missing, costs))
+        
+        return [self._plan_cost_cache[key] for key in keys]
+        
+    def _get_plan_costs_parallel(self, plans: List[Dict]) -> Optional[List[QueryCost]]:
+        """Planları process pool'da maliyetlendirir; olmazsa None döner."""
+        global _cost_pool
+        try:
+            # Pickled once per call, not once per chunk
+            state = pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # e.g. a live connection in stats_manager; cost inline from now on
+            self._parallel_costing = False
+            return None
+            
+        chunks = [
+            plans[i:i + PARALLEL_COSTING_CHUNKSIZE]
+            for i in range(0, len(plans), PARALLEL_COSTING_CHUNKSIZE)
+        ]
+        try:
+            return [
+                cost
+                for chunk_costs in _get_cost_pool().map(
+                    _cost_plan_chunk, repeat(state), chunks
+                )
+                for cost in chunk_costs
+            ]
+        except BrokenProcessPool:
+            # A worker died; the next call starts a fresh pool
+            _cost_pool = None
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # A plan (or a cost) didn't cross the process boundary
+            pass
+        return None
         
     def _plan_parallelization(self, plan: Dict) -> Dict:
         """Query'nin parallel execution planını oluşturur."""
@@ -99,7 +293,7 @@ class QueryPlanner:
         
     def _allocate_resources(self, plan: Dict) -> Dict:
         """Query için resource allocation yapar."""
-        cost = self._calculate_plan_cost(plan)
+        cost = self._get_plan_cost(plan)
         
         return {
             'memory': {
@@ -116,4 +310,12 @@ class QueryPlanner:
                 'estimated_reads': self._estimate_io_reads(plan),
                 'estimated_writes': self._estimate_io_writes(plan)
             }
-        }
\ No newline at end of file
+        }
+        
+    def _get_plan_cost(self, plan: Dict) -> QueryCost:
+        """Plan maliyetini hesaplar; aynı (alt) plan için önbellekten döner."""
+        key = _canonical_plan_key(plan)
+        cost = self._plan_cost_cache.get(key)
+        if cost is None:
+            cost = self._plan_cost_cache[key] = self._calculate_plan_cost(plan)
+        return cost
\ No newline at end of file
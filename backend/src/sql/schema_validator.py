@@ -1,35 +1,104 @@
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 import json
+import re
+
+# Fully annotated so `make compile` can build it with mypyc
+
+SUPPORTED_TYPES = frozenset({
+    'INTEGER', 'BIGINT', 'SMALLINT',
+    'VARCHAR', 'TEXT', 'CHAR',
+    'DATE', 'TIMESTAMP', 'BOOLEAN',
+    'DECIMAL', 'NUMERIC', 'FLOAT'
+})
+
+# Base type name: VARCHAR(255) -> VARCHAR, decimal(10, 2) -> DECIMAL
+_TYPE_RE = re.compile(r'\s*([A-Za-z]+)')
+
+# Plain slotted classes rather than dataclasses: mypyc compiles these to
+# native classes, and interpreted they still have no per-instance __dict__
+class ColumnSpec:
+    __slots__ = ('name', 'type', 'primary_key')
+    
+    def __init__(self, name: str, type: str, primary_key: bool) -> None:
+        self.name = name
+        self.type = type
+        self.primary_key = primary_key
+        
+    @classmethod
+    def from_dict(cls, raw: Dict) -> 'ColumnSpec':
+        return cls(raw['name'], raw['type'], bool(raw.get('primary_key')))
+
+class FKSpec:
+    __slots__ = ('columns', 'ref_table', 'ref_columns')
+    
+    def __init__(self, columns: Tuple[str, ...], ref_table: Optional[str],
+                 ref_columns: Tuple[str, ...]) -> None:
+        self.columns = columns
+        self.ref_table = ref_table
+        self.ref_columns = ref_columns
+        
+    @classmethod
+    def from_dict(cls, raw: Dict) -> 'FKSpec':
+        return cls(
+            tuple(raw.get('columns', ())),
+            raw.get('ref_table'),
+            tuple(raw.get('ref_columns', ()))
+        )
 
-@dataclass
 class TableSchema:
-    name: str
-    columns: List[Dict]
-    constraints: List[Dict]
-    indexes: List[Dict]
+    __slots__ = ('name', 'columns', 'column_names', 'has_primary_key',
+                 'foreign_keys', 'indexes')
+    
+    def __init__(self, name: str, columns: List[ColumnSpec],
+                 column_names: FrozenSet[str], has_primary_key: bool,
+                 foreign_keys: List[FKSpec], indexes: List[Dict]) -> None:
+        self.name = name
+        self.columns = columns
+        self.column_names = column_names
+        self.has_primary_key = has_primary_key
+        self.foreign_keys = foreign_keys
+        self.indexes = indexes
+        
+    @classmethod
+    def from_dict(cls, name: str, raw: Dict) -> 'TableSchema':
+        """Ham tablo tanımını bir kez okuyup tipli yapıya çevirir."""
+        columns = [ColumnSpec.from_dict(column) for column in raw.get('columns', ())]
+        constraints = raw.get('constraints', ())
+        
+        return cls(
+            name=name,
+            columns=columns,
+            column_names=frozenset(column.name for column in columns),
+            has_primary_key=(
+                any(column.primary_key for column in columns)
+                or any(c['type'] == 'PRIMARY KEY' for c in constraints)
+            ),
+            foreign_keys=[
+                FKSpec.from_dict(c) for c in constraints
+                if c['type'] == 'FOREIGN KEY'
+            ],
+            indexes=list(raw.get('indexes', ()))
+        )
 
 class SchemaValidator:
-    def __init__(self):
-        self.supported_types = {
-            'INTEGER', 'BIGINT', 'SMALLINT',
-            'VARCHAR', 'TEXT', 'CHAR',
-            'DATE', 'TIMESTAMP', 'BOOLEAN',
-            'DECIMAL', 'NUMERIC', 'FLOAT'
-        }
+    def __init__(self) -> None:
+        self.supported_types = SUPPORTED_TYPES
         
     def validate_schema(self, schema: Dict) -> Dict:
         """Schema'yı validate eder ve kontrol raporu döndürür."""
-        validation_report = {
+        validation_report: Dict[str, Any] = {
             'is_valid': True,
             'errors': [],
             'warnings': []
         }
         
         try:
+            # Raw dicts are read once; everything below walks the typed graph
+            tables = self.parse_schema(schema)
+            
             # Tablo validasyonu
-            for table_name, table_def in schema.items():
-                table_report = self._validate_table(table_name, table_def)
+            for table in tables.values():
+                table_report = self._validate_table(table)
                 
                 if table_report['errors']:
                     validation_report['is_valid'] = False
@@ -38,7 +107,7 @@ class SchemaValidator:
                 validation_report['warnings'].extend(table_report['warnings'])
                 
             # Referential integrity kontrolü
-            ref_report = self._check_referential_integrity(schema)
+            ref_report = self._check_referential_integrity(tables)
             if ref_report['errors']:
                 validation_report['is_valid'] = False
                 validation_report['errors'].extend(ref_report['errors'])
@@ -50,43 +119,82 @@ class SchemaValidator:
             validation_report['errors'].append(str(e))
             return validation_report
             
-    def _validate_table(self, table_name: str, table_def: Dict) -> Dict:
+    def parse_schema(self, schema: Dict) -> Dict[str, TableSchema]:
+        """Ham schema dict'ini tablo adı -> TableSchema yapısına çevirir."""
+        return {
+            table_name: TableSchema.from_dict(table_name, table_def)
+            for table_name, table_def in schema.items()
+        }
+        
+    def _validate_table(self, table: TableSchema) -> Dict:
         """Tablo tanımını validate eder."""
-        report = {'errors': [], 'warnings': []}
+        report: Dict[str, List[str]] = {'errors': [], 'warnings': []}
         
         # Primary key kontrolü
-        if not self._has_primary_key(table_def):
+        if not table.has_primary_key:
             report['warnings'].append(
-                f"Table {table_name} has no primary key"
+                f"Table {table.name} has no primary key"
             )
             
         # Kolon tipleri kontrolü
-        for column in table_def.get('columns', []):
-            if not self._is_valid_column_type(column['type']):
+        is_valid_type = self._is_valid_column_type
+        report['errors'].extend(
+            f"Invalid column type {column.type} in {table.name}.{column.name}"
+            for column in table.columns
+            if not is_valid_type(column.type)
+        )
+                
+        # Index kontrolü
+        for index in table.indexes:
+            if not self._is_valid_index(index, table):
                 report['errors'].append(
-                    f"Invalid column type {column['type']} in {table_name}.{column['name']}"
+                    f"Invalid index definition in table {table.name}"
                 )
                 
-        # Index kontrolü
-        if indexes := table_def.get('indexes', []):
-            for index in indexes:
-                if not self._is_valid_index(index, table_def):
+        return report
+        
+    def _is_valid_column_type(self, column_type: str) -> bool:
+        """Kolon tipinin (parametreleri hariç) desteklenip desteklenmediğini kontrol eder."""
+        match = _TYPE_RE.match(column_type)
+        return match is not None and match.group(1).upper() in self.supported_types
+        
+    def _is_valid_index(self, index: Dict, table: TableSchema) -> bool:
+        """Index'in tablodaki mevcut kolonlar üzerinde tanımlı olduğunu kontrol eder."""
+        columns = index.get('columns')
+        if not columns:
+            return False
+        return table.column_names.issuperset(columns)
+        
+    def _check_referential_integrity(self, tables: Dict[str, TableSchema]) -> Dict:
+        """Referential integrity kontrolü yapar."""
+        report: Dict[str, List[str]] = {'errors': [], 'warnings': []}
+        
+        # The same FK declared twice is checked (and reported) once
+        seen = set()
+        
+        for table in tables.values():
+            for fk in table.foreign_keys:
+                key = (table.name, fk.columns, fk.ref_table, fk.ref_columns)
+                if key in seen:
+                    continue
+                seen.add(key)
+                
+                if not self._is_valid_foreign_key(table, fk, tables):
                     report['errors'].append(
-                        f"Invalid index definition in table {table_name}"
+                        f"Invalid foreign key reference in {table.name}"
                     )
                     
         return report
         
-    def _check_referential_integrity(self, schema: Dict) -> Dict:
-        """Referential integrity kontrolü yapar."""
-        report = {'errors': [], 'warnings': []}
+    def _is_valid_foreign_key(self, table: TableSchema, fk: FKSpec,
+                              tables: Dict[str, TableSchema]) -> bool:
+        """FK kolonlarının ve hedef tablo/kolonlarının var olduğunu kontrol eder."""
+        if fk.ref_table is None or fk.ref_table not in tables:
+            return False
+        ref_table = tables[fk.ref_table]
         
-        for table_name, table_def in schema.items():
-            for constraint in table_def.get('constraints', []):
-                if constraint['type'] == 'FOREIGN KEY':
-                    if not self._is_valid_foreign_key(constraint, schema):
-                        report['errors'].append(
-                            f"Invalid foreign key reference in {table_name}"
-                        )
-                        
-        return report
\ No newline at end of file
+        return (
+            len(fk.columns) == len(fk.ref_columns)
+            and table.column_names.issuperset(fk.columns)
+            and ref_table.column_names.issuperset(fk.ref_columns)
+        )
\ No newline at end of file
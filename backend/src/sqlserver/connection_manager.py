@@ -1,89 +1,248 @@
-from typing import Dict, Optional
-import pyodbc
-from contextlib import contextmanager
-import threading
+from typing import AsyncIterator, Dict, Optional, Tuple
+import aioodbc
+from contextlib import asynccontextmanager
 from datetime import datetime
 import asyncio
-from .models import ServerConfig, ConnectionPool
+import re
+from .models import ServerConfig
+
+POOL_MIN_SIZE = 5  # warm connections for a server's default database
+CONNECT_TIMEOUT = 30  # seconds
+ACQUIRE_TIMEOUT = 30  # seconds to wait for a free pooled connection
+
+# Database names go into the connection string, so only plain identifiers
+_DATABASE_NAME = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+_PASSWORD = re.compile(r'(PWD=)[^;]*', re.IGNORECASE)
+# Statements that may leave a pooled connection in another database; false
+# positives (a column named "use") only cost a reconnect
+_USE_STATEMENT = re.compile(r'\bUSE\b', re.IGNORECASE)
+
+def _mask_credentials(text: str) -> str:
+    """Metindeki connection string şifrelerini maskeler."""
+    return _PASSWORD.sub(r'\1***', text)
+
+class _TrackedCursor:
+    """Cursor sarmalayıcısı; USE içeren statement'ları bağlantısına bildirir."""
+    def __init__(self, cursor: aioodbc.Cursor, connection: '_TrackedConnection'):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_connection', connection)
+        
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+        
+    def __setattr__(self, name, value):
+        # arraysize and the like belong to the wrapped cursor
+        setattr(self._cursor, name, value)
+        
+    def execute(self, sql: str, *params):
+        self._connection._note(sql)
+        return self._cursor.execute(sql, *params)
+        
+    def executemany(self, sql: str, *params):
+        self._connection._note(sql)
+        return self._cursor.executemany(sql, *params)
+        
+    def __aiter__(self):
+        return self._cursor.__aiter__()
+        
+    async def __aenter__(self):
+        await self._cursor.__aenter__()
+        return self
+        
+    async def __aexit__(self, *exc_info):
+        return await self._cursor.__aexit__(*exc_info)
+
+class _TrackedCursorContext:
+    """conn.cursor() dönüşü; hem await hem async with ile kullanılabilir."""
+    def __init__(self, context, connection: '_TrackedConnection'):
+        self._context = context
+        self._connection = connection
+        
+    def __await__(self):
+        cursor = yield from self._context.__await__()
+        return _TrackedCursor(cursor, self._connection)
+        
+    async def __aenter__(self):
+        return _TrackedCursor(await self._context.__aenter__(), self._connection)
+        
+    async def __aexit__(self, *exc_info):
+        return await self._context.__aexit__(*exc_info)
+
+class _TrackedConnection:
+    """Pool bağlantısı sarmalayıcısı; database değiştirip değiştirmediğini izler."""
+    def __init__(self, conn: aioodbc.Connection):
+        self._conn = conn
+        self.switched_database = False
+        
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+        
+    def _note(self, sql: str):
+        if not self.switched_database and _USE_STATEMENT.search(sql):
+            self.switched_database = True
+            
+    def cursor(self) -> _TrackedCursorContext:
+        return _TrackedCursorContext(self._conn.cursor(), self)
+        
+    async def execute(self, sql: str, *args) -> _TrackedCursor:
+        self._note(sql)
+        return _TrackedCursor(await self._conn.execute(sql, *args), self)
 
 class SQLServerManager:
     def __init__(self):
-        self.pools = {}  # server -> pool
+        # (server, database) -> pool; connections are opened in that database
+        self.pools: Dict[Tuple[str, str], aioodbc.Pool] = {}
         self.configs = {}  # server -> config
-        self.lock = threading.Lock()
+        # (server, database) -> (config, connection string), built once
+        self._dsns: Dict[Tuple[str, str], Tuple[ServerConfig, str]] = {}
+        # Held across awaits, so it must not block the event loop
+        self.lock = asyncio.Lock()
         self.max_pool_size = 10
         
     async def add_server(self, config: ServerConfig) -> Dict:
         """Yeni SQL Server ekler."""
         try:
-            with self.lock:
-                server_id = config.server_name
-                
-                # Test connection
-                await self._test_connection(config)
-                
-                # Initialize pool
-                self.pools[server_id] = ConnectionPool(
-                    max_size=self.max_pool_size
-                )
+            server_id = config.server_name
+            
+            # Connecting can take seconds; do it without holding the lock
+            await self._test_connection(config)
+            pool = await self._create_pool(
+                config,
+                config.default_database,
+                min(POOL_MIN_SIZE, self.max_pool_size)
+            )
+            
+            # Only the swap itself is serialized
+            async with self.lock:
+                # A re-added server drops the pools built from its old config
+                old_pools = [
+                    self.pools.pop(key) for key in list(self.pools)
+                    if key[0] == server_id
+                ]
+                self.pools[(server_id, config.default_database)] = pool
                 
                 # Store config
                 self.configs[server_id] = config
                 
-                return {
-                    'status': 'success',
-                    'server_id': server_id,
-                    'message': 'Server added successfully'
-                }
+            for old_pool in old_pools:
+                await self._close_pool(old_pool)
                 
+            return {
+                'status': 'success',
+                'server_id': server_id,
+                'message': 'Server added successfully'
+            }
+            
         except Exception as e:
             return {
                 'status': 'error',
-                'error': str(e)
+                'error': _mask_credentials(str(e))
             }
             
-    @contextmanager
+    @asynccontextmanager
     async def get_connection(self, server_id: str,
-                           database: str) -> pyodbc.Connection:
+                           database: str,
+                           timeout: float = ACQUIRE_TIMEOUT) -> AsyncIterator[_TrackedConnection]:
         """Server bağlantısı alır."""
-        pool = self.pools.get(server_id)
-        if not pool:
-            raise ValueError(f"Unknown server: {server_id}")
-            
+        pool = await self._get_pool(server_id, database)
+        
+        # An exhausted pool raises asyncio.TimeoutError instead of queueing
+        # the caller forever
+        conn = await asyncio.wait_for(pool.acquire(), timeout)
+        tracked = _TrackedConnection(conn)
         try:
-            # Get connection from pool
-            conn = await pool.acquire()
-            
-            # Change database if needed
-            if database:
-                conn.execute(f"USE {database}")
-                
-            yield conn
-            
+            # Already in the right database
+            yield tracked
         finally:
-            # Return connection to pool
+            # A statement may have switched databases (USE ...); such a
+            # connection must not reach the next borrower. Statements are
+            # screened client-side so releasing costs no round trip
+            if tracked.switched_database and not conn.closed:
+                await conn.close()
+            # Returned to the pool however the caller exits; closed ones
+            # are dropped and replaced on demand
             await pool.release(conn)
             
+    async def _get_pool(self, server_id: str, database: Optional[str]) -> aioodbc.Pool:
+        """(server, database) pool'unu döner; yoksa oluşturur."""
+        config = self.configs.get(server_id)
+        if config is None:
+            raise ValueError(f"Unknown server: {server_id}")
+            
+        database = database or config.default_database
+        pool = self.pools.get((server_id, database))
+        if pool is not None:
+            return pool
+            
+        if not _DATABASE_NAME.fullmatch(database):
+            raise ValueError(f"Invalid database name: {database}")
+            
+        async with self.lock:
+            # Another task may have created it while we waited
+            pool = self.pools.get((server_id, database))
+            if pool is None:
+                # Extra databases start empty and grow on demand
+                pool = self.pools[(server_id, database)] = await self._create_pool(
+                    config, database, 0
+                )
+        return pool
+        
+    async def _create_pool(self, config: ServerConfig, database: str,
+                           minsize: int) -> aioodbc.Pool:
+        return await aioodbc.create_pool(
+            dsn=self._get_dsn(config, database),
+            minsize=minsize,
+            maxsize=self.max_pool_size,
+            timeout=CONNECT_TIMEOUT
+        )
+        
+    async def close(self):
+        """Tüm connection pool'larını kapatır."""
+        async with self.lock:
+            pools, self.pools = self.pools, {}
+            for pool in pools.values():
+                await self._close_pool(pool)
+                
+    async def _close_pool(self, pool: aioodbc.Pool):
+        pool.close()
+        await pool.wait_closed()
+        
     async def _test_connection(self, config: ServerConfig) -> bool:
         """Bağlantı testi yapar."""
-        conn_str = self._build_connection_string(config)
+        conn_str = self._get_dsn(config, config.default_database)
         
         try:
-            conn = pyodbc.connect(conn_str)
-            conn.close()
+            conn = await aioodbc.connect(
+                dsn=conn_str,
+                timeout=CONNECT_TIMEOUT
+            )
+            await conn.close()
             return True
             
         except Exception as e:
             raise ConnectionError(
-                f"Connection test failed: {str(e)}"
+                f"Connection test failed: {_mask_credentials(str(e))}"
             )
             
-    def _build_connection_string(self, config: ServerConfig) -> str:
+    def _get_dsn(self, config: ServerConfig, database: str) -> str:
+        """Connection string'i (server, database) başına bir kez oluşturur."""
+        key = (config.server_name, database)
+        cached = self._dsns.get(key)
+        # A re-added server brings a new config object
+        if cached is None or cached[0] is not config:
+            cached = self._dsns[key] = (
+                config,
+                self._build_connection_string(config, database)
+            )
+        return cached[1]
+        
+    def _build_connection_string(self, config: ServerConfig,
+                                 database: Optional[str] = None) -> str:
         """Connection string oluşturur."""
         return (
             f"DRIVER={{ODBC Driver 17 for SQL Server}};"
             f"SERVER={config.server_name};"
-            f"DATABASE={config.default_database};"
+            f"DATABASE={database or config.default_database};"
             f"UID={config.username};"
             f"PWD={config.password};"
             f"Trusted_Connection={config.trusted_connection};"
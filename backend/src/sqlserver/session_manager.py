@@ -1,13 +1,33 @@
-from typing import Dict, List
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set
+from collections import deque
 from datetime import datetime
 import asyncio
+import logging
+import time
 from .models import QuerySession, SessionState
 from .connection_manager import SQLServerManager
 
+FETCH_BATCH_SIZE = 1000  # rows per fetchmany / ODBC block fetch
+SESSION_ERROR_LIMIT = 1000  # most recent errors kept per session
+HISTORY_BATCH_SIZE = 200  # closed sessions persisted per write
+HISTORY_SAVE_ATTEMPTS = 3  # per session, before it is set aside
+HISTORY_RETRY_DELAY = 1.0  # seconds before failed sessions are re-queued
+
 class QuerySessionManager:
     def __init__(self, conn_manager: SQLServerManager):
         self.conn_manager = conn_manager
         self.active_sessions = {}  # session_id -> session
+        # Reverse indexes over active_sessions
+        self._by_user: Dict[str, Set[str]] = {}  # user_id -> session ids
+        self._by_server: Dict[str, Set[str]] = {}  # server_id -> session ids
+        # Closed sessions waiting to be written to history
+        self._history_queue: Optional[asyncio.Queue] = None
+        self._history_flusher: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger('session_manager')
+        # session id -> failed save attempts so far
+        self._history_attempts: Dict[str, int] = {}
+        # Sessions whose history could not be saved after every attempt
+        self.failed_session_histories: deque = deque(maxlen=SESSION_ERROR_LIMIT)
         
     async def create_session(self, user_id: str,
                            server_id: str,
@@ -21,14 +41,66 @@ class QuerySessionManager:
             created_at=datetime.utcnow(),
             state=SessionState.ACTIVE
         )
+        # Long-lived sessions keep only their latest errors
+        session.errors = deque(maxlen=SESSION_ERROR_LIMIT)
         
         self.active_sessions[session.id] = session
+        self._by_user.setdefault(user_id, set()).add(session.id)
+        self._by_server.setdefault(server_id, set()).add(session.id)
         
         return session
         
+    def sessions_for_user(self, user_id: str) -> Iterator[QuerySession]:
+        """Kullanıcının aktif session'larını döner."""
+        return (
+            self.active_sessions[session_id]
+            for session_id in tuple(self._by_user.get(user_id, ()))
+        )
+        
+    def sessions_for_server(self, server_id: str) -> Iterator[QuerySession]:
+        """Server üzerindeki aktif session'ları döner."""
+        return (
+            self.active_sessions[session_id]
+            for session_id in tuple(self._by_server.get(server_id, ()))
+        )
+        
+    def _unindex(self, index: Dict[str, Set[str]], key: str, session_id: str):
+        session_ids = index.get(key)
+        if session_ids is not None:
+            session_ids.discard(session_id)
+            if not session_ids:
+                del index[key]
+        
     async def execute_query(self, session_id: str,
                           query: str) -> Dict:
         """Session içinde query çalıştırır."""
+        columns, rows, summary = [], [], {}
+        
+        # Buffers the whole result; use stream_query for large results
+        async for chunk in self.stream_query(session_id, query):
+            if 'rows' in chunk:
+                rows.extend(chunk['rows'])
+            elif 'columns' in chunk:
+                columns = chunk['columns']
+            else:
+                summary = chunk
+                
+        return {
+            'status': 'success',
+            'columns': columns,
+            'rows': rows,
+            'execution_time': summary['execution_time'],
+            'affected_rows': summary['affected_rows']
+        }
+        
+    async def stream_query(self, session_id: str, query: str,
+                           batch_size: int = FETCH_BATCH_SIZE) -> AsyncIterator[Dict]:
+        """Query sonucunu batch'ler halinde akıtır.
+
+        Sırasıyla {'columns'}, sıfır ya da daha fazla {'rows'} ve son olarak
+        {'execution_time', 'affected_rows'} üretir. execution_time yalnızca
+        execute ve fetchmany çağrılarında geçen süredir.
+        """
         session = self.active_sessions.get(session_id)
         if not session:
             raise ValueError(f"Invalid session: {session_id}")
@@ -39,28 +111,41 @@ class QuerySessionManager:
                 session.database
             ) as conn:
                 # Execute query
-                cursor = conn.cursor()
-                start_time = datetime.utcnow()
-                cursor.execute(query)
-                
-                # Get results
-                columns = [col[0] for col in cursor.description]
-                rows = cursor.fetchall()
-                
-                end_time = datetime.utcnow()
-                
-                # Update session stats
-                session.last_query = query
-                session.last_query_time = end_time
-                session.query_count += 1
-                
-                return {
-                    'status': 'success',
-                    'columns': columns,
-                    'rows': rows,
-                    'execution_time': (end_time - start_time).total_seconds(),
-                    'affected_rows': cursor.rowcount
-                }
+                async with conn.cursor() as cursor:
+                    # The driver block-fetches this many rows per round trip
+                    cursor.arraysize = batch_size
+                    # Only time spent in the driver counts; the consumer may
+                    # take arbitrarily long between batches. Monotonic clock
+                    start_ns = time.perf_counter_ns()
+                    await cursor.execute(query)
+                    db_ns = time.perf_counter_ns() - start_ns
+                    
+                    # Statements without a result set have no description.
+                    # Names are read per execution on purpose: a cached list
+                    # would go stale if a table changed under the same query
+                    if cursor.description:
+                        yield {'columns': [col[0] for col in cursor.description]}
+                        
+                        # Only one batch is held in memory at a time
+                        while True:
+                            start_ns = time.perf_counter_ns()
+                            batch = await cursor.fetchmany(batch_size)
+                            db_ns += time.perf_counter_ns() - start_ns
+                            if not batch:
+                                break
+                            yield {'rows': batch}
+                    else:
+                        yield {'columns': []}
+                        
+                    # Update session stats
+                    session.last_query = query
+                    session.last_query_time = datetime.utcnow()
+                    session.query_count += 1
+                    
+                    yield {
+                        'execution_time': db_ns / 1e9,
+                        'affected_rows': cursor.rowcount
+                    }
                 
         except Exception as e:
             # Log error
@@ -85,9 +170,11 @@ class QuerySessionManager:
             
             # Remove from active sessions
             del self.active_sessions[session_id]
+            self._unindex(self._by_user, session.user_id, session_id)
+            self._unindex(self._by_server, session.server_id, session_id)
             
-            # Save session history
-            await self._save_session_history(session)
+            # Persisted in batches by the background flusher
+            self._queue_session_history(session)
             
             return {
                 'status': 'success',
@@ -100,4 +187,80 @@ class QuerySessionManager:
             return {
                 'status': 'error',
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+            
+    def _queue_session_history(self, session: QuerySession) -> None:
+        # Created lazily: the manager may be built before the loop runs
+        if self._history_queue is None:
+            self._history_queue = asyncio.Queue()
+        if self._history_flusher is None or self._history_flusher.done():
+            self._history_flusher = asyncio.create_task(
+                self._flush_session_history(self._history_queue)
+            )
+        self._history_queue.put_nowait(session)
+        
+    async def _flush_session_history(self, queue: asyncio.Queue) -> None:
+        """Kuyruktaki kapanmış session'ları batch'ler halinde kaydeder."""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < HISTORY_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+                
+            try:
+                failed = await self._save_session_histories(batch)
+                if failed:
+                    await self._retry_session_histories(queue, failed)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+                    
+    async def _save_session_histories(self, sessions: List[QuerySession]) -> List[QuerySession]:
+        """Session history'lerini kaydeder; kaydedilemeyenleri döner."""
+        failed = []
+        for session in sessions:
+            try:
+                await self._save_session_history(session)
+            except Exception:
+                # One bad write must not drop the rest of the batch
+                self.logger.exception(
+                    "Failed to save history for session %s", session.id
+                )
+                failed.append(session)
+            else:
+                self._history_attempts.pop(session.id, None)
+        return failed
+        
+    async def _retry_session_histories(self, queue: asyncio.Queue,
+                                       sessions: List[QuerySession]) -> None:
+        """Kaydedilemeyen session'ları tekrar kuyruğa alır ya da kenara ayırır."""
+        retry = []
+        for session in sessions:
+            attempts = self._history_attempts.get(session.id, 0) + 1
+            if attempts < HISTORY_SAVE_ATTEMPTS:
+                self._history_attempts[session.id] = attempts
+                retry.append(session)
+            else:
+                self._history_attempts.pop(session.id, None)
+                self.failed_session_histories.append(session)
+                self.logger.error(
+                    "Giving up on history for session %s after %d attempts",
+                    session.id, attempts
+                )
+                
+        if retry:
+            # The store is likely down; don't spin on it
+            await asyncio.sleep(HISTORY_RETRY_DELAY)
+            for session in retry:
+                queue.put_nowait(session)
+                
+    async def flush_session_history(self) -> None:
+        """Bekleyen tüm session history yazımlarının bitmesini bekler."""
+        if self._history_queue is not None:
+            await self._history_queue.join()
+        
+    async def close(self) -> None:
+        """Bekleyen history'yi yazar ve flusher'ı durdurur."""
+        await self.flush_session_history()
+        if self._history_flusher is not None:
+            self._history_flusher.cancel()
+            self._history_flusher = None
\ No newline at end of file
@@ -1,17 +1,31 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
+from collections import Counter, deque
+from itertools import islice
 from datetime import datetime
 from .models import UserQueryProfile, QueryHistory
 from .session_manager import QuerySessionManager
 
+QUERY_HISTORY_LIMIT = 1000  # entries kept per profile
+RECENT_QUERY_COUNT = 10
+FAVORITE_QUERY_LIMIT = 10
+
 class UserQueryManager:
     def __init__(self, session_manager: QuerySessionManager):
         self.session_manager = session_manager
         self.user_profiles = {}  # user_id -> profile
+        # user_id -> (query -> usage count, query -> last used); kept up to
+        # date by track_query so favorites never rescan the history
+        self._query_index: Dict[str, Tuple[Counter, Dict[str, datetime]]] = {}
         
     async def get_user_profile(self, user_id: str) -> UserQueryProfile:
         """Kullanıcı query profilini getirir."""
         if user_id not in self.user_profiles:
-            self.user_profiles[user_id] = await self._create_profile(user_id)
+            profile = await self._create_profile(user_id)
+            # Ring buffer: appends are O(1) and the oldest entries fall off
+            profile.query_history = deque(
+                profile.query_history or (), maxlen=QUERY_HISTORY_LIMIT
+            )
+            self.user_profiles[user_id] = profile
             
         return self.user_profiles[user_id]
         
@@ -21,6 +35,9 @@ class UserQueryManager:
                          result: Dict) -> None:
         """Query'yi kullanıcı history'sine ekler."""
         profile = await self.get_user_profile(user_id)
+        # Built (if needed) before this entry is appended
+        counts, last_used = self._get_query_index(user_id, profile)
+        now = datetime.utcnow()
         
         # Add to history
         history_entry = QueryHistory(
@@ -28,17 +45,20 @@ class UserQueryManager:
             session_id=session_id,
             execution_time=result['execution_time'],
             affected_rows=result['affected_rows'],
-            timestamp=datetime.utcnow()
+            timestamp=now
         )
         
         profile.query_history.append(history_entry)
         
+        counts[query] += 1
+        last_used[query] = now
+        
         # Update statistics
         profile.total_queries += 1
         profile.total_execution_time += result['execution_time']
         
         # Update last activity
-        profile.last_activity = datetime.utcnow()
+        profile.last_activity = now
         
     async def get_user_statistics(self, user_id: str,
                                 timeframe: str = '24h') -> Dict:
@@ -52,35 +72,38 @@ class UserQueryManager:
                 if profile.total_queries > 0 else 0
             ),
             'active_sessions': len(profile.active_sessions),
-            'recent_queries': profile.query_history[-10:],
+            # Newest entries without copying the whole buffer
+            'recent_queries': list(
+                islice(reversed(profile.query_history), RECENT_QUERY_COUNT)
+            )[::-1],
             'last_activity': profile.last_activity
         }
         
     async def get_favorite_queries(self, user_id: str) -> List[Dict]:
         """Kullanıcının en sık kullandığı query'leri getirir."""
         profile = await self.get_user_profile(user_id)
-        
-        # Analyze query patterns
-        query_counts = {}
-        for entry in profile.query_history:
-            query_counts[entry.query] = query_counts.get(entry.query, 0) + 1
-            
-        # Sort by frequency
-        favorites = sorted(
-            query_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
+        counts, last_used = self._get_query_index(user_id, profile)
         
         return [
             {
                 'query': query,
                 'usage_count': count,
-                'last_used': max(
-                    e.timestamp
-                    for e in profile.query_history
-                    if e.query == query
-                )
+                'last_used': last_used[query]
             }
-            for query, count in favorites[:10]
-        ]
\ No newline at end of file
+            for query, count in counts.most_common(FAVORITE_QUERY_LIMIT)
+        ]
+        
+    def _get_query_index(self, user_id: str, 
+                         profile: UserQueryProfile) -> Tuple[Counter, Dict[str, datetime]]:
+        """Kullanıcının query frekans index'ini döner; ilk seferde history'den kurar."""
+        index = self._query_index.get(user_id)
+        if index is None:
+            counts = Counter()
+            last_used = {}
+            # Profiles may come with history already loaded
+            for entry in profile.query_history:
+                counts[entry.query] += 1
+                if entry.query not in last_used or entry.timestamp > last_used[entry.query]:
+                    last_used[entry.query] = entry.timestamp
+            index = self._query_index[user_id] = (counts, last_used)
+        return index
\ No newline at end of file
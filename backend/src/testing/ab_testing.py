@@ -1,13 +1,51 @@
 from typing import Dict, List
 import numpy as np
 from scipy import stats
+from dataclasses import dataclass
 from datetime import datetime
 from .models import ABTest, TestResult, Variant
 
+DEFAULT_METRIC = 'value'  # event field analysed unless config['metric'] says otherwise
+SIGNIFICANCE_LEVEL = 0.05
+
+@dataclass
+class MetricSummary:
+    """Welford running count/mean/M2; events are never stored."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        
+    def add_many(self, values: np.ndarray):
+        """Bir event batch'ini vektörel olarak ekler (Chan birleştirme formülü)."""
+        values = np.asarray(values, dtype=np.float64)
+        n = values.size
+        if not n:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(np.square(values - batch_mean).sum())
+        
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+        
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
 class ABTestingManager:
     def __init__(self):
         self.active_tests: Dict[str, ABTest] = {}
         self.results: Dict[str, TestResult] = {}
+        # test_id -> variant_id -> running metric summary
+        self._metrics: Dict[str, Dict[str, MetricSummary]] = {}
         
     async def create_test(self, config: Dict) -> str:
         """A/B test oluşturur."""
@@ -44,6 +82,24 @@ class ABTestingManager:
         test = self.active_tests[test_id]
         await test.record_event(variant_id, event)
         
+        # O(1) per event; analysis never rescans the event stream
+        value = event.get(test.config.get('metric', DEFAULT_METRIC))
+        if value is not None:
+            self._metrics.setdefault(test_id, {}).setdefault(
+                variant_id, MetricSummary()
+            ).add(float(value))
+            
+    async def record_events(self, test_id: str,
+                           variant_id: str,
+                           values: np.ndarray) -> None:
+        """Bir variant için metrik değerlerini toplu ekler."""
+        if test_id not in self.active_tests:
+            raise ValueError(f"Unknown test: {test_id}")
+            
+        self._metrics.setdefault(test_id, {}).setdefault(
+            variant_id, MetricSummary()
+        ).add_many(values)
+        
     async def analyze_results(self, test_id: str) -> Dict:
         """Test sonuçlarını analiz eder."""
         test = self.active_tests.get(test_id)
@@ -83,4 +139,55 @@ class ABTestingManager:
             return {
                 'status': 'error',
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+            
+    async def _calculate_statistics(self, test: ABTest) -> Dict:
+        """Variant başına metrik özetini döner."""
+        return {
+            variant_id: {
+                'count': summary.count,
+                'mean': float(summary.mean),
+                'std': float(np.sqrt(summary.variance))
+            }
+            for variant_id, summary in self._metrics.get(test.id, {}).items()
+        }
+        
+    async def _test_significance(self, test: ABTest, statistics: Dict) -> Dict:
+        """Her variant'ı kontrol grubuna karşı Welch t-testi ile karşılaştırır."""
+        if not statistics:
+            return {}
+            
+        control_id = test.config.get('control_variant', next(iter(statistics)))
+        control = statistics.get(control_id)
+        if control is None or control['count'] < 2:
+            return {}
+            
+        variant_ids = [
+            variant_id for variant_id, variant in statistics.items()
+            if variant_id != control_id and variant['count'] >= 2
+        ]
+        if not variant_ids:
+            return {}
+            
+        # (count, mean, std) per variant; one Welch t-test call for all of them
+        summary = np.array([
+            (statistics[variant_id]['count'],
+             statistics[variant_id]['mean'],
+             statistics[variant_id]['std'])
+            for variant_id in variant_ids
+        ], dtype=np.float64)
+        t_stats, p_values = stats.ttest_ind_from_stats(
+            summary[:, 1], summary[:, 2], summary[:, 0],
+            control['mean'], control['std'], control['count'],
+            equal_var=False
+        )
+        
+        return {
+            variant_id: {
+                'control': control_id,
+                't_statistic': float(t_stat),
+                'p_value': float(p_value),
+                'significant': bool(p_value < SIGNIFICANCE_LEVEL)
+            }
+            for variant_id, t_stat, p_value in zip(variant_ids, t_stats, p_values)
+        }
\ No newline at end of file
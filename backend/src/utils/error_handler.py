@@ -1,33 +1,48 @@
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Optional, Set
+import asyncio
 from fastapi import HTTPException
 from sqlalchemy.exc import SQLAlchemyError
 from .logger import Logger
 
+class QueryError(Exception):
+    """Konum ve öneri bilgisi taşıyan query hatası."""
+    def __init__(self, message: str, query: str = None,
+                 position: Optional[int] = None, suggestion: str = None):
+        super().__init__(message)
+        self.message = message
+        self.query = query
+        self.position = position
+        self.suggestion = suggestion
+
 class ErrorHandler:
     def __init__(self):
         self.logger = Logger()
+        # Exception class -> handler; subclasses resolve through their MRO
+        self._dispatch: Dict[type, Callable[[Exception], Dict]] = {
+            SQLAlchemyError: self._handle_db_error,
+            HTTPException: self._handle_http_error,
+            QueryError: self._handle_query_error
+        }
+        # Concrete class -> resolved handler (None: default response)
+        self._resolved: Dict[type, Optional[Callable[[Exception], Dict]]] = {}
+        # Pending log writes; referenced so they aren't garbage collected
+        self._log_tasks: Set[asyncio.Task] = set()
         
     async def handle_error(self, error: Exception,
                           context: Dict[str, Any] = None) -> Dict:
         """Hata yönetimi yapar."""
         try:
-            # Log error
-            await self.logger.error(
+            # Log error without waiting on the log sink
+            task = asyncio.create_task(self.logger.error(
                 str(error),
                 context or {}
-            )
+            ))
+            self._log_tasks.add(task)
+            task.add_done_callback(self._log_done)
             
-            # Database errors
-            if isinstance(error, SQLAlchemyError):
-                return self._handle_db_error(error)
-                
-            # HTTP errors
-            if isinstance(error, HTTPException):
-                return self._handle_http_error(error)
-                
-            # Query errors
-            if isinstance(error, QueryError):
-                return self._handle_query_error(error)
+            handler = self._get_handler(type(error))
+            if handler is not None:
+                return handler(error)
                 
             # Default error response
             return {
@@ -44,6 +59,26 @@ class ErrorHandler:
                 'type': 'InternalError'
             }
             
+    def _get_handler(self, error_type: type) -> Optional[Callable[[Exception], Dict]]:
+        """Exception sınıfı için en yakın handler'ı (MRO sırasıyla) döner."""
+        try:
+            return self._resolved[error_type]
+        except KeyError:
+            pass
+            
+        handler = next(
+            (self._dispatch[cls] for cls in error_type.__mro__ if cls in self._dispatch),
+            None
+        )
+        self._resolved[error_type] = handler
+        return handler
+        
+    def _log_done(self, task: asyncio.Task):
+        self._log_tasks.discard(task)
+        # A failing log sink must not surface as an unretrieved task error
+        if not task.cancelled():
+            task.exception()
+            
     def _handle_db_error(self, error: SQLAlchemyError) -> Dict:
         """Database hatalarını yönetir."""
         return {
@@ -56,7 +91,18 @@ class ErrorHandler:
             }
         }
         
-    def _handle_query_error(self, error: 'QueryError') -> Dict:
+    def _handle_http_error(self, error: HTTPException) -> Dict:
+        """HTTP hatalarını yönetir."""
+        return {
+            'status': 'error',
+            'type': 'HTTPError',
+            'message': str(error.detail),
+            'details': {
+                'status_code': error.status_code
+            }
+        }
+        
+    def _handle_query_error(self, error: QueryError) -> Dict:
         """Query hatalarını yönetir."""
         return {
             'status': 'error',
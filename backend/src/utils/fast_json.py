@@ -0,0 +1,25 @@
+from typing import Any
+from decimal import Decimal
+import orjson
+
+# datetimes without tzinfo are UTC here (datetime.utcnow everywhere)
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+def _default(obj: Any) -> Any:
+    # NUMERIC/DECIMAL columns; rendered as strings like Flask's jsonify
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Objeyi doğrudan UTF-8 JSON byte'larına serialize eder."""
+    return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+
+def dumps(obj: Any, *args, **kwargs) -> str:
+    """json.dumps yerine geçer; orjson çıktısı zaten kompakt olduğundan
+    separators gibi ek argümanlar yok sayılır."""
+    return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode()
+
+def loads(data, *args, **kwargs) -> Any:
+    """str, bytes ya da bytearray JSON'u parse eder."""
+    return orjson.loads(data)
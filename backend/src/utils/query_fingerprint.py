@@ -0,0 +1,57 @@
+import hashlib
+import re
+from functools import lru_cache
+
+QUERY_PATTERN_CACHE_SIZE = 4096
+
+# Literals and quoted identifiers are kept verbatim; comments and runs of
+# whitespace outside them collapse to a single space
+_NORMALIZE_PATTERN = re.compile(
+    r"(?P<literal>'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\[[^\]]*\])"
+    r"|(?:--[^\n]*|/\*.*?\*/|\s)+",
+    re.DOTALL
+)
+
+def normalize_query(query: str) -> str:
+    """Query'yi yorum ve fazla boşluklardan arındırır."""
+    return _NORMALIZE_PATTERN.sub(
+        lambda m: m.group('literal') or ' ',
+        query
+    ).strip()
+
+_NUMBER = r"\b\d+(?:\.\d+)?\b"
+_STRING = r"'(?:[^']|'')*'"
+
+# One alternation, scanned once: literal lists, strings and numbers become
+# '?', quoted identifiers stay, comments/whitespace collapse to a space
+_PATTERN_TOKENS = re.compile(
+    r"(?P<in_list>\bIN\s*\(\s*(?:{0}|{1})(?:\s*,\s*(?:{0}|{1}))*\s*\))"
+    r"|(?P<identifier>\"(?:[^\"]|\"\")*\"|\[[^\]]*\])"
+    r"|(?P<literal>{0}|{1})"
+    r"|(?P<space>(?:--[^\n]*|/\*.*?\*/|\s)+)".format(_STRING, _NUMBER),
+    re.DOTALL | re.IGNORECASE
+)
+
+_PATTERN_REPLACEMENTS = {
+    'in_list': 'IN (?)',
+    'literal': '?',
+    'space': ' '
+}
+
+def _pattern_token(match: re.Match) -> str:
+    kind = match.lastgroup
+    if kind == 'identifier':
+        return match.group()
+    return _PATTERN_REPLACEMENTS[kind]
+
+@lru_cache(maxsize=QUERY_PATTERN_CACHE_SIZE)
+def query_pattern(query: str) -> str:
+    """Literal değerleri '?' ile değiştirerek query'nin kalıbını çıkarır."""
+    return _PATTERN_TOKENS.sub(_pattern_token, query).strip()
+
+def fingerprint_query(query: str) -> bytes:
+    """Normalize edilmiş query'nin 16 byte'lık BLAKE2b özetini döndürür."""
+    return hashlib.blake2b(
+        normalize_query(query).encode(),
+        digest_size=16
+    ).digest()
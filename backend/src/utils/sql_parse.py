@@ -0,0 +1,14 @@
+from functools import lru_cache
+from typing import Tuple
+import sqlparse
+from sqlparse.sql import Statement
+
+PARSE_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_sql(query: str) -> Tuple[Statement, ...]:
+    """sqlparse.parse sonucunu query metnine göre önbelleğe alır.
+
+    Dönen statement'lar paylaşılır; çağıranlar token ağacını değiştirmemelidir.
+    """
+    return tuple(sqlparse.parse(query))
@@ -1,12 +1,20 @@
 import asyncio
-from typing import Dict, Set
+from typing import Dict, Set, Tuple
 from fastapi import WebSocket
 from .models import WSMessage, WSConnection
+from ..utils.fast_json import dumps
+
+SEND_QUEUE_SIZE = 128  # pending messages per connection before it is dropped
+SLOW_CLIENT_CLOSE_CODE = 1008
 
 class WebSocketManager:
     def __init__(self):
-        self.active_connections: Dict[str, Set[WSConnection]] = {}
-        self.lock = asyncio.Lock()
+        # client_id -> id(socket) -> connection. Updates contain no await,
+        # so they run atomically on the event loop without a lock
+        self.active_connections: Dict[str, Dict[int, WSConnection]] = {}
+        # id(socket) -> (send queue, writer task)
+        self._writers: Dict[int, Tuple[asyncio.Queue, asyncio.Task]] = {}
+        self._close_tasks: Set[asyncio.Task] = set()
         
     async def connect(self, websocket: WebSocket,
                      client_id: str) -> None:
@@ -17,38 +25,83 @@ class WebSocketManager:
             client_id=client_id
         )
         
-        async with self.lock:
-            if client_id not in self.active_connections:
-                self.active_connections[client_id] = set()
-            self.active_connections[client_id].add(connection)
+        # Each socket is written by its own task, so a slow reader only
+        # backs up its own queue
+        queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._writers[id(websocket)] = (
+            queue,
+            asyncio.create_task(self._writer_loop(connection, queue))
+        )
+        self.active_connections.setdefault(client_id, {})[id(websocket)] = connection
             
     async def disconnect(self, websocket: WebSocket,
                         client_id: str) -> None:
         """Client bağlantısını kapatır."""
-        async with self.lock:
-            if client_id in self.active_connections:
-                connections = self.active_connections[client_id]
-                connections.discard(
-                    next(
-                        (conn for conn in connections 
-                         if conn.socket == websocket),
-                        None
-                    )
-                )
+        connections = self.active_connections.get(client_id)
+        if connections is not None:
+            connections.pop(id(websocket), None)
+            
+            if not connections:
+                del self.active_connections[client_id]
                 
-                if not connections:
-                    del self.active_connections[client_id]
+        writer = self._writers.pop(id(websocket), None)
+        if writer is not None and writer[1] is not asyncio.current_task():
+            writer[1].cancel()
                     
     async def broadcast(self, message: WSMessage,
                        client_id: str = None) -> None:
         """Mesaj broadcast eder."""
+        # Snapshot: disconnecting slow clients changes the dicts below
         if client_id:
             # Specific client
-            if client_id in self.active_connections:
-                for connection in self.active_connections[client_id]:
-                    await connection.socket.send_json(message.dict())
+            connections = list(self.active_connections.get(client_id, {}).values())
         else:
             # All clients
-            for connections in self.active_connections.values():
-                for connection in connections:
-                    await connection.socket.send_json(message.dict())
\ No newline at end of file
+            connections = [
+                connection
+                for client_connections in self.active_connections.values()
+                for connection in client_connections.values()
+            ]
+        if not connections:
+            return
+            
+        # Serialized once; sent as a text frame like send_json did
+        payload = dumps(message.dict())
+        
+        # Never waits on a client; a full queue means it can't keep up
+        for connection in connections:
+            writer = self._writers.get(id(connection.socket))
+            if writer is None:
+                continue
+            try:
+                writer[0].put_nowait(payload)
+            except asyncio.QueueFull:
+                await self._kick(connection)
+                
+    async def _writer_loop(self, connection: WSConnection,
+                           queue: asyncio.Queue) -> None:
+        """Bağlantının kuyruğundaki mesajları sırayla gönderir."""
+        try:
+            while True:
+                payload = await queue.get()
+                await connection.socket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The socket is gone; one dead client doesn't affect the rest
+            await self.disconnect(connection.socket, connection.client_id)
+            
+    async def _kick(self, connection: WSConnection) -> None:
+        """Yetişemeyen client'ı düşürür."""
+        await self.disconnect(connection.socket, connection.client_id)
+        
+        # Closing may wait on the same slow socket; don't hold up broadcast
+        task = asyncio.create_task(self._close_socket(connection.socket))
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_tasks.discard)
+        
+    async def _close_socket(self, websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=SLOW_CLIENT_CLOSE_CODE)
+        except Exception:
+            pass
\ No newline at end of file
@@ -0,0 +1,37 @@
+import pytest
+
+from backend.src.rules.query_rules_engine import QueryRulesEngine
+
+def _engine(patterns):
+    """Config dosyası okumadan verilen pattern'lerle engine kurar"""
+    rules = [
+        {
+            'name': f'rule_{idx}',
+            'pattern': pattern,
+            'description': pattern,
+            'severity': 'high'
+        }
+        for idx, pattern in enumerate(patterns)
+    ]
+    engine = QueryRulesEngine.__new__(QueryRulesEngine)
+    engine.syntax_patterns = engine._compile_syntax_rules(rules)
+    engine.syntax_prefilter = engine._compile_prefilter(rules)
+    return engine
+
+class TestSyntaxPrefilter:
+    def test_backreference_rules_are_not_merged(self):
+        """Backreference içeren rule'lar prefilter'a alınmamalı"""
+        engine = _engine([r'(a)\1', r'(b)\1'])
+        
+        assert engine.syntax_prefilter is None
+        violations = engine._check_syntax_rules('xbbx')
+        assert [v['rule'] for v in violations] == ['rule_1']
+        
+    def test_group_free_rules_use_prefilter(self):
+        """Grup içermeyen rule'lar tek alternation'da birleşir"""
+        engine = _engine([r'SELECT\s+\*', r'DELETE\s+FROM\s+\w+\s*$'])
+        
+        assert engine.syntax_prefilter is not None
+        assert engine._check_syntax_rules('SELECT id FROM t') == []
+        violations = engine._check_syntax_rules('SELECT * FROM t')
+        assert [v['rule'] for v in violations] == ['rule_0']
@@ -0,0 +1,83 @@
+import pytest
+
+jwt = pytest.importorskip('jwt')
+fernet = pytest.importorskip('cryptography.fernet')
+security_manager = pytest.importorskip('backend.src.security.security_manager')
+role_manager = pytest.importorskip('backend.src.rbac.role_manager')
+
+SECRET = 'test-secret-for-hs256-signing-key!!'
+
+class FakeAssignmentStore:
+    """RoleAssignment kalıcılığını bellekte taklit eder"""
+    def __init__(self):
+        self.roles = set()  # (user_id, role_id)
+        
+    def model(self):
+        store = self
+        
+        class FakeRoleAssignment:
+            def __init__(self, user_id, role_id, **kwargs):
+                self.user_id = user_id
+                self.role_id = role_id
+                
+            async def save(self):
+                store.roles.add((self.user_id, self.role_id))
+                
+            async def delete(self):
+                store.roles.discard((self.user_id, self.role_id))
+                
+        return FakeRoleAssignment
+
+class FakeAccessControl:
+    def __init__(self, store):
+        self.store = store
+        
+    async def check_permission(self, user, resource, action):
+        return (user, 'reader') in self.store.roles
+
+class FakeAudit:
+    def __getattr__(self, name):
+        async def log(*args, **kwargs):
+            return None
+        return log
+
+class FakePolicyEngine:
+    async def validate_role_assignment(self, assignment):
+        return None
+
+@pytest.fixture
+def managers(monkeypatch):
+    store = FakeAssignmentStore()
+    monkeypatch.setattr(role_manager, 'RoleAssignment', store.model())
+    
+    roles = role_manager.RoleManager.__new__(role_manager.RoleManager)
+    roles.policy_engine = FakePolicyEngine()
+    roles.audit = FakeAudit()
+    roles._permission_tries = {}
+    roles._invalidation_listeners = []
+    roles._validate_assignment = lambda assignment: None
+    
+    security = security_manager.SecurityManager.__new__(security_manager.SecurityManager)
+    security.config = {'jwt_secret': SECRET}
+    security.audit = FakeAudit()
+    security.access_control = FakeAccessControl(store)
+    security.decision_cache_ttl = 60
+    security.decision_cache_size = 100
+    security._decision_cache = security_manager.OrderedDict()
+    security._user_versions = {}
+    roles.add_invalidation_listener(security.invalidate)
+    
+    return roles, security
+
+@pytest.mark.asyncio
+async def test_revoke_invalidates_cached_decision(managers):
+    """Rol geri alındıktan sonra cache'lenmiş ALLOW kararı kullanılmamalı"""
+    roles, security = managers
+    token = jwt.encode({'sub': 'alice'}, SECRET, algorithm='HS256')
+    assignment = {'user_id': 'alice', 'role_id': 'reader'}
+    
+    await roles.assign_role(dict(assignment, assigned_by='admin'))
+    assert await security.authorize(token, 'db.orders', 'read') is True
+    
+    await roles.revoke_role(dict(assignment, revoked_by='admin'))
+    assert await security.authorize(token, 'db.orders', 'read') is False
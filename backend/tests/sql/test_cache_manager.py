@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+fakeredis = pytest.importorskip('fakeredis')
+pytest.importorskip('lupa')
+pytest.importorskip('sqlparse')
+cache_manager = pytest.importorskip('backend.src.sql.cache_manager')
+
+READ = 'SELECT * FROM orders WHERE id = 1'
+WRITE = 'UPDATE orders SET status = 2 WHERE id = 1'
+
+class SimpleCacheManager(cache_manager.CacheManager):
+    """Serileştirme ve boyut hook'larını sade halleriyle sağlar"""
+    def _parameterize_literals(self, query):
+        return query
+
+    def _get_cache_size(self):
+        return 0
+
+    def _serialize_cache_data(self, result):
+        return json.dumps(result)
+
+    def _deserialize_cache_data(self, data):
+        return json.loads(data)
+
+@pytest.fixture
+def manager():
+    manager = SimpleCacheManager(cache_manager.CacheConfig(
+        ttl=60, max_size=1024, strategy='LRU', compression=False
+    ))
+    manager.redis = fakeredis.FakeRedis(decode_responses=True)
+    return manager
+
+def test_pattern_invalidate_keeps_table_versions(manager):
+    """invalidate(table) sonrası yazmadan önceki sonuç geri dönmemeli"""
+    manager.set(READ, {'rows': ['stale']})
+    manager.record_write(WRITE)
+
+    manager.invalidate('orders')
+
+    assert manager.redis.get('table_version:orders') == '1'
+    assert manager.get(READ) is None
+
+def test_full_invalidate_drops_data_and_versions(manager):
+    """Tam invalidation veriyi ve versiyonları siler, stats kalır"""
+    manager.set(READ, {'rows': [1]})
+    manager.record_write(WRITE)
+    manager.set(READ, {'rows': [2]})
+
+    manager.invalidate()
+
+    assert manager.get(READ) is None
+    assert not manager.redis.keys('table_version:*')
+    assert manager.redis.keys('cache:stats:*')
+
+def test_set_then_get_round_trip(manager):
+    """Kaydedilen sonuç aynı query ile geri okunmalı"""
+    manager.set(READ, {'rows': [[1, 'open']]})
+
+    assert manager.get(READ) == {'rows': [[1, 'open']]}
+    assert manager.get('SELECT * FROM orders WHERE id = 2') is None
+
+def test_query_without_tables_uses_plain_key(manager):
+    """Tablo referansı olmayan query versiyonsuz key ile cache'lenir"""
+    manager.set('SELECT 1', {'rows': [[1]]})
+
+    assert manager.get('SELECT 1') == {'rows': [[1]]}
+    assert manager.redis.exists(manager._generate_cache_key('SELECT 1'))
+
+def test_write_bumps_table_version(manager):
+    """Yazma tablo versiyonunu artırır, eski sonuç okunmaz"""
+    manager.set(READ, {'rows': ['old']})
+
+    manager.record_write(WRITE)
+
+    assert manager.redis.get('table_version:orders') == '1'
+    assert manager.get(READ) is None
+
+    manager.set(READ, {'rows': ['new']})
+    assert manager.get(READ) == {'rows': ['new']}
+
+def test_read_and_unrelated_writes_keep_entry(manager):
+    """SELECT ya da başka tabloya yazma cache'i geçersiz kılmaz"""
+    manager.set(READ, {'rows': ['kept']})
+
+    manager.record_write(READ)
+    manager.record_write('DELETE FROM customers WHERE id = 1')
+
+    assert manager.redis.get('table_version:orders') is None
+    assert manager.redis.get('table_version:customers') == '1'
+    assert manager.get(READ) == {'rows': ['kept']}
+
+def test_join_depends_on_every_table(manager):
+    """JOIN sonucu her iki tablonun yazımında da geçersiz olur"""
+    query = (
+        'SELECT o.id FROM orders o '
+        'JOIN customers c ON c.id = o.customer_id'
+    )
+    manager.set(query, {'rows': [[1]]})
+
+    manager.invalidate_tables(['customers'])
+
+    assert manager.get(query) is None
+
+def test_stats_buckets_expire(manager):
+    """Paylaşılan stats hash'leri TTL ile düşmeli"""
+    manager.set(READ, {'rows': []})
+    manager.get(READ)
+
+    stats_keys = manager.redis.keys('cache:stats:*')
+    assert len(stats_keys) == 2
+    for key in stats_keys:
+        assert 0 < manager.redis.ttl(key) <= cache_manager.STATS_RETENTION
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyarrow')
+pytest.importorskip('xlsxwriter')
+pytest.importorskip('orjson')
+formatter = pytest.importorskip('backend.src.sql.formatter')
+
+COLUMNS = ['id', 'name']
+ROWS = [(1, 'a'), (2, 'b')]
+
+def make_data(rows):
+    return {'columns': COLUMNS, 'rows': rows}
+
+@pytest.mark.parametrize('orient', ['records', 'values', 'split', 'columns'])
+@pytest.mark.parametrize('make_rows', [list, iter], ids=['list', 'iterator'])
+def test_json_orients_match_pandas(orient, make_rows):
+    """Hızlı JSON yolu pandas çıktısıyla aynı veriyi üretmeli"""
+    result = formatter.ResultFormatter().format_result(
+        make_data(make_rows(ROWS)), 'json', {'orient': orient}
+    )
+
+    df = pd.DataFrame.from_records(ROWS, columns=COLUMNS)
+    expected = df.to_json(orient=orient, date_format='iso')
+    assert json.loads(result) == json.loads(expected)
+
+def test_json_iterator_rows_with_cache():
+    """Cache açıkken de tek seferlik satırlar doğru formatlanmalı"""
+    result_formatter = formatter.ResultFormatter(cache_size=4)
+
+    first = result_formatter.format_result(
+        make_data(iter(ROWS)), 'json', {'orient': 'split'}
+    )
+    second = result_formatter.format_result(
+        make_data(list(ROWS)), 'json', {'orient': 'split'}
+    )
+
+    assert first == second
+    assert json.loads(first)['data'] == [[1, 'a'], [2, 'b']]
+
+def test_csv_defaults_to_pandas_output():
+    """Varsayılan CSV çıktısı pandas'ınkiyle aynı kalmalı"""
+    rows = [(1, 'a', True), (2, 'b', False)]
+    data = {'columns': ['id', 'name', 'flag'], 'rows': rows}
+
+    result = formatter.ResultFormatter().format_result(data, 'csv')
+
+    df = pd.DataFrame.from_records(rows, columns=['id', 'name', 'flag'])
+    assert result == df.to_csv(index=False)
+
+def test_csv_pyarrow_engine_is_opt_in():
+    """engine='pyarrow' aynı veriyi Arrow yazıcısıyla üretir"""
+    data = make_data(iter(ROWS))
+
+    result = formatter.ResultFormatter().format_result(
+        data, 'csv', {'engine': 'pyarrow'}
+    )
+
+    assert result.splitlines() == ['"id","name"', '1,"a"', '2,"b"']
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('aioodbc')
+connection_manager = pytest.importorskip('backend.src.sqlserver.connection_manager')
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.arraysize = 1
+
+    async def execute(self, sql, *params):
+        self.conn.statements.append(sql)
+
+class FakeCursorContext:
+    """aioodbc gibi hem await hem async with destekler"""
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def __await__(self):
+        return self._get().__await__()
+
+    async def _get(self):
+        return self.cursor
+
+    async def __aenter__(self):
+        return self.cursor
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.statements = []
+
+    def cursor(self):
+        return FakeCursorContext(FakeCursor(self))
+
+    async def execute(self, sql, *args):
+        self.statements.append(sql)
+        return FakeCursor(self)
+
+    async def close(self):
+        self.closed = True
+
+class FakePool:
+    """aioodbc.Pool gibi tek bir bağlantıyı ödünç verir"""
+    def __init__(self):
+        self.conn = FakeConnection()
+        self.released = []
+
+    async def acquire(self):
+        return self.conn
+
+    async def release(self, conn):
+        self.released.append(conn)
+
+@pytest.fixture
+def manager():
+    manager = connection_manager.SQLServerManager()
+    manager.configs['srv'] = SimpleNamespace(default_database='main')
+    manager.pools[('srv', 'main')] = FakePool()
+    return manager
+
+@pytest.mark.asyncio
+async def test_release_costs_no_round_trip(manager):
+    """Normal kullanımda release ek statement çalıştırmamalı"""
+    pool = manager.pools[('srv', 'main')]
+
+    async with manager.get_connection('srv', None) as conn:
+        async with conn.cursor() as cursor:
+            cursor.arraysize = 50
+            await cursor.execute('SELECT * FROM users')
+
+    assert pool.conn.statements == ['SELECT * FROM users']
+    assert not pool.conn.closed
+    assert pool.released == [pool.conn]
+
+@pytest.mark.asyncio
+async def test_use_statement_closes_connection(manager):
+    """USE çalıştıran bağlantı pool'a açık dönmemeli"""
+    pool = manager.pools[('srv', 'main')]
+
+    async with manager.get_connection('srv', 'main') as conn:
+        cursor = await conn.cursor()
+        await cursor.execute('use other_db')
+
+    assert pool.conn.closed
+    assert pool.released == [pool.conn]
+
+@pytest.mark.asyncio
+async def test_connection_released_on_error(manager):
+    """Hata durumunda da bağlantı pool'a geri verilmeli"""
+    pool = manager.pools[('srv', 'main')]
+
+    with pytest.raises(RuntimeError):
+        async with manager.get_connection('srv', 'main') as conn:
+            await conn.execute('USE other_db')
+            raise RuntimeError('boom')
+
+    assert pool.conn.closed
+    assert pool.released == [pool.conn]